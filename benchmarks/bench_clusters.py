@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Benchmark: agrupamento de histórias
+Tempo do clusters.py (TF-IDF com hashing + cosseno em blocos) por número de
+itens, separado em vetorização e busca de pares. Os itens sintéticos são
+histórias contadas por 1 a 4 fontes, mais histórias vizinhas (metade dos
+termos em comum) no mesmo feed: a contagem de grupos mostra se o agrupamento
+reencontra as histórias, e "falsos" conta os grupos que juntaram histórias
+diferentes.
+
+Uso:
+    python benchmarks/bench_clusters.py
+    python benchmarks/bench_clusters.py --sizes 1000 10000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import clusters  # noqa: E402
+
+REPEAT = 3
+SIZES = (500, 1000, 2000, 5000)
+VOCABULARY = 20000
+STORY_WORDS = 12   # termos próprios de cada história (nomes, números, produto)
+SIBLING_RATE = 0.3  # chance de a próxima história ser vizinha da anterior, no mesmo feed
+
+# Dois papers diferentes do mesmo feed, com muitos termos em comum: não podem virar um
+SAME_FEED = [
+    {'title': 'A survey of LLM agents: planning, memory and tool use',
+     'content': 'We survey LLM agents, covering planning, memory, tool use and multi-agent LLM systems.',
+     'source_name': 'arXiv', 'source_type': 'article', 'url': 'https://arxiv.org/abs/2501.00001'},
+    {'title': 'Benchmarking LLM agents on planning, memory and tool use',
+     'content': 'We benchmark LLM agents on planning, memory and tool use tasks across multi-agent LLM systems.',
+     'source_name': 'arXiv', 'source_type': 'article', 'url': 'https://arxiv.org/abs/2501.00002'},
+]
+
+
+def make_items(n: int) -> Tuple[List[dict], int]:
+    """
+    (itens, histórias): histórias com termos próprios, recontadas por 1-4 fontes
+    com palavras comuns diferentes; algumas são vizinhas da anterior (metade
+    dos termos em comum, título próprio) e saem só no feed dela
+    """
+    rng = random.Random(n)
+    words = [f"w{i}" for i in range(VOCABULARY)]
+    common = words[:500]
+    items = []
+    story = 0
+    own = []
+    while len(items) < n:
+        sibling = bool(own) and rng.random() < SIBLING_RATE
+        if sibling:
+            own = rng.sample(words[500:], STORY_WORDS // 2) + own[STORY_WORDS // 2:]
+        else:
+            own = rng.sample(words[500:], STORY_WORDS)
+        for source in range(1 if sibling else rng.randint(1, 4)):
+            title = own[:4] + rng.sample(own[4:], 2) + rng.sample(common, 3)
+            content = rng.sample(own, 8) + rng.choices(common, k=60)
+            items.append({'title': ' '.join(title), 'content': ' '.join(content), 'story': story,
+                          'source_name': f"fonte{source}", 'source_type': 'article',
+                          'published_at': f"2025-01-01T{source:02d}:00:00", 'url': f"https://ex.com/{story}/{source}"})
+        story += 1
+    return items[:n], len({item['story'] for item in items[:n]})
+
+
+def false_merges(items: List[dict], found: List[List[int]]) -> int:
+    """Grupos com itens de histórias diferentes"""
+    return sum(1 for group in found if len({items[i]['story'] for i in group}) > 1)
+
+
+def measure(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    args = parser.parse_args()
+
+    print(f"📊 HASH_DIM={clusters.HASH_DIM}, similaridade ≥ {clusters.SIMILARITY}, mediana de {REPEAT} execuções\n")
+    same_feed = clusters.groups(SAME_FEED)
+    print(f"{'✅' if len(same_feed) == 2 else '❌'} mesmo feed: {len(SAME_FEED)} papers → {len(same_feed)} grupos\n")
+    print(f"{'itens':>7} {'vetores':>9} {'pares':>9} {'total':>9}  grupos/histórias  falsos")
+    for size in args.sizes:
+        items, stories = make_items(size)
+        t_vec, matrix = measure(lambda: clusters.vectorize(items))
+        t_pairs, _ = measure(lambda: clusters.similar_pairs(matrix))
+        t_total, found = measure(lambda: clusters.groups(items))
+        print(f"{size:>7} {t_vec * 1000:>7.0f}ms {t_pairs * 1000:>7.0f}ms {t_total * 1000:>7.0f}ms  "
+              f"{len(found):>7}/{stories:<8}  {false_merges(items, found)}")
+
+if __name__ == "__main__":
+    main()
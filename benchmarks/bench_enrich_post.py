@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Benchmark: enriquecimento de posts
+Compara bytes transferidos e tempo de CPU entre o _enrich_post antigo
+(download completo + BeautifulSoup) e o atual (streaming só do <head>).
+
+Uso:
+    python benchmarks/bench_enrich_post.py [--pages 30]
+
+Serve páginas sintéticas no formato de um post Beehiiv (meta tags no
+<head>, CSS/JS inline e corpo grande) num servidor HTTP local.
+"""
+
+import argparse
+import http.server
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import http_client  # noqa: E402
+import newsletter_collector  # noqa: E402
+import page_meta  # noqa: E402
+from newsletter_collector import REQUEST_HEADERS, NewsletterItem  # noqa: E402
+
+
+def beehiiv_like_page(n: int, with_meta: bool = True) -> bytes:
+    meta = f"""
+<meta property="og:title" content="Post {n}: modelos, agentes e CapEx">
+<meta property="og:description" content="{'Resumo do post. ' * 20}">
+<meta property="article:published_time" content="{datetime.utcnow().isoformat()}Z">
+<script type="application/ld+json">{json.dumps({"@type": "Article", "datePublished": datetime.utcnow().isoformat() + "Z"})}</script>
+""" if with_meta else ""
+    head = f"""<!DOCTYPE html><html lang="pt"><head><meta charset="utf-8">
+<title>Post {n}</title><link rel="preconnect" href="https://media.beehiiv.com">
+{meta}
+<style>{'.x{{color:#111;margin:0 auto;padding:4px}}' * 2500}</style>
+<script>{'window.__b=window.__b||[];' * 3000}</script>
+</head>"""
+    body = "<body><main>" + "<p>Parágrafo do post com análise e links.</p>" * 6000 + "</main></body></html>"
+    return (head + body).encode('utf-8')
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        n = int(self.path.rsplit('-', 1)[-1])
+        body = beehiiv_like_page(n, with_meta='nometa' not in self.path)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # cliente encerrou após o <head>
+
+    def log_message(self, *args):
+        pass
+
+
+def legacy_enrich(item: NewsletterItem) -> int:
+    """_enrich_post antigo (download + soup completo); retorna bytes lidos"""
+    resp = http_client.get(item.url, headers=REQUEST_HEADERS, timeout=15)
+    soup = BeautifulSoup(resp.text, 'lxml')
+    og_desc = soup.find('meta', property='og:description')
+    if og_desc and og_desc.get('content'):
+        item.description = og_desc['content'][:500]
+    og_title = soup.find('meta', property='og:title')
+    if og_title and og_title.get('content'):
+        item.title = og_title['content']
+    date_meta = soup.find('meta', property='article:published_time')
+    if date_meta and date_meta.get('content'):
+        item.published_at = datetime.fromisoformat(date_meta['content'].replace('Z', '+00:00')).replace(tzinfo=None)
+    soup.find_all('script', type='application/ld+json')
+    return len(resp.content)
+
+
+def run(label, fn, urls):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    total_bytes = 0
+    for url in urls:
+        item = NewsletterItem('t', 'd', url, 'Bench', 'bench', 'pt-br', 'ai_models', None)
+        total_bytes += fn(item) or 0
+    return time.process_time() - cpu, time.perf_counter() - wall, total_bytes
+
+
+def new_enrich(item: NewsletterItem) -> int:
+    before = page_meta.stats()['bytes_read']
+    newsletter_collector._enrich_post(item)
+    assert item.title.startswith('Post') or 'nometa' in item.url
+    return page_meta.stats()['bytes_read'] - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=30)
+    args = parser.parse_args()
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    page_size = len(beehiiv_like_page(0))
+    print(f"📊 {args.pages} posts de {page_size / 1024:.0f} KB cada\n")
+    print(f"{'':28} {'CPU':>8} {'parede':>8} {'bytes lidos':>12}")
+    for case, suffix in (("com meta no <head>", "p/post"), ("sem meta (fallback)", "p/nometa")):
+        urls = [f"{base}/{suffix}-{i}" for i in range(args.pages)]
+        for label, fn in (("antes", legacy_enrich), ("depois", new_enrich)):
+            cpu, wall, size = run(label, fn, urls)
+            print(f"{case + ' · ' + label:28} {cpu:>7.2f}s {wall:>7.2f}s {size / 1024:>9.0f} KB")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Benchmark: parser de feeds
+Compara o parse antigo (feedparser.parse + corte em max_per_feed/cutoff)
+com o atual (feed_stream: lxml.iterparse que para em max_per_feed e pula
+as entries anteriores ao cutoff).
+
+Uso:
+    python benchmarks/bench_feed_parser.py                 # feeds sintéticos (arXiv cs.AI grande)
+    python benchmarks/bench_feed_parser.py --feeds-dir .cache/http   # feeds gravados (*.body)
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import feedparser  # noqa: E402
+
+import collector  # noqa: E402
+
+REPEAT = 5
+ARXIV_ENTRIES = 600   # cs.AI num dia de anúncio
+NEWS_ENTRIES = 50
+YOUTUBE_ENTRIES = 15
+
+
+def arxiv_feed(n: int) -> bytes:
+    """RSS 2.0 no formato de rss.arxiv.org: todas as entries com a mesma data"""
+    day = format_datetime(datetime.utcnow().replace(hour=0, minute=0, second=0))
+    abstract = "We propose a method for large language model alignment. " * 25
+    items = "".join(f"""<item><title>Paper {i}: Agents, Reasoning and Benchmarks</title>
+<link>https://arxiv.org/abs/2610.{i:05d}</link>
+<description>arXiv:2610.{i:05d}v1 Announce Type: new Abstract: {abstract}</description>
+<guid isPermaLink="false">oai:arXiv.org:2610.{i:05d}v1</guid>
+<category>cs.AI</category><category>cs.CL</category>
+<pubDate>{day}</pubDate><dc:creator>Author A, Author B, Author C</dc:creator></item>""" for i in range(n))
+    return f"""<?xml version="1.0"?><rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel><title>cs.AI updates on arXiv.org</title>{items}</channel></rss>""".encode()
+
+
+def news_feed(n: int) -> bytes:
+    """RSS de notícias, mais recentes primeiro (uma por hora)"""
+    body = "<p>" + ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40) + "</p>"
+    now = datetime.utcnow()
+    items = "".join(f"""<item><title>Story {i}</title><link>https://example.com/{i}</link>
+<guid isPermaLink="false">example-{i}</guid><dc:creator>Reporter</dc:creator>
+<pubDate>{format_datetime(now - timedelta(hours=i))}</pubDate><category>AI</category>
+<description><![CDATA[{body[:600]}]]></description><content:encoded><![CDATA[{body * 3}]]></content:encoded>
+</item>""" for i in range(n))
+    return f"""<?xml version="1.0"?><rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"
+ xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><title>News</title>{items}</channel></rss>""".encode()
+
+
+def youtube_feed(n: int) -> bytes:
+    now = datetime.utcnow()
+    entries = "".join(f"""<entry><id>yt:video:v{i}</id><yt:videoId>v{i}</yt:videoId>
+<title>Video {i}</title><link rel="alternate" href="https://www.youtube.com/watch?v=v{i}"/>
+<author><name>Channel</name></author><published>{(now - timedelta(hours=12 * i)).isoformat()}+00:00</published>
+<media:group><media:title>Video {i}</media:title><media:description>{'Description. ' * 60}</media:description>
+<media:community><media:starRating count="10" average="5.00"/><media:statistics views="1000"/></media:community>
+</media:group></entry>""" for i in range(n))
+    return f"""<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"
+ xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/">
+<title>Channel</title>{entries}</feed>""".encode()
+
+
+# (nome, corpo, max_per_feed, horas do cutoff, date_fields) — mesmos parâmetros do collector
+def load_feeds(feeds_dir: str) -> List[Tuple[str, bytes, int, int, tuple]]:
+    if feeds_dir:
+        return [(p.stem[:10], p.read_bytes(), 20, 24, collector.FEED_DATE_FIELDS)
+                for p in sorted(Path(feeds_dir).glob('*.body'))]
+    return [
+        ("arxiv_ai", arxiv_feed(ARXIV_ENTRIES), 20, 24, collector.FEED_DATE_FIELDS),
+        ("news", news_feed(NEWS_ENTRIES), 20, 24, collector.FEED_DATE_FIELDS),
+        ("world", news_feed(NEWS_ENTRIES), 10, 24, collector.FEED_DATE_FIELDS),
+        ("youtube", youtube_feed(YOUTUBE_ENTRIES), 5, 48, ('published_parsed',)),
+    ]
+
+
+def legacy_entries(body: bytes, max_per_feed: int, cutoff: datetime, date_fields: tuple) -> List[Dict]:
+    """_parse_entries antes do feed_stream: feedparser no documento inteiro"""
+    entries = []
+    for entry in feedparser.parse(body).entries:
+        slim = {
+            'title': entry.get('title', ''),
+            'summary': entry.get('summary', ''),
+            'link': entry.get('link', ''),
+            'raw': collector._project_entry(entry),
+        }
+        if 'author' in entry:
+            slim['author'] = entry['author']
+        for field in collector.FEED_DATE_FIELDS:
+            if entry.get(field):
+                slim[field] = tuple(entry[field][:6])
+        entries.append(slim)
+    return entries
+
+
+def current_entries(body: bytes, max_per_feed: int, cutoff: datetime, date_fields: tuple) -> List[Dict]:
+    return collector._parse_entries(body, max_per_feed, cutoff, date_fields)
+
+
+def kept(entries: List[Dict], max_per_feed: int, cutoff: datetime, date_fields: tuple) -> List[Dict]:
+    """O que _fetch_feed aproveita das entries (mesmo corte nos dois casos)"""
+    return [e for e in entries[:max_per_feed] if collector._entry_published(e, date_fields) >= cutoff]
+
+
+def measure(fn, body, max_per_feed, cutoff, date_fields):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(body, max_per_feed, cutoff, date_fields)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    entries = fn(body, max_per_feed, cutoff, date_fields)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak, kept(entries, max_per_feed, cutoff, date_fields)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--feeds-dir', help="diretório com feeds gravados (*.body)")
+    args = parser.parse_args()
+
+    feeds = load_feeds(args.feeds_dir)
+    print(f"📊 {len(feeds)} feeds, mediana de {REPEAT} execuções\n")
+    print(f"{'feed':12} {'KB':>6} {'antes':>10} {'depois':>10} {'pico antes':>11} {'pico depois':>12}  itens")
+    total_a = total_b = 0.0
+    for name, body, max_per_feed, hours, date_fields in feeds:
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        time_a, peak_a, items_a = measure(legacy_entries, body, max_per_feed, cutoff, date_fields)
+        time_b, peak_b, items_b = measure(current_entries, body, max_per_feed, cutoff, date_fields)
+        total_a += time_a
+        total_b += time_b
+        same = "=" if items_a == items_b else "≠"
+        print(f"{name:12} {len(body) / 1024:>6.0f} {time_a * 1000:>8.1f}ms {time_b * 1000:>8.1f}ms "
+              f"{peak_a / 1024:>8.0f} KB {peak_b / 1024:>9.0f} KB  {len(items_a)} {same} {len(items_b)}")
+
+    print(f"\n→ tempo total: {total_a * 1000:.0f}ms → {total_b * 1000:.0f}ms ({total_a / total_b:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Benchmark: tempo de import
+Mede, com `python -X importtime` em processos novos, quanto cada ponto de
+entrada leva para carregar antes de fazer qualquer trabalho.
+
+Uso:
+    python benchmarks/bench_import_time.py              # tabela + imports mais pesados
+    python benchmarks/bench_import_time.py --top 15     # mais linhas no ranking
+    python benchmarks/bench_import_time.py --json out.json   # para acompanhar entre commits
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'scripts'
+
+REPEAT = 5
+TOP = 8
+
+# (nome, código executado) — o que cada modo de uso carrega no início
+ENTRY_POINTS = [
+    ("run.py", "import run"),
+    ("sender --preview", "import sender"),
+    ("processor", "import processor"),
+    ("collector", "import collector"),
+    ("curadoria (SDK)", "import processor, anthropic"),
+]
+
+LOCAL_MODULES = {p.stem for p in SCRIPTS_DIR.glob('*.py')}
+
+# "import time:  self [us] | cumulative | imported package"
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def import_times(code: str) -> Tuple[int, List[Tuple[str, int, int]]]:
+    """(total em µs, [(módulo, nível, cumulativo µs)]) de um processo novo"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    modules = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            modules.append((name, (len(indent) - 1) // 2, int(cumulative)))
+    total = sum(cumulative for _, level, cumulative in modules if level == 0)
+    return total, modules
+
+
+def measure(code: str, baseline: set) -> Tuple[float, Dict[str, int]]:
+    """
+    Mediana do total (ms) e, da última execução, o tempo acumulado de cada
+    pacote carregado além da inicialização do interpretador (`baseline`)
+    """
+    totals = []
+    heavy: Dict[str, int] = {}
+    for _ in range(REPEAT):
+        total, modules = import_times(code)
+        totals.append(total / 1000)
+        heavy = {}
+        for name, _, cumulative in modules:
+            package = name.split('.')[0]
+            if name not in baseline and package not in LOCAL_MODULES:
+                heavy[package] = max(heavy.get(package, 0), cumulative)
+    return statistics.median(totals), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--top', type=int, default=TOP, help="imports mais pesados por ponto de entrada")
+    parser.add_argument('--json', help="grava os totais (ms) neste arquivo")
+    args = parser.parse_args()
+
+    print(f"📊 {len(ENTRY_POINTS)} pontos de entrada, mediana de {REPEAT} processos\n")
+    startup, modules = import_times("pass")
+    baseline = {name for name, _, _ in modules}
+    print(f"{'python (vazio)':20} {startup / 1000:>8.1f}ms")
+    results = {}
+    for name, code in ENTRY_POINTS:
+        try:
+            total, heavy = measure(code, baseline)
+        except RuntimeError as e:
+            print(f"{name:20} ❌ {e}")
+            continue
+        results[name] = round(total, 1)
+        top = sorted(heavy.items(), key=lambda kv: kv[1], reverse=True)[:args.top]
+        print(f"{name:20} {total:>8.1f}ms")
+        if top:
+            print("   " + ", ".join(f"{package} {cumulative / 1000:.0f}ms" for package, cumulative in top))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'import_ms': results}, f, indent=2)
+        print(f"\n💾 Totais salvos em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Benchmark: RawItem compacto
+Compara pico de memória e tamanho do artefato entre o RawItem antigo
+(raw_data=dict(entry) + asdict) e o atual (slots + projeção de raw_data).
+
+Uso:
+    python benchmarks/bench_raw_items.py                 # feeds sintéticos
+    python benchmarks/bench_raw_items.py --feeds-dir .cache/http   # feeds gravados (*.body)
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import feedparser  # noqa: E402
+
+import collector  # noqa: E402
+
+FEEDS = 21          # RSS + WORLD + YouTube
+ENTRIES = 20        # max_per_feed
+
+
+@dataclass
+class LegacyRawItem:
+    """RawItem como era antes (dataclass comum, raw_data = entry inteira)"""
+    title: str
+    content: str
+    url: str
+    source_name: str
+    source_type: str
+    author: str
+    published_at: datetime
+    engagement: Dict
+    raw_data: Dict
+
+    def to_dict(self) -> Dict:
+        d = asdict(self)
+        d['published_at'] = self.published_at.isoformat()
+        d['hours_ago'] = 1.0
+        return d
+
+
+def synthetic_feed(n: int) -> bytes:
+    """RSS com o peso típico de um feed de notícias (content:encoded, media, categorias)"""
+    now = format_datetime(datetime.utcnow())
+    body = "<p>" + ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40) + "</p>"
+    items = []
+    for i in range(n):
+        items.append(f"""<item>
+<title>Story {i} about AI models and enterprise SaaS</title>
+<link>https://example.com/news/{i}?utm_source=rss</link>
+<guid isPermaLink="false">example-{i}</guid>
+<comments>https://example.com/news/{i}#comments</comments>
+<dc:creator>Reporter {i}</dc:creator>
+<pubDate>{now}</pubDate>
+<category>AI</category><category>Business</category>
+<description><![CDATA[{body[:600]}]]></description>
+<content:encoded><![CDATA[{body * 3}]]></content:encoded>
+<media:thumbnail url="https://example.com/img/{i}.jpg" width="640" height="360"/>
+</item>""")
+    return f"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"
+ xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:media="http://search.yahoo.com/mrss/">
+<channel><title>Synthetic</title><link>https://example.com</link>
+{''.join(items)}
+</channel></rss>""".encode()
+
+
+def load_feeds(feeds_dir: str) -> List[bytes]:
+    if feeds_dir:
+        return [p.read_bytes() for p in sorted(Path(feeds_dir).glob('*.body'))]
+    return [synthetic_feed(ENTRIES) for _ in range(FEEDS)]
+
+
+def legacy_run(bodies: List[bytes]) -> str:
+    items = []
+    for i, body in enumerate(bodies):
+        for entry in feedparser.parse(body).entries[:ENTRIES]:
+            items.append(LegacyRawItem(
+                title=entry.get('title', ''), content=entry.get('summary', ''),
+                url=entry.get('link', ''), source_name=f"feed{i}", source_type='article',
+                author=entry.get('author', ''), published_at=datetime.utcnow(),
+                engagement={}, raw_data=dict(entry),
+            ))
+    data = {"items": [item.to_dict() for item in items]}
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str)
+
+
+def compact_run(bodies: List[bytes]) -> str:
+    items = []
+    for i, body in enumerate(bodies):
+        for entry in collector._parse_entries(body)[:ENTRIES]:
+            items.append(collector.RawItem(
+                title=entry.get('title', ''), content=entry.get('summary', ''),
+                url=entry.get('link', ''), source_name=f"feed{i}", source_type='article',
+                author=entry.get('author', ''), published_at=datetime.utcnow(),
+                engagement={}, raw_data=entry['raw'],
+            ))
+    data = {"items": [item.to_dict() for item in items]}
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def measure(fn, bodies):
+    tracemalloc.start()
+    start = time.perf_counter()
+    artifact = fn(bodies)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, len(artifact.encode('utf-8')), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--feeds-dir', help="diretório com feeds gravados (*.body)")
+    args = parser.parse_args()
+
+    bodies = load_feeds(args.feeds_dir)
+    print(f"📊 {len(bodies)} feeds, até {ENTRIES} entries cada\n")
+    print(f"{'':10} {'pico memória':>14} {'artefato':>12} {'tempo':>9}")
+    results = {}
+    for name, fn in (("antes", legacy_run), ("depois", compact_run)):
+        peak, size, elapsed = measure(fn, bodies)
+        results[name] = (peak, size)
+        print(f"{name:10} {peak / 1024 / 1024:>11.1f} MB {size / 1024:>9.0f} KB {elapsed:>8.2f}s")
+
+    (peak_a, size_a), (peak_b, size_b) = results["antes"], results["depois"]
+    print(f"\n→ memória: -{100 * (1 - peak_b / peak_a):.0f}% | artefato: -{100 * (1 - size_b / size_a):.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Benchmark: matcher de temas
+Compara a busca ingênua (um regex por termo, como seria com uma lista de
+palavras-chave) com o autômato Aho-Corasick do themes.py, à medida que a
+lista de termos cresce.
+
+Uso:
+    python benchmarks/bench_theme_matcher.py
+    python benchmarks/bench_theme_matcher.py --items 2000
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import themes  # noqa: E402
+from settings import setting  # noqa: E402
+
+REPEAT = 3
+SIZES = (20, 100, 400, 800)
+WORDS = ("modelo agente empresa mercado lançamento regulação investimento nuvem dados "
+         "startup receita aquisição chip energia governo política produto usuário").split()
+
+
+def keyword_list(n: int) -> List[str]:
+    """Termos do config.yaml completados com termos sintéticos até `n`"""
+    terms = list(setting('themes.priority', [])) + list(setting('themes.penalty', []))
+    rng = random.Random(n)
+    while len(terms) < n:
+        terms.append(f"{rng.choice(WORDS)} {rng.choice(WORDS)}{len(terms)}")
+    return terms[:n]
+
+
+def make_items(n: int) -> List[dict]:
+    rng = random.Random(42)
+    base = "OpenAI e Anthropic disputam o mercado de agentes; Brasil discute regulação AI. "
+    return [{'title': f"Notícia {i}: {rng.choice(WORDS)} {rng.choice(WORDS)}",
+             'content': base + ' '.join(rng.choice(WORDS) for _ in range(120))} for i in range(n)]
+
+
+def naive(terms: List[str], items: List[dict]) -> int:
+    patterns = [re.compile(rf"(?<!\w){re.escape(themes.fold(t))}s?(?!\w)") for t in terms]
+    hits = 0
+    for item in items:
+        for field in themes.FIELDS:
+            text = themes.fold(item[field])
+            hits += sum(len(p.findall(text)) for p in patterns)
+    return hits
+
+
+def automaton(terms: List[str], items: List[dict]) -> int:
+    matcher = themes.ThemeMatcher(terms, [])
+    return sum(len(matcher.find(item[field])) for item in items for field in themes.FIELDS)
+
+
+def measure(fn, terms, items):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        hits = fn(terms, items)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--items', type=int, default=500, help="itens sintéticos")
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    print(f"📊 {len(items)} itens, mediana de {REPEAT} execuções\n")
+    print(f"{'termos':>7} {'regex/termo':>12} {'aho-corasick':>13}  ocorrências")
+    for size in SIZES:
+        terms = keyword_list(size)
+        time_a, hits_a = measure(naive, terms, items)
+        time_b, hits_b = measure(automaton, terms, items)
+        same = "=" if hits_a == hits_b else "≠"
+        print(f"{size:>7} {time_a * 1000:>10.0f}ms {time_b * 1000:>11.0f}ms  {hits_a} {same} {hits_b}")
+
+
+if __name__ == "__main__":
+    main()
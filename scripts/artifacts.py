@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Artifacts
+Formato JSONL dos itens brutos entre coleta e curadoria
+
+Linha 1: cabeçalho {"format", "collected_at", "total_items", "breakdown"}
+Demais linhas: um item por linha (formato RawItem.to_dict)
+
+A curadoria vai para CURATED_PATH (JSON comum).
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+RAW_PATH = "/tmp/digest_raw.json"
+RAW_FORMAT = "daily-byte-raw/jsonl-1"
+CURATED_PATH = "/tmp/digest_curated.json"
+
+
+class ItemStreamWriter:
+    """
+    Grava itens em JSONL à medida que chegam.
+
+    Os itens vão para `<path>.part`; finish() escreve o cabeçalho
+    (que só fica pronto no fim da coleta) seguido dos itens, copiando em
+    blocos, e troca o arquivo de forma atômica.
+    """
+
+    def __init__(self, path: str = RAW_PATH):
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.count = 0
+        self._file = open(self.part_path, 'w', encoding='utf-8')
+
+    def write(self, item: Dict) -> None:
+        self._file.write(json.dumps(item, ensure_ascii=False))
+        self._file.write('\n')
+        self.count += 1
+
+    def write_many(self, items: Iterable[Dict]) -> None:
+        for item in items:
+            self.write(item)
+        self._file.flush()
+
+    def finish(self, header: Dict) -> None:
+        self._file.close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as out, open(self.part_path, 'r', encoding='utf-8') as part:
+            out.write(json.dumps({"format": RAW_FORMAT, **header}, ensure_ascii=False))
+            out.write('\n')
+            shutil.copyfileobj(part, out)
+        os.replace(tmp_path, self.path)
+        os.unlink(self.part_path)
+
+    def abort(self) -> None:
+        self._file.close()
+        if os.path.exists(self.part_path):
+            os.unlink(self.part_path)
+
+
+def write_raw(data: Dict, path: str = RAW_PATH) -> None:
+    """Grava de uma vez o resultado em memória da coleta (cabeçalho + 'items')"""
+    writer = ItemStreamWriter(path)
+    try:
+        writer.write_many(data.get('items', []))
+        writer.finish({k: v for k, v in data.items() if k != 'items'})
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def write_curated(data: Dict, path: str = CURATED_PATH) -> None:
+    """Grava a curadoria de forma atômica (tmp + rename)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _is_jsonl(path: str) -> bool:
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.readline()
+    try:
+        return json.loads(first).get('format') == RAW_FORMAT
+    except (ValueError, AttributeError):
+        return False
+
+
+def read_header(path: str = RAW_PATH) -> Dict:
+    """Cabeçalho do artefato (aceita também o JSON antigo com 'items')"""
+    if _is_jsonl(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.loads(f.readline())
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data.pop('items', None)
+    return data
+
+
+def iter_items(path: str = RAW_PATH) -> Iterator[Dict]:
+    """Itera os itens sem carregar o arquivo inteiro (JSON antigo: carrega e itera)"""
+    if not _is_jsonl(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f).get('items', [])
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        f.readline()  # cabeçalho
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def with_current_ages(data: Dict, now: Optional[datetime] = None) -> Dict:
+    """
+    Cópia com 'hours_ago' avançado pelo tempo desde 'collected_at'
+    (coleta reaproveitada de uma execução anterior); recente: devolve `data`.
+    """
+    try:
+        collected_at = datetime.fromisoformat(data['collected_at'])
+    except (KeyError, TypeError, ValueError):
+        return data
+    elapsed = ((now or datetime.utcnow()) - collected_at).total_seconds() / 3600
+    if elapsed < 0.1:
+        return data
+    items = [
+        {**item, 'hours_ago': round(item['hours_ago'] + elapsed, 1)} if 'hours_ago' in item else item
+        for item in data.get('items', [])
+    ]
+    return {**data, 'items': items}
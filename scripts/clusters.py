@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Clusters
+Agrupa a mesma história contada por fontes diferentes (URLs e títulos
+diferentes, texto parecido): TF-IDF com hashing sobre título + começo do
+conteúdo e similaridade de cosseno em NumPy, só entre fontes diferentes.
+Fica um item por história, com coverage_count, sources e first_seen.
+"""
+
+import re
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from dedupe import merged_sources, ordered, preference, source_refs
+from settings import setting
+from themes import fold
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+HASH_BITS = 10
+HASH_DIM = 1 << HASH_BITS  # com sinal no hash, colisões se cancelam em média no produto interno
+SIMILARITY = float(setting('dedupe.cluster_similarity', 0.4))
+CONTENT_CHARS = 600        # título + começo do conteúdo bastam (como no heat.py)
+TITLE_WEIGHT = 2           # palavra do título conta como duas do conteúdo
+BLOCK_ROWS = 1024          # linhas por bloco na matriz de similaridade
+
+WORD_RE = re.compile(r'\w+')
+STOPWORDS = frozenset("""
+    the and for with that this from are was were has have had will its into about after over
+    new says said more than their they you your our not but can all out how what why who when
+    uma por com que para dos das nos nas como mais mas foi ser sao tem seu sua seus suas pelo
+    pela pelos pelas isso este esta esse essa sobre entre ate quando onde tambem novo nova
+""".split())
+
+
+def _tokens(text: str) -> List[str]:
+    """Palavras sem acento, sem stopwords (PT/EN) e com 3+ letras; números ficam ("GPT-5", "o3")"""
+    return [w for w in WORD_RE.findall(fold(text))
+            if w not in STOPWORDS and (len(w) >= 3 or not w.isalpha())]
+
+
+def _terms(item: Dict) -> Counter:
+    terms = Counter(_tokens((item.get('content') or '')[:CONTENT_CHARS]))
+    for word in _tokens(item.get('title') or ''):
+        terms[word] += TITLE_WEIGHT
+    return terms
+
+
+def vectorize(items: List[Dict]) -> np.ndarray:
+    """Matriz (itens × HASH_DIM) de TF-IDF (tf sublinear) com hashing, linhas normalizadas"""
+    vocabulary: Dict[str, int] = {}
+    ids: List[int] = []
+    tfs: List[int] = []
+    lengths: List[int] = []
+    for item in items:
+        terms = _terms(item)
+        ids.extend(vocabulary.setdefault(term, len(vocabulary)) for term in terms)
+        tfs.extend(terms.values())
+        lengths.append(len(terms))
+
+    n = len(items)
+    hashes = np.array([zlib.crc32(term.encode('utf-8')) for term in vocabulary], dtype=np.int64)
+    signs = np.where(hashes >> 31, 1.0, -1.0)
+    ids_arr = np.array(ids, dtype=np.intp)
+    df = np.bincount(ids_arr, minlength=len(vocabulary))
+    idf = np.log((1 + n) / (1 + df)) + 1
+
+    rows = np.repeat(np.arange(n, dtype=np.intp), lengths)
+    cols = (hashes & (HASH_DIM - 1))[ids_arr]
+    vals = (1 + np.log(np.array(tfs, dtype=np.float64))) * (signs * idf)[ids_arr]
+    # bincount soma as colisões do hash (bem mais rápido que np.add.at)
+    matrix = np.bincount(rows * HASH_DIM + cols, weights=vals,
+                         minlength=n * HASH_DIM).astype(np.float32).reshape(n, HASH_DIM)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def similar_pairs(matrix: np.ndarray, threshold: float = SIMILARITY) -> np.ndarray:
+    """Pares (i, j), i < j, com cosseno ≥ threshold; em blocos para não montar a matriz N×N"""
+    found = []
+    for start in range(0, len(matrix), BLOCK_ROWS):
+        block = matrix[start:start + BLOCK_ROWS] @ matrix[start:].T
+        i, j = np.nonzero(np.triu(block >= threshold, k=1))
+        found.append(np.stack([i + start, j + start], axis=1))
+    return np.concatenate(found) if found else np.empty((0, 2), dtype=np.intp)
+
+
+def groups(items: List[Dict], threshold: float = SIMILARITY) -> List[List[int]]:
+    """
+    Índices dos itens de cada história, por ligação média (sem encadeamento
+    A~B, B~C ⇒ A∪C): em ordem de preferência, cada item entra no grupo de
+    maior cosseno médio com todos os membros, se ≥ threshold, ou abre um
+    grupo. Só se juntam fontes diferentes: dois itens do mesmo feed são
+    histórias distintas (ex.: dois papers do arXiv sobre agentes)
+    """
+    if not items:
+        return []
+    matrix = vectorize(items)
+    feeds = [frozenset(ref['source_name'] for ref in source_refs(item)) for item in items]
+    neighbours: List[List[int]] = [[] for _ in items]
+    for i, j in similar_pairs(matrix, threshold).tolist():
+        if feeds[i].isdisjoint(feeds[j]):
+            neighbours[i].append(j)
+            neighbours[j].append(i)
+
+    group_of: Dict[int, int] = {}
+    members: List[List[int]] = []
+    group_feeds: List[Set[str]] = []
+    for i in sorted(range(len(items)), key=lambda k: preference(items[k])):
+        best, best_score = None, threshold
+        for g in sorted({group_of[j] for j in neighbours[i] if j in group_of}):
+            if not feeds[i].isdisjoint(group_feeds[g]):
+                continue
+            score = float((matrix[members[g]] @ matrix[i]).mean())
+            if score > best_score or (best is None and score >= threshold):
+                best, best_score = g, score
+        if best is None:
+            best = len(members)
+            members.append([])
+            group_feeds.append(set())
+        group_of[i] = best
+        members[best].append(i)
+        group_feeds[best] |= feeds[i]
+    return [sorted(group) for group in members]
+
+
+def story(members: List[Dict]) -> Dict:
+    """
+    Representante do grupo (o melhor segundo dedupe.preference) com coverage_count
+    (fontes distintas); sources e first_seen só quando houver mais de uma fonte
+    """
+    best = min(members, key=preference)
+    sources = merged_sources(ref for item in members for ref in source_refs(item))
+    coverage = len({ref['source_name'] for ref in sources})
+    if coverage == 1:
+        return {**best, 'coverage_count': 1}
+    seen = [item['published_at'] for item in members if item.get('published_at')]
+    return {**best, 'coverage_count': coverage, 'sources': sources, 'first_seen': min(seen) if seen else None}
+
+
+def cluster_items(items: List[Dict], threshold: float = SIMILARITY) -> Tuple[List[Dict], int]:
+    """(um item por história, itens absorvidos pelos grupos)"""
+    stories = [story([items[i] for i in group]) for group in groups(items, threshold)]
+    return ordered(stories), len(items) - len(stories)
+
+
+def cluster_raw(raw: Dict) -> Dict:
+    """Resultado do dedupe (cabeçalho + 'items') com um item por história"""
+    started = time.perf_counter()
+    items, merged = cluster_items(raw.get('items', []))
+    covered = sum(1 for item in items if item['coverage_count'] > 1)
+    print(f"🧩 Agrupamento: {merged} itens juntados em outras histórias, {covered} histórias "
+          f"com mais de uma fonte, {len(items)} itens seguem ({time.perf_counter() - started:.2f}s)")
+    return {**raw, 'items': items, 'total_items': len(items), 'stories_merged': merged}
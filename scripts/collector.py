@@ -4,14 +4,28 @@ THE DAILY BYTE - Coletor de Fontes
 Coleta notícias de X, YouTube, LinkedIn e RSS feeds
 """
 
+import math
 import os
-import json
-import feedparser
+import time
 import requests
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from typing import Callable, List, Dict, Optional
+from dataclasses import dataclass
+from concurrent.futures import Future
 import re
+import threading
+
+from artifacts import RAW_PATH, ItemStreamWriter
+import feed_stream
+from fetch_pool import FetchPool
+import http_client
+from http_cache import http_cache
+from settings import TIER1_HANDLES
+from storage import cache_path, load_json, save_json
+from resilience import RetryPolicy, retry_http
+import tracing
+from source_health import PROBE, PROBE_TIMEOUT, SKIP, source_health
+from watermarks import watermark_store
 
 # Import newsletter collector
 try:
@@ -23,24 +37,7 @@ except ImportError:
 # CONFIGURAÇÃO
 # ============================================
 
-# Tier 1 - Primeira Mão (handles do X)
-TIER1_HANDLES = [
-    # OpenAI
-    "sama", "gaborcselle", "maborak",
-    # Anthropic
-    "AnthropicAI", "alexalbert__", "daborak",
-    # Microsoft
-    "satyanadella", "mustafa",
-    # Google
-    "sundarpichai", "JeffDean",
-    # Meta
-    "ylecun", "AIatMeta",
-    # Outros fundadores/researchers
-    "karpathy", "drfeifei", "AndrewYNg",
-    "EMostaque", "caborian", "demaboris",
-    # AI Labs
-    "xaborai", "Mistral", "PerplexityAI",
-]
+# Tier 1 - Primeira Mão (handles do X): TIER1_HANDLES em settings.py (o heat.py também usa)
 
 # RSS Feeds
 RSS_FEEDS = {
@@ -78,11 +75,40 @@ YOUTUBE_CHANNELS = {
     "ai_daily_brief": "UCKa4vLnfLYnxKZ4fKJttGsA",
 }
 
+# Coleta concorrente
+FETCH_MAX_WORKERS = 8
+FETCH_PER_HOST = 2
+FEED_TIMEOUT = (5, 20)  # connect, read (segundos)
+# Deadline global: ao estourar, collect_all segue com resultados parciais
+COLLECT_DEADLINE_SECONDS = float(os.environ.get('COLLECT_DEADLINE_SECONDS', '240'))
+
+FEED_HEADERS = {"User-Agent": "TheDailyByte/2.0 (+https://buttondown.com/totobusnello)"}
+
+# X API
+X_API_URL = "https://api.twitter.com/2"
+X_RATE_LIMIT_PER_15MIN = 15  # config.yaml → apis.x_twitter.rate_limit_per_15min
+X_MAX_PER_HANDLE = 10
+X_SEARCH_PAGE_SIZE = 100        # max_results do search/recent
+X_SEARCH_QUERY_MAX_CHARS = 512  # limite do search/recent no plano básico
+X_LOOKUP_BATCH = 100            # máximo de usernames por /users/by
+X_USER_IDS_CACHE = "x_user_ids.json"
+# 429 / 5xx do X: retry curto; um reset de rate limit longe demais estoura o orçamento e desiste
+X_RETRY = RetryPolicy('X', max_attempts=3, base_delay=2.0, max_delay=30.0, budget_seconds=60.0)
+
 # ============================================
 # DATA CLASSES
 # ============================================
 
-@dataclass
+# raw_data guarda só estes campos da entry/tweet original (o resto é descartado na coleta)
+FEED_RAW_FIELDS = ('id', 'comments', 'yt_videoid')
+# Campos de data que _entry_published consulta
+FEED_DATE_FIELDS = ('published_parsed', 'updated_parsed')
+# Versão do parse guardado no cache HTTP: 2 = entries antigas puladas sem
+# interromper a leitura (a 1 parava na primeira e perdia as frescas seguintes)
+FEED_PARSE_VERSION = 2
+
+
+@dataclass(slots=True)
 class RawItem:
     """Item bruto coletado das fontes"""
     title: str
@@ -99,173 +125,474 @@ class RawItem:
         return (datetime.utcnow() - self.published_at).total_seconds() / 3600
 
     def to_dict(self) -> Dict:
-        d = asdict(self)
-        d['published_at'] = self.published_at.isoformat()
-        d['hours_ago'] = round(self.hours_ago(), 1)
-        return d
+        # Sem asdict(): engagement/raw_data já são projeções pequenas, não precisam de deep copy
+        return {
+            'title': self.title,
+            'content': self.content,
+            'url': self.url,
+            'source_name': self.source_name,
+            'source_type': self.source_type,
+            'author': self.author,
+            'published_at': self.published_at.isoformat(),
+            'engagement': self.engagement,
+            'raw_data': self.raw_data,
+            'hours_ago': round(self.hours_ago(), 1),
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> 'RawItem':
+        """Reconstrói um item salvo com to_dict()"""
+        fields = {k: v for k, v in d.items() if k != 'hours_ago'}
+        fields['published_at'] = datetime.fromisoformat(d['published_at'])
+        return cls(**fields)
 
 
 # ============================================
 # COLETORES
 # ============================================
 
-def _parse_feed_items(feeds: dict, cutoff, source_type_fn=None, max_per_feed: int = 20) -> List[RawItem]:
-    """Coleta itens de um dicionário de RSS feeds"""
-    items = []
+def _entry_published(entry, date_fields=FEED_DATE_FIELDS) -> datetime:
+    """Data de publicação de uma entry do feedparser (fallback: agora)"""
+    for field in date_fields:
+        parsed = entry.get(field)
+        if parsed:
+            return datetime(*parsed[:6])
+    return datetime.utcnow()
+
+
+def _project_entry(entry) -> Dict:
+    """raw_data de uma entry de feed: id/comments/yt_videoid e os termos das tags"""
+    raw = {field: entry[field] for field in FEED_RAW_FIELDS if entry.get(field)}
+    tags = [tag['term'] for tag in entry.get('tags') or [] if tag.get('term')]
+    if tags:
+        raw['tags'] = tags
+    return raw
+
+
+def _project_tweet(tweet: Dict) -> Dict:
+    """raw_data de um tweet: ids e as URLs expandidas (sem t.co)"""
+    raw = {'id': tweet['id']}
+    if tweet.get('author_id'):
+        raw['author_id'] = tweet['author_id']
+    urls = [u['expanded_url'] for u in tweet.get('entities', {}).get('urls', []) if u.get('expanded_url')]
+    if urls:
+        raw['urls'] = urls
+    return raw
+
+
+def _parse_entries(content: bytes, max_entries: Optional[int] = None, cutoff: Optional[datetime] = None,
+                   date_fields=FEED_DATE_FIELDS) -> List[Dict]:
+    """
+    Entries do feed reduzidas aos campos usados na coleta
+    (formato guardado no cache HTTP).
 
-    for source_name, feed_url in feeds.items():
-        try:
-            feed = feedparser.parse(feed_url)
-            for entry in feed.entries[:max_per_feed]:
-                # Parse date
-                published = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    published = datetime(*entry.updated_parsed[:6])
-                else:
-                    published = datetime.utcnow()
-
-                # Skip old items
-                if published < cutoff:
-                    continue
-
-                if source_type_fn:
-                    stype = source_type_fn(source_name)
-                else:
-                    stype = 'article' if 'arxiv' not in source_name else 'paper'
-
-                items.append(RawItem(
-                    title=entry.get('title', ''),
-                    content=entry.get('summary', ''),
-                    url=entry.get('link', ''),
-                    source_name=source_name,
-                    source_type=stype,
-                    author=entry.get('author', source_name),
-                    published_at=published,
-                    engagement={},
-                    raw_data=dict(entry)
-                ))
-        except Exception as e:
-            print(f"Error fetching {source_name}: {e}")
+    Usa o parser em streaming (feed_stream), que para em `max_entries` e
+    pula as entries anteriores ao `cutoff`; XML inválido ou formato
+    desconhecido vai para o feedparser.
+    """
+    try:
+        entries = feed_stream.parse_entries(content, max_entries, cutoff, date_fields)
+        feed_stream.record(native=True)
+        return entries
+    except feed_stream.PARSE_ERRORS:
+        feed_stream.record(native=False)
+
+    import feedparser  # só no fallback: a maioria dos feeds nunca chega aqui
+
+    entries = []
+    for entry in feedparser.parse(content).entries:
+        slim = {
+            'title': entry.get('title', ''),
+            'summary': entry.get('summary', ''),
+            'link': entry.get('link', ''),
+            'raw': _project_entry(entry),
+        }
+        if 'author' in entry:
+            slim['author'] = entry['author']
+        for field in FEED_DATE_FIELDS:
+            if entry.get(field):
+                slim[field] = tuple(entry[field][:6])
+        entries.append(slim)
+    return entries
+
+
+def _fetch_feed(source_name: str, feed_url: str, cutoff, stype: str,
+                max_per_feed: int, date_fields=FEED_DATE_FIELDS,
+                label: str = '', tag: str = 'rss') -> List[RawItem]:
+    """
+    Baixa e parseia um único feed (executa dentro do FetchPool).
+    GUIDs já vistos em execuções anteriores não são rematerializados:
+    o item salvo no watermark é reaproveitado.
+    """
+    key = f"feed:{feed_url}"
+    mark = watermark_store.source(key)
+    items = [RawItem.from_dict(d) for d in mark.carried(cutoff)]
+
+    # Circuito aberto: fica só com os itens já salvos, sem pagar o timeout de novo
+    mode = source_health.check(key, source_name)
+    if mode == SKIP:
+        return items
+
+    started = time.monotonic()
+    try:
+        # GET condicional: num 304 as entries vêm do parse salvo no cache
+        # O parse salvo já vem cortado em max_per_feed/cutoff; como o cutoff só
+        # avança entre execuções, ele continua válido num 304
+        resp = http_cache.get(feed_url, headers=FEED_HEADERS,
+                              timeout=PROBE_TIMEOUT if mode == PROBE else FEED_TIMEOUT,
+                              parse=lambda content: _parse_entries(content, max_per_feed, cutoff, date_fields),
+                              tag=tag, parse_version=FEED_PARSE_VERSION)
+        if resp.status_code != 200:
+            raise RuntimeError(f"HTTP {resp.status_code}")
+        for entry in resp.parsed[:max_per_feed]:
+            raw = entry['raw'] if 'raw' in entry else _project_entry(entry)
+            guid = raw.get('id') or entry.get('link', '')
+            if mark.seen(guid):
+                continue
+
+            published = _entry_published(entry, date_fields)
+
+            # Skip old items
+            if published < cutoff:
+                continue
+
+            item = RawItem(
+                title=entry.get('title', ''),
+                content=entry.get('summary', ''),
+                url=entry.get('link', ''),
+                source_name=source_name,
+                source_type=stype,
+                author=entry.get('author', source_name),
+                published_at=published,
+                engagement={},
+                raw_data=raw
+            )
+            mark.add(guid, item.to_dict())
+            items.append(item)
+        source_health.record_success(key, time.monotonic() - started,
+                                     0 if resp.from_cache else len(resp.content), len(items))
+    except Exception as e:
+        source_health.record_failure(key, time.monotonic() - started, e)
+        print(f"Error fetching {label}{source_name}: {e}")
 
     return items
 
 
-def collect_rss_feeds() -> List[RawItem]:
+def _submit_feeds(pool: FetchPool, feeds: dict, cutoff, source_type_fn=None,
+                  max_per_feed: int = 20, **kwargs) -> Dict[str, Future]:
+    """Agenda um dicionário de RSS feeds no pool"""
+    futures = {}
+    for source_name, feed_url in feeds.items():
+        if source_type_fn:
+            stype = source_type_fn(source_name)
+        else:
+            stype = 'article' if 'arxiv' not in source_name else 'paper'
+        futures[source_name] = pool.submit(
+            feed_url, tracing.traced, f"{kwargs.get('label', '')}{source_name}",
+            _fetch_feed, source_name, feed_url, cutoff, stype, max_per_feed, **kwargs
+        )
+    return futures
+
+
+def _gather_items(pool: FetchPool, futures: Dict[str, Future], label: str = '') -> List[RawItem]:
+    """Junta os itens dos futures na ordem das fontes (parcial se o deadline estourar)"""
+    items = []
+    for source_items in pool.gather(futures, label=label).values():
+        items.extend(source_items)
+    return items
+
+
+def _parse_feed_items(feeds: dict, cutoff, source_type_fn=None, max_per_feed: int = 20,
+                      pool: Optional[FetchPool] = None) -> List[RawItem]:
+    """Coleta itens de um dicionário de RSS feeds"""
+    if pool is None:
+        with FetchPool(FETCH_MAX_WORKERS, FETCH_PER_HOST) as local_pool:
+            return _parse_feed_items(feeds, cutoff, source_type_fn, max_per_feed, local_pool)
+
+    futures = _submit_feeds(pool, feeds, cutoff, source_type_fn, max_per_feed)
+    return _gather_items(pool, futures)
+
+
+def _rss_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(hours=24)
+
+
+def collect_rss_feeds(pool: Optional[FetchPool] = None) -> List[RawItem]:
     """Coleta itens de RSS feeds de tech"""
-    cutoff = datetime.utcnow() - timedelta(hours=24)
-    return _parse_feed_items(RSS_FEEDS, cutoff)
+    return _parse_feed_items(RSS_FEEDS, _rss_cutoff(), pool=pool)
 
 
-def collect_world_feeds() -> List[RawItem]:
-    """Coleta notícias do mundo real (governos, empresas, geopolítica)"""
-    cutoff = datetime.utcnow() - timedelta(hours=24)
-    return _parse_feed_items(
-        WORLD_FEEDS, cutoff,
+def _submit_world_feeds(pool: FetchPool) -> Dict[str, Future]:
+    return _submit_feeds(
+        pool, WORLD_FEEDS, _rss_cutoff(),
         source_type_fn=lambda _: 'world',
-        max_per_feed=10
+        max_per_feed=10,
+        tag='world'
     )
 
 
-def collect_youtube_feeds() -> List[RawItem]:
-    """Coleta vídeos recentes via YouTube RSS"""
-    items = []
+def collect_world_feeds(pool: Optional[FetchPool] = None) -> List[RawItem]:
+    """Coleta notícias do mundo real (governos, empresas, geopolítica)"""
+    if pool is None:
+        with FetchPool(FETCH_MAX_WORKERS, FETCH_PER_HOST) as local_pool:
+            return collect_world_feeds(local_pool)
+
+    return _gather_items(pool, _submit_world_feeds(pool))
+
+
+def _submit_youtube_feeds(pool: FetchPool) -> Dict[str, Future]:
     cutoff = datetime.utcnow() - timedelta(hours=48)  # 48h for videos
+    feeds = {
+        channel_name: f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+        for channel_name, channel_id in YOUTUBE_CHANNELS.items()
+    }
+    return _submit_feeds(
+        pool, feeds, cutoff,
+        source_type_fn=lambda _: 'video',
+        max_per_feed=5,  # Max 5 per channel
+        date_fields=('published_parsed',),
+        label='YouTube ',
+        tag='youtube'
+    )
 
-    for channel_name, channel_id in YOUTUBE_CHANNELS.items():
-        feed_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-        try:
-            feed = feedparser.parse(feed_url)
-            for entry in feed.entries[:5]:  # Max 5 per channel
-                published = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published = datetime(*entry.published_parsed[:6])
-                else:
-                    published = datetime.utcnow()
-
-                if published < cutoff:
-                    continue
-
-                items.append(RawItem(
-                    title=entry.get('title', ''),
-                    content=entry.get('summary', ''),
-                    url=entry.get('link', ''),
-                    source_name=channel_name,
-                    source_type='video',
-                    author=entry.get('author', channel_name),
-                    published_at=published,
-                    engagement={},
-                    raw_data=dict(entry)
-                ))
-        except Exception as e:
-            print(f"Error fetching YouTube {channel_name}: {e}")
 
-    return items
+def collect_youtube_feeds(pool: Optional[FetchPool] = None) -> List[RawItem]:
+    """Coleta vídeos recentes via YouTube RSS"""
+    if pool is None:
+        with FetchPool(FETCH_MAX_WORKERS, FETCH_PER_HOST) as local_pool:
+            return collect_youtube_feeds(local_pool)
+
+    return _gather_items(pool, _submit_youtube_feeds(pool), label='YouTube ')
+
+
+_x_ids_lock = threading.Lock()
+
+
+def _x_get(path: str, headers: dict, params: dict, calls: List[str], endpoint: str = '') -> requests.Response:
+    """GET na API do X com X_RETRY; cada tentativa conta em `calls`"""
+    def send():
+        calls.append(endpoint or path)
+        return http_client.get(f"{X_API_URL}/{path}", headers=headers, params=params)
+    return retry_http(send, X_RETRY)
 
 
-def collect_x_posts(bearer_token: str) -> List[RawItem]:
+def _load_x_user_ids() -> Dict[str, str]:
+    """Cache persistente handle (minúsculo) → user ID; IDs do X não mudam"""
+    return load_json(cache_path(X_USER_IDS_CACHE), default={})
+
+
+def _remember_x_user_ids(found: Dict[str, str]) -> None:
+    if not found:
+        return
+    with _x_ids_lock:
+        ids = _load_x_user_ids()
+        ids.update(found)
+        save_json(cache_path(X_USER_IDS_CACHE), ids)
+
+
+def _resolve_x_user_ids(handles: List[str], headers: dict, calls: List[str]) -> Dict[str, str]:
     """
-    Coleta posts recentes do X via API
-    Requer X API Bearer Token
+    handle → user ID: usa o cache e resolve os que faltam em lote
+    (uma chamada /users/by a cada 100 handles)
+    """
+    known = _load_x_user_ids()
+    missing = [h for h in handles if h.lower() not in known]
+
+    found = {}
+    for i in range(0, len(missing), X_LOOKUP_BATCH):
+        batch = missing[i:i + X_LOOKUP_BATCH]
+        resp = _x_get("users/by", headers, {"usernames": ",".join(batch)}, calls)
+        if resp.status_code != 200:
+            print(f"Error resolving X users: HTTP {resp.status_code}")
+            continue
+        for user in resp.json().get('data', []):
+            found[user['username'].lower()] = user['id']
+
+    _remember_x_user_ids(found)
+    known.update(found)
+    return {h: known[h.lower()] for h in handles if h.lower() in known}
+
+
+def _x_query_batches(handles: List[str]) -> List[List[str]]:
+    """Agrupa handles em queries 'from:a OR from:b' dentro do limite de caracteres"""
+    batches, current, length = [], [], 0
+    for handle in handles:
+        term = f"from:{handle}"
+        extra = len(term) + (4 if current else 0)  # " OR "
+        if current and length + extra > X_SEARCH_QUERY_MAX_CHARS:
+            batches.append(current)
+            current, length = [], 0
+            extra = len(term)
+        current.append(handle)
+        length += extra
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _tweet_to_item(tweet: dict, handle: str) -> RawItem:
+    created_at = datetime.fromisoformat(tweet['created_at'].replace('Z', '+00:00')).replace(tzinfo=None)
+    metrics = tweet.get('public_metrics', {})
+    return RawItem(
+        title=tweet['text'][:100],
+        content=tweet['text'],
+        url=f"https://x.com/{handle}/status/{tweet['id']}",
+        source_name=f"@{handle}",
+        source_type='tweet',
+        author=handle,
+        published_at=created_at,
+        engagement={
+            'likes': metrics.get('like_count', 0),
+            'retweets': metrics.get('retweet_count', 0),
+            'replies': metrics.get('reply_count', 0)
+        },
+        raw_data=_project_tweet(tweet)
+    )
+
+
+def _x_start_time(cutoff: datetime) -> str:
+    return cutoff.replace(microsecond=0).isoformat() + 'Z'
+
+
+def _fetch_x_timelines(handles: List[str], headers: dict, cutoff, calls: List[str],
+                       since_id: Optional[str] = None) -> Dict[str, List[dict]]:
+    """Fallback sem search: uma chamada /users/{id}/tweets por handle (IDs do cache)"""
+    user_ids = _resolve_x_user_ids(handles, headers, calls)
+    tweets_by_handle = {}
+    for handle in handles:
+        user_id = user_ids.get(handle)
+        if not user_id:
+            continue
+        if len(calls) >= X_RATE_LIMIT_PER_15MIN:
+            print(f"   ⚠️ Limite de {X_RATE_LIMIT_PER_15MIN} chamadas/15min atingido, parando timelines do X")
+            break
+        params = {
+            "max_results": X_MAX_PER_HANDLE,
+            "start_time": _x_start_time(cutoff),
+            "tweet.fields": "created_at,public_metrics,entities",
+        }
+        if since_id:
+            params["since_id"] = since_id
+        resp = _x_get(f"users/{user_id}/tweets", headers, params, calls, 'users/tweets')
+        if resp.status_code == 429:
+            print("   ⚠️ X rate limit (429) persistente, parando timelines do X")
+            break
+        if resp.status_code != 200:
+            print(f"Error fetching X timeline @{handle}: HTTP {resp.status_code}")
+            continue
+        tweets_by_handle[handle] = resp.json().get('data', [])
+    return tweets_by_handle
+
+
+def _fetch_x_batch(handles: List[str], headers: dict, cutoff, calls: List[str]) -> List[RawItem]:
+    """
+    Tweets recentes de um grupo de handles numa única busca
+    (search/recent com 'from:a OR from:b ...'). Se o plano da API não
+    tiver search, cai para timelines individuais com IDs em cache.
     """
+    by_lower = {h.lower(): h for h in handles}
+    tweets_by_handle: Dict[str, List[dict]] = {h: [] for h in handles}
+    learned_ids = {}
+
+    # since_id: a API só devolve tweets posteriores à última execução
+    mark = watermark_store.source("x:" + ",".join(sorted(by_lower)))
+
+    params = {
+        "query": " OR ".join(f"from:{h}" for h in handles),
+        "max_results": X_SEARCH_PAGE_SIZE,
+        "start_time": _x_start_time(cutoff),
+        "tweet.fields": "created_at,public_metrics,entities,author_id",
+        "expansions": "author_id",
+    }
+    if mark.since_id:
+        params["since_id"] = mark.since_id
+    # Páginas suficientes para X_MAX_PER_HANDLE de cada handle: um handle
+    # muito ativo não arrasta a paginação pela janela inteira
+    max_pages = math.ceil(len(handles) * X_MAX_PER_HANDLE / X_SEARCH_PAGE_SIZE)
+    for _ in range(max_pages):
+        if len(calls) >= X_RATE_LIMIT_PER_15MIN:
+            print(f"   ⚠️ Limite de {X_RATE_LIMIT_PER_15MIN} chamadas/15min atingido, parando busca do X")
+            break
+        resp = _x_get("tweets/search/recent", headers, params, calls)
+        if resp.status_code in (401, 403):
+            print(f"   ℹ️ X search indisponível (HTTP {resp.status_code}), usando timelines")
+            tweets_by_handle = _fetch_x_timelines(handles, headers, cutoff, calls, mark.since_id)
+            break
+        if resp.status_code != 200:
+            print(f"Error fetching X search: HTTP {resp.status_code}")
+            break
+
+        body = resp.json()
+        authors = {u['id']: u['username'].lower() for u in body.get('includes', {}).get('users', [])}
+        for tweet in body.get('data', []):
+            username = authors.get(tweet.get('author_id'))
+            handle = by_lower.get(username)
+            if not handle:
+                continue
+            learned_ids[username] = tweet['author_id']
+            tweets_by_handle[handle].append(tweet)
+
+        # Pagina só enquanto algum handle ainda pode ter menos que o limite
+        next_token = body.get('meta', {}).get('next_token')
+        full = all(len(t) >= X_MAX_PER_HANDLE for t in tweets_by_handle.values())
+        if not next_token or full:
+            break
+        params['next_token'] = next_token
+
+    _remember_x_user_ids(learned_ids)
+
+    items_by_handle: Dict[str, List[RawItem]] = {h: [] for h in handles}
+    for d in mark.carried(cutoff):
+        if d['author'] in items_by_handle:
+            items_by_handle[d['author']].append(RawItem.from_dict(d))
+    for handle in handles:
+        for tweet in tweets_by_handle.get(handle, []):
+            mark.advance_since_id(tweet['id'])
+            if mark.seen(tweet['id']):
+                continue
+            item = _tweet_to_item(tweet, handle)
+            if item.published_at < cutoff:
+                continue
+            mark.add(tweet['id'], item.to_dict())
+            items_by_handle[handle].append(item)
+
     items = []
+    for handle in handles:
+        handle_items = sorted(items_by_handle[handle], key=lambda i: i.published_at, reverse=True)
+        items.extend(handle_items[:X_MAX_PER_HANDLE])
+    return items
 
-    if not bearer_token:
-        print("X_BEARER_TOKEN not set, skipping X collection")
-        return items
 
+def _submit_x_posts(pool: FetchPool, bearer_token: str, calls: List[str]) -> Dict[str, Future]:
     headers = {"Authorization": f"Bearer {bearer_token}"}
     cutoff = datetime.utcnow() - timedelta(hours=24)
+    return {
+        f"batch {i + 1}": pool.submit(X_API_URL, tracing.traced, f"X batch {i + 1}",
+                                      _fetch_x_batch, handles, headers, cutoff, calls)
+        for i, handles in enumerate(_x_query_batches(TIER1_HANDLES))
+    }
 
-    for handle in TIER1_HANDLES:
-        try:
-            # Get user ID
-            user_url = f"https://api.twitter.com/2/users/by/username/{handle}"
-            user_resp = requests.get(user_url, headers=headers)
-            if user_resp.status_code != 200:
-                continue
-            user_id = user_resp.json().get('data', {}).get('id')
-            if not user_id:
-                continue
 
-            # Get recent tweets
-            tweets_url = f"https://api.twitter.com/2/users/{user_id}/tweets"
-            params = {
-                "max_results": 10,
-                "tweet.fields": "created_at,public_metrics,entities",
-                "expansions": "author_id"
-            }
-            tweets_resp = requests.get(tweets_url, headers=headers, params=params)
-            if tweets_resp.status_code != 200:
-                continue
+def _x_budget_line(calls: List[str]) -> str:
+    return f"{len(calls)} chamadas à API (limite {X_RATE_LIMIT_PER_15MIN}/15min)"
+
+
+def collect_x_posts(bearer_token: str, pool: Optional[FetchPool] = None) -> List[RawItem]:
+    """
+    Coleta posts recentes do X via API
+    Requer X API Bearer Token
+    """
+    if not bearer_token:
+        print("X_BEARER_TOKEN not set, skipping X collection")
+        return []
 
-            tweets = tweets_resp.json().get('data', [])
-            for tweet in tweets:
-                created_at = datetime.fromisoformat(tweet['created_at'].replace('Z', '+00:00')).replace(tzinfo=None)
-
-                if created_at < cutoff:
-                    continue
-
-                metrics = tweet.get('public_metrics', {})
-                items.append(RawItem(
-                    title=tweet['text'][:100],
-                    content=tweet['text'],
-                    url=f"https://x.com/{handle}/status/{tweet['id']}",
-                    source_name=f"@{handle}",
-                    source_type='tweet',
-                    author=handle,
-                    published_at=created_at,
-                    engagement={
-                        'likes': metrics.get('like_count', 0),
-                        'retweets': metrics.get('retweet_count', 0),
-                        'replies': metrics.get('reply_count', 0)
-                    },
-                    raw_data=tweet
-                ))
-        except Exception as e:
-            print(f"Error fetching X @{handle}: {e}")
+    if pool is None:
+        with FetchPool(FETCH_MAX_WORKERS, FETCH_PER_HOST) as local_pool:
+            return collect_x_posts(bearer_token, local_pool)
 
+    calls: List[str] = []
+    items = _gather_items(pool, _submit_x_posts(pool, bearer_token, calls), label='X ')
+    print(f"   → X: {_x_budget_line(calls)}")
     return items
 
 
@@ -273,76 +600,131 @@ def collect_x_posts(bearer_token: str) -> List[RawItem]:
 # MAIN
 # ============================================
 
-def collect_all() -> Dict:
-    """Coleta de todas as fontes"""
+def collect_all(output_path: Optional[str] = None,
+                on_items: Optional[Callable[[List[Dict]], None]] = None) -> Dict:
+    """
+    Coleta de todas as fontes.
+
+    Com `output_path`, cada grupo de fontes (newsletters, RSS, mundo,
+    YouTube, X) é gravado em JSONL (artifacts.py) assim que é reunido, e o
+    dict retornado traz só o cabeçalho, sem 'items'.
+    Sem `output_path`, devolve tudo em memória, ordenado por recência.
+    Com `on_items`, os itens (dicts) de cada fonte são entregues assim que ela
+    termina, na thread do pool (exatamente os que entram no resultado).
+    """
     print("🔥 THE DAILY BYTE - Iniciando coleta...")
 
     all_items = []
-
-    # RSS Feeds (tech)
-    print("📰 Coletando RSS feeds...")
-    rss_items = collect_rss_feeds()
-    all_items.extend(rss_items)
-    print(f"   → {len(rss_items)} itens de RSS")
-
-    # World Feeds (Reuters, Forbes, BBC)
-    print("🌍 Coletando mundo real...")
-    world_items = collect_world_feeds()
-    all_items.extend(world_items)
-    print(f"   → {len(world_items)} itens do mundo real")
-
-    # YouTube
-    print("📺 Coletando YouTube...")
-    youtube_items = collect_youtube_feeds()
-    all_items.extend(youtube_items)
-    print(f"   → {len(youtube_items)} vídeos")
-
-    # X/Twitter
-    print("🐦 Coletando X...")
+    writer = ItemStreamWriter(output_path) if output_path else None
     x_bearer = os.environ.get('X_BEARER_TOKEN', '')
-    x_items = collect_x_posts(x_bearer)
-    all_items.extend(x_items)
-    print(f"   → {len(x_items)} tweets")
-
-    # Newsletters (AiDrop, Evolving AI, Update Diário, TechDrop)
-    newsletter_items_raw = []
-    if collect_all_newsletters:
-        print("📰 Coletando newsletters...")
-        newsletter_items_raw = collect_all_newsletters()
-        print(f"   → {len(newsletter_items_raw)} itens de newsletters")
-    else:
-        print("⚠️ Newsletter collector não disponível")
-
-    # Sort by recency (RawItem objects)
-    all_items.sort(key=lambda x: x.published_at, reverse=True)
-
-    # Merge: convert RawItems to dicts + add newsletter items (already dicts)
-    all_items_dicts = [item.to_dict() for item in all_items]
-    all_items_dicts.extend(newsletter_items_raw)
+    x_calls: List[str] = []
+    deadline = time.monotonic() + COLLECT_DEADLINE_SECONDS
+
+    def emit(items: List[RawItem]) -> None:
+        if writer:
+            writer.write_many(item.to_dict() for item in items)
+        else:
+            all_items.extend(items)
+
+    try:
+        stream = (lambda items: on_items([item.to_dict() for item in items])) if on_items else None
+        with FetchPool(FETCH_MAX_WORKERS, FETCH_PER_HOST, deadline=deadline, on_result=stream) as pool:
+            # Agenda todas as fontes de uma vez; o pool limita concorrência por host
+            pending = {
+                "rss": _submit_feeds(pool, RSS_FEEDS, _rss_cutoff()),
+                "world": _submit_world_feeds(pool),
+                "youtube": _submit_youtube_feeds(pool),
+                "x": _submit_x_posts(pool, x_bearer, x_calls) if x_bearer else {},
+            }
 
+            # Newsletters (AiDrop, Evolving AI, Update Diário, TechDrop)
+            # rodam na thread principal enquanto os feeds baixam
+            newsletter_items_raw = []
+            if collect_all_newsletters:
+                print("📰 Coletando newsletters...")
+                with tracing.span("newsletters", kind=tracing.GROUP) as group:
+                    newsletter_items_raw = collect_all_newsletters()
+                    group.set(items=len(newsletter_items_raw))
+                if on_items:
+                    on_items(newsletter_items_raw)
+                if writer:
+                    writer.write_many(newsletter_items_raw)
+                print(f"   → {len(newsletter_items_raw)} itens de newsletters (cache: {http_cache.summary('newsletters')})")
+            else:
+                print("⚠️ Newsletter collector não disponível")
+
+            # RSS Feeds (tech)
+            print("📰 Coletando RSS feeds...")
+            rss_items = _gather_items(pool, pending["rss"])
+            emit(rss_items)
+            print(f"   → {len(rss_items)} itens de RSS (cache: {http_cache.summary('rss')})")
+
+            # World Feeds (Reuters, Forbes, BBC)
+            print("🌍 Coletando mundo real...")
+            world_items = _gather_items(pool, pending["world"])
+            emit(world_items)
+            print(f"   → {len(world_items)} itens do mundo real (cache: {http_cache.summary('world')})")
+
+            # YouTube
+            print("📺 Coletando YouTube...")
+            youtube_items = _gather_items(pool, pending["youtube"], label='YouTube ')
+            emit(youtube_items)
+            print(f"   → {len(youtube_items)} vídeos (cache: {http_cache.summary('youtube')})")
+
+            # X/Twitter
+            print("🐦 Coletando X...")
+            if not x_bearer:
+                print("X_BEARER_TOKEN not set, skipping X collection")
+            x_items = _gather_items(pool, pending["x"], label='X ')
+            emit(x_items)
+            print(f"   → {len(x_items)} tweets" + (f" ({_x_budget_line(x_calls)})" if x_bearer else ""))
+    except BaseException:
+        if writer:
+            writer.abort()
+        raise
+
+    breakdown = {
+        "rss": len(rss_items),
+        "world": len(world_items),
+        "youtube": len(youtube_items),
+        "x": len(x_items),
+        "newsletters": len(newsletter_items_raw)
+    }
     result = {
         "collected_at": datetime.utcnow().isoformat(),
-        "total_items": len(all_items_dicts),
-        "breakdown": {
-            "rss": len(rss_items),
-            "world": len(world_items),
-            "youtube": len(youtube_items),
-            "x": len(x_items),
-            "newsletters": len(newsletter_items_raw)
-        },
-        "items": all_items_dicts
+        "total_items": sum(breakdown.values()),
+        "breakdown": breakdown,
     }
 
-    print(f"\n✅ Total coletado: {len(all_items_dicts)} itens")
+    if writer:
+        writer.finish(result)
+    else:
+        # Sort by recency (RawItem objects)
+        all_items.sort(key=lambda x: x.published_at, reverse=True)
+
+        # Merge: convert RawItems to dicts + add newsletter items (already dicts)
+        all_items_dicts = [item.to_dict() for item in all_items]
+        all_items_dicts.extend(newsletter_items_raw)
+        result["items"] = all_items_dicts
+
+    evicted = http_cache.evict()
+    print(f"\n💾 Cache HTTP: {http_cache.summary()}" + (f" · {evicted} entradas expiradas" if evicted else ""))
+
+    print(f"🧾 Parser de feeds: {feed_stream.summary()}")
+    http_client.print_connection_stats()
+
+    watermark_store.save()
+    source_health.save()
+    source_health.print_summary()
+    marks = watermark_store.totals()
+    if marks['reused']:
+        print(f"🔖 Watermarks: {marks['added']} itens novos, {marks['reused']} reaproveitados de execuções anteriores")
+
+    print(f"\n✅ Total coletado: {result['total_items']} itens")
+    if writer:
+        print(f"💾 Salvo em {output_path}")
     return result
 
 
 if __name__ == "__main__":
-    data = collect_all()
-
-    # Save to file
-    output_path = "/tmp/digest_raw.json"
-    with open(output_path, 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
-    print(f"💾 Salvo em {output_path}")
+    collect_all(output_path=RAW_PATH)
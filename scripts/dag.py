@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - DAG
+Etapas encadeadas com cache por conteúdo: a saída de cada etapa fica
+guardada sob o hash das entradas (conteúdo das saídas das dependências +
+config, prompt, modelo) e é reaproveitada enquanto nada disso muda
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import tracing
+from storage import CACHE_DIR, cache_path, load_json, save_json
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+DAG_DIR = "dag"
+MANIFEST_FILE = "last_run.json"
+# Saídas mais antigas que isso saem do cache no fim da execução
+DAG_CACHE_DAYS = 7
+# Muda quando o formato guardado muda (invalida tudo)
+DAG_FORMAT = 1
+
+
+def file_digest(path) -> str:
+    """sha256 do conteúdo do arquivo ('' se não existe)"""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return ''
+
+
+def content_key(*parts: Any) -> str:
+    """Hash estável de qualquer combinação serializável em JSON"""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:16]
+
+
+@dataclass
+class Stage:
+    """
+    Uma etapa do DAG.
+
+    - run recebe as saídas de `deps`, na mesma ordem
+    - fingerprint devolve o que mais afeta a saída (config, prompt, modelo...)
+    - max_age_hours: saída reaproveitável por no máximo N horas (ex.: coleta)
+    - cacheable: decide se a saída vai para o cache (ex.: erro ou preview não vão)
+    - restore: chamado quando a saída vem do cache (ex.: regravar o artefato em /tmp)
+    - resumable: --resume pode reaproveitar a saída da execução anterior mesmo
+      com fingerprint diferente ou vencida
+    """
+    name: str
+    title: str
+    run: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    fingerprint: Callable[[], Any] = lambda: None
+    max_age_hours: Optional[float] = None
+    cacheable: Callable[[Any], bool] = lambda output: output is not None
+    restore: Optional[Callable[[Any], None]] = None
+    resumable: bool = True
+
+
+class DagRunner:
+    """
+    Executa as etapas em ordem (já topológica), reaproveitando do cache as
+    que têm a mesma chave. O manifesto da última execução registra quais
+    etapas terminaram; com `resume`, elas são reaproveitadas até a primeira
+    que falhou ou não chegou a rodar.
+    """
+
+    def __init__(self, stages: Sequence[Stage], resume: bool = False, fresh: bool = False):
+        self.stages = list(stages)
+        self.resume = resume
+        self.fresh = fresh
+        # Hash do conteúdo da saída de cada etapa (entra na chave das seguintes)
+        self.keys: Dict[str, str] = {}
+        self.outputs: Dict[str, Any] = {}
+        self.reused: List[str] = []
+        self._manifest_path = cache_path(DAG_DIR, MANIFEST_FILE)
+        self._previous = load_json(self._manifest_path, default={}).get('stages', {})
+        self._manifest: Dict = {'started_at': datetime.utcnow().isoformat(), 'stages': {}}
+
+    def _entry_path(self, stage: Stage, key: str) -> Path:
+        return cache_path(DAG_DIR, stage.name, f"{key}.json")
+
+    def _load(self, stage: Stage, key: str, check_age: bool) -> Optional[Dict]:
+        entry = load_json(self._entry_path(stage, key))
+        if not entry or entry.get('format') != DAG_FORMAT:
+            return None
+        if check_age and stage.max_age_hours is not None:
+            age = datetime.utcnow() - datetime.fromisoformat(entry['created_at'])
+            if age > timedelta(hours=stage.max_age_hours):
+                return None
+        return entry
+
+    def _cached(self, stage: Stage, key: str) -> Tuple[Optional[Dict], str]:
+        """(entrada do cache, chave usada) — com resume, cai para a da execução anterior"""
+        if self.fresh:
+            return None, key
+        entry = self._load(stage, key, check_age=not self.resume)
+        if entry is not None:
+            return entry, key
+        previous = self._previous.get(stage.name, {})
+        if self.resume and stage.resumable and previous.get('status') == 'ok':
+            entry = self._load(stage, previous['key'], check_age=False)
+            if entry is not None:
+                return entry, previous['key']
+        return None, key
+
+    def _record(self, stage: Stage, key: str, status: str) -> None:
+        self._manifest['stages'][stage.name] = {
+            'key': key, 'status': status, 'finished_at': datetime.utcnow().isoformat(),
+        }
+        save_json(self._manifest_path, self._manifest)
+
+    def run(self) -> Dict[str, Any]:
+        """Saídas de todas as etapas; a exceção de uma etapa interrompe o DAG"""
+        for stage in self.stages:
+            key = content_key(DAG_FORMAT, stage.name, stage.fingerprint(), [self.keys[d] for d in stage.deps])
+            entry, key = self._cached(stage, key)
+
+            print("\n" + "="*50)
+            print(stage.title)
+            print("="*50)
+
+            with tracing.span(stage.name, kind=tracing.STAGE) as s:
+                if entry is not None:
+                    output = entry['output']
+                    when = datetime.fromisoformat(entry['created_at']).strftime('%d/%m %H:%M UTC')
+                    print(f"♻️ Reaproveitado do cache ({key}, de {when}) — --fresh para refazer")
+                    output_key = entry['output_key']
+                    if stage.restore:
+                        stage.restore(output)
+                    self.reused.append(stage.name)
+                    s.set(reused=True)
+                else:
+                    try:
+                        output = stage.run(*(self.outputs[d] for d in stage.deps))
+                    except BaseException:
+                        self._record(stage, key, 'failed')
+                        raise
+                    output_key = content_key(output)
+                    if stage.cacheable(output):
+                        save_json(self._entry_path(stage, key), {
+                            'format': DAG_FORMAT,
+                            'created_at': datetime.utcnow().isoformat(),
+                            'output_key': output_key,
+                            'output': output,
+                        })
+                if isinstance(output, dict) and isinstance(output.get('items'), list):
+                    s.set(items=len(output['items']))
+
+            self.keys[stage.name] = output_key
+            self.outputs[stage.name] = output
+            self._record(stage, key, 'ok')
+        return self.outputs
+
+    def evict(self, days: int = DAG_CACHE_DAYS) -> int:
+        """Remove saídas antigas do cache; devolve quantas saíram"""
+        limit = (datetime.utcnow() - timedelta(days=days)).timestamp()
+        removed = 0
+        for path in (CACHE_DIR / DAG_DIR).glob('*/*.json'):
+            try:
+                if path.stat().st_mtime < limit:
+                    os.unlink(path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
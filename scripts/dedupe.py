@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Dedupe
+Junta os itens repetidos entre fontes antes da curadoria: fica um item
+por matéria, com a lista das fontes que a trouxeram
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from heat import source_points
+from links import item_links, link_key
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+# Títulos curtos ("Daily Update", "Newsletter") não bastam para dizer que é o mesmo item
+MIN_TITLE_WORDS = 5
+
+WORD_RE = re.compile(r'\w+')
+
+
+def url_key(url: str) -> Optional[str]:
+    """URL canônica (links.py) sem esquema"""
+    return link_key(url) if url else None
+
+
+def title_key(title: str) -> Optional[str]:
+    words = WORD_RE.findall((title or '').lower())
+    return ' '.join(words) if len(words) >= MIN_TITLE_WORDS else None
+
+
+def normalize_item(item: Dict) -> Dict:
+    """Título e URL sem espaços sobrando (entradas de feed vêm com quebras de linha)"""
+    title = ' '.join((item.get('title') or '').split())
+    url = (item.get('url') or '').strip()
+    if title == item.get('title') and url == item.get('url'):
+        return item
+    return {**item, 'title': title, 'url': url}
+
+
+def preference(item: Dict) -> Tuple:
+    """
+    Entre repetidos fica (menor chave) o de melhor fonte no Heat Score
+    (agregadores por último), depois a fonte regular antes da newsletter, e
+    por fim o publicado primeiro: a repostagem num agregador (HN) não toma o
+    lugar do original. URL e título só desempatam (resultado não depende da ordem)
+    """
+    return (-source_points(item), item.get('source_type') == 'newsletter',
+            item.get('published_at') or '\uffff', item.get('url', ''), item.get('title', ''))
+
+
+def source_refs(item: Dict) -> List[Dict]:
+    """Fontes do item: as já juntadas num dedupe anterior, ou a própria"""
+    return item.get('sources') or [{'source_name': item.get('source_name', ''),
+                                    'source_type': item.get('source_type', ''),
+                                    'url': item.get('url', '')}]
+
+
+def merged_sources(refs: Iterable[Dict]) -> List[Dict]:
+    unique = {(ref['source_name'], ref['url']): ref for ref in refs}
+    return [unique[key] for key in sorted(unique)]
+
+
+def _recency(item: Dict) -> Tuple:
+    return item.get('published_at', ''), item.get('url', ''), item.get('title', '')
+
+
+def ordered(items: Iterable[Dict]) -> List[Dict]:
+    """Fontes regulares por recência, depois as newsletters (também por recência)"""
+    kept = sorted(items, key=_recency, reverse=True)
+    return ([i for i in kept if i.get('source_type') != 'newsletter'] +
+            [i for i in kept if i.get('source_type') == 'newsletter'])
+
+
+class Deduper:
+    """
+    Dedupe incremental: itens que compartilham uma URL (a própria, a
+    expandida de um tweet, o link de comentários do HN) ou o título formam
+    um grupo (union-find). De cada grupo fica o melhor segundo preference, com
+    'sources' listando todas as fontes quando houver mais de uma. Os itens
+    podem chegar em qualquer ordem (ex.: conforme cada fonte termina) que o
+    resultado é o mesmo.
+    """
+
+    def __init__(self):
+        self._parent: List[int] = []
+        self._best: Dict[int, Dict] = {}
+        self._sources: Dict[int, List[Dict]] = {}
+        self._groups: Dict[str, int] = {}
+        self.added = 0
+
+    def _find(self, group: int) -> int:
+        while self._parent[group] != group:
+            self._parent[group] = self._parent[self._parent[group]]
+            group = self._parent[group]
+        return group
+
+    def add(self, item: Dict) -> None:
+        self.added += 1
+        keys = {url_key(link) for link in item_links(item)}
+        keys.add(title_key(item.get('title', '')))
+        keys.discard(None)
+        root = len(self._parent)
+        self._parent.append(root)
+        self._best[root] = item
+        self._sources[root] = source_refs(item)
+        for key in sorted(keys):
+            other = self._find(self._groups.setdefault(key, root))
+            if other != root:
+                self._parent[other] = root
+                best = self._best.pop(other)
+                self._sources[root] += self._sources.pop(other)
+                if preference(best) < preference(self._best[root]):
+                    self._best[root] = best
+
+    @property
+    def removed(self) -> int:
+        return self.added - len(self._best)
+
+    def items(self) -> List[Dict]:
+        kept = []
+        for root, item in self._best.items():
+            sources = merged_sources(self._sources[root])
+            kept.append({**item, 'sources': sources} if len(sources) > 1 else item)
+        return ordered(kept)
+
+
+def dedupe_items(items: Iterable[Dict],
+                 steps: Sequence[Callable[[Dict], Dict]] = (normalize_item,)) -> Tuple[List[Dict], int]:
+    """(itens sem repetição, removidos); `steps` transformam cada item antes"""
+    deduper = Deduper()
+    for item in items:
+        for step in steps:
+            item = step(item)
+        deduper.add(item)
+    return deduper.items(), deduper.removed
+
+
+def dedupe_raw(raw: Dict, steps: Sequence[Callable[[Dict], Dict]] = (normalize_item,)) -> Dict:
+    """Resultado da coleta (cabeçalho + 'items') sem os repetidos"""
+    items, removed = dedupe_items(raw.get('items', []), steps)
+    print(f"🧹 Dedupe: {removed} repetidos removidos, {len(items)} itens seguem")
+    return deduped(raw, items, removed)
+
+
+def deduped(raw: Dict, items: List[Dict], removed: int) -> Dict:
+    return {**raw, 'items': items, 'total_items': len(items), 'duplicates_removed': removed}
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Enrichment Cache
+Cache persistente (SQLite) dos posts de newsletter já enriquecidos
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from storage import CACHE_DIR
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+ENRICHMENT_DB = "enrichment.sqlite3"
+# og:* e data de publicação não mudam depois de publicado; o TTL só limita o tamanho do banco
+ENRICHMENT_TTL_DAYS = float(os.environ.get('ENRICHMENT_TTL_DAYS', '30'))
+
+
+def canonical_post_url(url: str) -> str:
+    """URL canônica de um post: host minúsculo, sem www., query, fragmento ou barra final"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, '', ''))
+
+
+class EnrichmentCache:
+    """Campos enriquecidos (title, description, published_at) por URL canônica"""
+
+    def __init__(self, path=None):
+        self.path = path or CACHE_DIR / ENRICHMENT_DB
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    url TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    published_at TEXT,
+                    enriched_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Campos salvos para o post, ou None se nunca foi enriquecido"""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT title, description, published_at FROM posts WHERE url = ?",
+                (canonical_post_url(url),)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        title, description, published_at = row
+        return {
+            'title': title,
+            'description': description,
+            'published_at': datetime.fromisoformat(published_at) if published_at else None,
+        }
+
+    def put(self, url: str, title: str, description: str, published_at: Optional[datetime]) -> None:
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?)",
+                (canonical_post_url(url), title, description,
+                 published_at.isoformat() if published_at else None, time.time())
+            )
+            self._conn.commit()
+
+    def evict(self, ttl_days: float = ENRICHMENT_TTL_DAYS) -> int:
+        """Remove posts enriquecidos há mais de `ttl_days`; retorna quantos saíram"""
+        with self._lock:
+            cur = self._db().execute(
+                "DELETE FROM posts WHERE enriched_at < ?", (time.time() - ttl_days * 86400,)
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+    def summary(self) -> str:
+        return f"{self.hits} hits / {self.misses} misses"
+
+
+# Instância compartilhada pelo newsletter collector
+enrichment_cache = EnrichmentCache()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Feed Stream
+Parser em streaming (lxml.iterparse) de RSS 2.0, RSS 1.0, Atom e feeds do YouTube
+"""
+
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from lxml import etree
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+FEED_ROOTS = {'rss', 'feed', 'RDF'}
+RDF_ABOUT = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about'
+ENTRY_TAGS = {'item', 'entry'}
+# Elemento → campo de data no formato do feedparser
+PUBLISHED_TAGS = {'pubDate', 'published', 'issued'}
+UPDATED_TAGS = {'updated', 'modified', 'date'}  # date = dc:date
+
+
+class UnsupportedFeed(ValueError):
+    """Documento que não é RSS/Atom (o chamador usa o feedparser)"""
+
+
+# Erros que mandam o documento para o feedparser
+PARSE_ERRORS = (etree.XMLSyntaxError, UnsupportedFeed)
+
+
+def _local(tag) -> str:
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _inner(el) -> str:
+    """Texto do elemento; Atom type=xhtml: o markup interno serializado"""
+    if len(el):
+        return ((el.text or '') + ''.join(
+            etree.tostring(child, encoding='unicode', with_tail=True) for child in el
+        )).strip()
+    return (el.text or '').strip()
+
+
+def _date_tuple(value: str) -> Optional[Tuple[int, ...]]:
+    """(ano, mês, dia, h, m, s) em UTC, como os *_parsed do feedparser"""
+    value = value.strip()
+    if not value:
+        return None
+    dt = None
+    try:
+        dt = parsedate_to_datetime(value)      # RFC 822 (RSS)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(value)  # ISO 8601 (Atom, dc:date)
+        except ValueError:
+            from feedparser.datetimes import _parse_date
+            parsed = _parse_date(value)         # formatos exóticos: mesmo parser do feedparser
+            return tuple(parsed[:6]) if parsed else None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
+
+
+def _entry(el) -> Dict:
+    """Campos usados na coleta (mesmo formato de collector._parse_entries)"""
+    title = summary = content = link = author = None
+    media_title = media_description = None
+    raw: Dict = {}
+    tags: List[str] = []
+    dates: Dict[str, Tuple[int, ...]] = {}
+
+    for child in el.iterchildren(tag=etree.Element):
+        name = _local(child.tag)
+        if name == 'title':
+            title = _inner(child)
+        elif name in ('description', 'summary'):
+            summary = _inner(child)
+        elif name in ('encoded', 'content'):
+            content = content or _inner(child)
+        elif name == 'link':
+            href = child.get('href')
+            if href is None:
+                link = link or (child.text or '').strip()
+            elif link is None and child.get('rel', 'alternate') == 'alternate':
+                link = href
+        elif name in ('guid', 'id'):
+            raw['id'] = (child.text or '').strip()
+        elif name == 'comments':
+            raw['comments'] = (child.text or '').strip()
+        elif name == 'videoId':
+            raw['yt_videoid'] = (child.text or '').strip()
+        elif name == 'category':
+            term = child.get('term') or (child.text or '').strip()
+            if term:
+                tags.append(term)
+        elif name in ('author', 'creator'):
+            if author is None:
+                author_name = child.find('{*}name')
+                author = (author_name.text if author_name is not None else child.text or '').strip()
+        elif name in PUBLISHED_TAGS or name in UPDATED_TAGS:
+            field = 'published_parsed' if name in PUBLISHED_TAGS else 'updated_parsed'
+            if field not in dates:
+                parsed = _date_tuple(child.text or '')
+                if parsed:
+                    dates[field] = parsed
+        elif name == 'group':  # media:group (YouTube)
+            for media in child.iterchildren(tag=etree.Element):
+                if _local(media.tag) == 'title':
+                    media_title = _inner(media)
+                elif _local(media.tag) == 'description':
+                    media_description = _inner(media)
+
+    if not raw.get('id') and el.get(RDF_ABOUT):  # RSS 1.0: <item rdf:about="...">
+        raw['id'] = el.get(RDF_ABOUT)
+    # Como o feedparser: sem <updated>, updated_parsed repete a data de publicação
+    if 'published_parsed' in dates:
+        dates.setdefault('updated_parsed', dates['published_parsed'])
+
+    raw = {k: v for k, v in raw.items() if v}
+    if tags:
+        raw['tags'] = tags
+    entry = {
+        'title': title if title is not None else (media_title or ''),
+        'summary': summary if summary is not None else (content or media_description or ''),
+        'link': link or '',
+        'raw': raw,
+    }
+    if author:
+        entry['author'] = author
+    entry.update(dates)
+    return entry
+
+
+def parse_entries(content: bytes, max_entries: Optional[int] = None,
+                  cutoff: Optional[datetime] = None,
+                  date_fields: Sequence[str] = ('published_parsed', 'updated_parsed')) -> List[Dict]:
+    """
+    Entries do feed em ordem, lendo o documento em streaming.
+
+    Para depois de `max_entries` entries (contando as antigas). Entries
+    anteriores a `cutoff` não entram no resultado, mas não interrompem a
+    leitura: vários feeds (HN front page, BBC) vêm em ordem editorial, não
+    por data.
+    Levanta etree.XMLSyntaxError / UnsupportedFeed em documentos inválidos.
+    """
+    limit = cutoff.timetuple()[:6] if cutoff else None
+    entries: List[Dict] = []
+    seen = 0
+
+    events = etree.iterparse(BytesIO(content), events=('start', 'end'),
+                             resolve_entities=False, no_network=True, huge_tree=False)
+    for event, el in events:
+        if event == 'start':
+            if seen == 0 and el.getparent() is None and _local(el.tag) not in FEED_ROOTS:
+                raise UnsupportedFeed(_local(el.tag))
+            continue
+        if _local(el.tag) not in ENTRY_TAGS:
+            continue
+
+        entry = _entry(el)
+        # Libera o que já foi lido: o documento nunca fica inteiro na memória
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+
+        seen += 1
+        published = next((entry[f] for f in date_fields if f in entry), None)
+        if not (limit and published is not None and published < limit):
+            entries.append(entry)
+        if max_entries is not None and seen >= max_entries:
+            break
+    return entries
+
+
+# ============================================
+# ESTATÍSTICAS
+# ============================================
+
+_stats_lock = threading.Lock()
+_stats = {'native': 0, 'fallback': 0}
+
+
+def record(native: bool) -> None:
+    with _stats_lock:
+        _stats['native' if native else 'fallback'] += 1
+
+
+def summary() -> str:
+    """Resumo para os logs: 'N feeds (lxml), M via feedparser'"""
+    with _stats_lock:
+        return f"{_stats['native']} feeds (lxml), {_stats['fallback']} via feedparser"
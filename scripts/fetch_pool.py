@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Fetch Pool
+Execução concorrente das coletas com limite por host e deadline global
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_HOST = 2
+
+
+def host_of(url: str) -> str:
+    """Host normalizado de uma URL (sem www.)"""
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class FetchPool:
+    """
+    Pool de threads para I/O de coleta.
+
+    - max_workers limita o total de requisições simultâneas
+    - per_host limita requisições simultâneas ao mesmo host
+    - deadline (time.monotonic) encerra a espera e devolve resultados parciais
+    - host_key agrupa URLs num mesmo limite (padrão: o host da URL)
+    - on_result recebe o resultado de cada tarefa na própria thread, antes do
+      future ficar pronto; resultado que chega depois do deadline vira
+      TimeoutError (quem consome o fluxo e o gather() veem o mesmo conjunto)
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 per_host: int = DEFAULT_PER_HOST,
+                 deadline: Optional[float] = None,
+                 host_key: Callable[[str], str] = host_of,
+                 on_result: Optional[Callable[[Any], None]] = None):
+        self.per_host = per_host
+        self.deadline = deadline
+        self.host_key = host_key
+        self.on_result = on_result
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+        self._active: Dict[str, int] = {}
+        self._queued: Dict[str, Deque[Tuple[Future, Callable, tuple, dict]]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'FetchPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def submit(self, url: str, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Agenda fn(*args, **kwargs) contando contra o limite do host de `url`.
+        Tarefas acima do limite esperam numa fila do host, sem ocupar worker.
+        """
+        host = self.host_key(url)
+        future: Future = Future()
+        # A tarefa roda no contexto de quem agendou (ex.: span atual do tracing)
+        args = (fn, *args)
+        fn = contextvars.copy_context().run
+        with self._lock:
+            if self._active.get(host, 0) < self.per_host:
+                self._active[host] = self._active.get(host, 0) + 1
+                start = True
+            else:
+                self._queued.setdefault(host, deque()).append((future, fn, args, kwargs))
+                start = False
+        if start:
+            self._start(host, future, fn, args, kwargs)
+        return future
+
+    def _start(self, host: str, future: Future, fn: Callable, args: tuple, kwargs: dict) -> None:
+        if not future.set_running_or_notify_cancel():
+            self._release(host)
+            return
+        try:
+            self._executor.submit(self._run, host, future, fn, args, kwargs)
+        except RuntimeError as e:  # pool já fechado
+            future.set_exception(e)
+            self._release(host)
+
+    def _run(self, host: str, future: Future, fn: Callable, args: tuple, kwargs: dict) -> None:
+        try:
+            # Tarefas que só ganham vez depois do deadline não chegam a abrir conexão
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                raise TimeoutError("collection deadline reached")
+            result = fn(*args, **kwargs)
+            if self.on_result is not None:
+                if self.deadline is not None and time.monotonic() >= self.deadline:
+                    raise TimeoutError("collection deadline reached")
+                self.on_result(result)
+            future.set_result(result)
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            self._release(host)
+
+    def _release(self, host: str) -> None:
+        with self._lock:
+            queue = self._queued.get(host)
+            if queue:
+                nxt = queue.popleft()
+            else:
+                self._active[host] -= 1
+                return
+        self._start(host, *nxt)
+
+    def remaining(self) -> Optional[float]:
+        """Segundos restantes até o deadline (None = sem deadline)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def gather(self, futures: Dict[str, Future], label: str = '') -> Dict[str, Any]:
+        """
+        Espera os futures até o deadline.
+        Retorna {key: resultado} apenas para os que terminaram com sucesso,
+        na mesma ordem de `futures`.
+        """
+        wait(list(futures.values()), timeout=self.remaining())
+
+        results = {}
+        late = []
+        for key, future in futures.items():
+            if not future.done():
+                future.cancel()
+                late.append(key)
+                continue
+            try:
+                results[key] = future.result()
+            except TimeoutError:
+                late.append(key)
+            except Exception as e:
+                print(f"Error fetching {label}{key}: {e}")
+
+        if late:
+            print(f"   ⏱️ Deadline atingido: {len(late)} fonte(s) sem resposta ({', '.join(late)})")
+
+        return results
+
+    def close(self) -> None:
+        # Descarta o que ainda está na fila; não bloqueia em requisições atrasadas
+        # (o timeout de cada request as encerra)
+        with self._lock:
+            pending = [entry for queue in self._queued.values() for entry in queue]
+            self._queued.clear()
+        for future, *_ in pending:
+            future.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def deadline_in(seconds: Optional[float]) -> Optional[float]:
+    """Converte um orçamento em segundos para um deadline absoluto"""
+    if seconds is None:
+        return None
+    return time.monotonic() + seconds
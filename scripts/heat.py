@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Heat Score
+Pré-ranking local (freshness 40 + fonte 30 + impacto 30 + bônus de newsletter
+e de cross-validação + temas/penalidades do config.yaml) para escolher quais
+itens vão para o Claude, sem custo de LLM
+"""
+
+import heapq
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from settings import TIER1_HANDLES, setting
+from themes import annotate, fold
+
+# ============================================
+# CONFIGURAÇÃO (SKILL.md → Critérios de Seleção)
+# ============================================
+
+# (até N horas, pontos) numa janela de 24h; newsletters: faixas esticadas
+# para filters.max_age_hours_newsletters
+FRESHNESS_POINTS = ((6, 40), (12, 30), (24, 20))
+MAX_AGE_HOURS = setting('filters.max_age_hours', 24)
+NEWSLETTER_MAX_AGE_HOURS = setting('filters.max_age_hours_newsletters', 36)
+
+FIRST_HAND = 30   # fundador/CEO anunciando (TIER1_HANDLES no X)
+TRUSTED = 25      # jornalismo de agência/fontes próprias
+RELEASE = 20      # fonte primária (paper, release oficial)
+REPORTING = 15    # reportagem / vídeo de análise
+NEWSLETTER = 15   # newsletter curada (Tier 2)
+AGGREGATOR = 0    # agregador/resumo de outros
+
+TRUSTED_SOURCES = {'reuters_tech', 'reuters_world', 'reuters_business', 'bbc_world', 'bbc_business'}
+RELEASE_SOURCES = {'arxiv_ai'}
+AGGREGATOR_SOURCES = {'hacker_news', 'ai_daily_brief'}
+TIER1 = frozenset(h.lower() for h in TIER1_HANDLES)
+
+# Newsletter que sobrou do dedupe traz algo que o RSS não trouxe
+NEWSLETTER_BONUS = 10
+# Mesma história em mais de uma fonte (coverage_count do clusters.py)
+CROSS_VALIDATION_BONUS = 5
+
+# (pontos, termos sem acento) — vale o maior que aparecer no título/conteúdo
+IMPACT_RULES = (
+    (30, r"launch\w*|lanc\w+|release[sd]?|unveil\w*|introduc\w+|apresenta\w*|new model|novo modelo"),
+    (30, r"breakthrough|state[- ]of[- ]the[- ]art|sota|avanco"),
+    (25, r"acqui\w+|aquisi\w+|compra\w*|merger|fusao|funding|raises?|rodada|valuation|ipo|investe\w*"),
+    (25, r"regula\w+|antitrust|ban[s]?|banned|proibe\w*|ai act|lawmakers?|senado|congresso"),
+    (20, r"lawsuit|sues?|processa\w*|fired|demit\w+|resign\w*|renuncia\w*|leak\w*|vazament\w+|outage"),
+)
+INCREMENTAL = 5
+MAX_IMPACT = max(points for points, _ in IMPACT_RULES)
+
+_IMPACT_RES = [(points, re.compile(rf"\b(?:{terms})\b")) for points, terms in IMPACT_RULES]
+IMPACT_CHARS = 600  # título + começo do conteúdo bastam
+
+
+def freshness_points(item: Dict) -> int:
+    hours = item.get('hours_ago')
+    if hours is None:
+        return 0
+    window = NEWSLETTER_MAX_AGE_HOURS if item.get('source_type') == 'newsletter' else MAX_AGE_HOURS
+    scale = window / FRESHNESS_POINTS[-1][0]
+    return next((points for limit, points in FRESHNESS_POINTS if hours <= limit * scale), 0)
+
+
+def source_points(item: Dict) -> int:
+    source = item.get('source_name', '')
+    stype = item.get('source_type')
+    if stype == 'tweet':
+        return FIRST_HAND if source.lstrip('@').lower() in TIER1 else REPORTING
+    if stype == 'newsletter':
+        return NEWSLETTER
+    if source in AGGREGATOR_SOURCES:
+        return AGGREGATOR
+    if source in TRUSTED_SOURCES:
+        return TRUSTED
+    if source in RELEASE_SOURCES or stype == 'paper':
+        return RELEASE
+    return REPORTING
+
+
+def impact_points(item: Dict) -> int:
+    text = fold(f"{item.get('title', '')} {(item.get('content') or '')[:IMPACT_CHARS]}")
+    return next((points for points, regex in _IMPACT_RES if regex.search(text)), INCREMENTAL)
+
+
+def heat_components(item: Dict) -> Dict[str, int]:
+    return {
+        'freshness': freshness_points(item),
+        'source': source_points(item),
+        'impact': impact_points(item),
+        'bonus': NEWSLETTER_BONUS if item.get('source_type') == 'newsletter' else 0,
+        'coverage': CROSS_VALIDATION_BONUS if item.get('coverage_count', 1) > 1 else 0,
+        'themes': annotate(item)['theme_score'],
+    }
+
+
+def heat_score(item: Dict) -> int:
+    """0-100"""
+    return max(0, min(100, sum(heat_components(item).values())))
+
+
+def top_k(items: Iterable[Dict], k: int, min_score: int = 0) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Os `k` itens de maior heat (empate: mais recente), consumindo `items`
+    em streaming. Devolve (itens, {'scored', 'passed', 'cutoff'}).
+
+    O impacto local é só uma estimativa por palavras-chave, então o corte em
+    `min_score` usa o teto do item (impacto máximo): sai só quem não chegaria
+    ao mínimo nem que o Claude visse o maior impacto possível.
+    """
+    stats = {'scored': 0, 'passed': 0, 'cutoff': 0}
+
+    def passing():
+        for item in items:
+            stats['scored'] += 1
+            parts = heat_components(item)
+            ceiling = sum(parts.values()) - parts['impact'] + MAX_IMPACT
+            if min(100, ceiling) >= min_score:
+                stats['passed'] += 1
+                score = max(0, min(100, sum(parts.values())))
+                yield score, item.get('published_at', ''), -stats['scored'], item
+
+    best = heapq.nlargest(k, passing(), key=lambda entry: entry[:3])
+    if best:
+        stats['cutoff'] = best[-1][0]
+    return [item for *_, item in best], stats
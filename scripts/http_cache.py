@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - HTTP Cache
+Cache em disco com GET condicional (ETag / Last-Modified)
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+import http_client
+from storage import CACHE_DIR, load_json, save_json
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+HTTP_CACHE_MAX_AGE_DAYS = float(os.environ.get('HTTP_CACHE_MAX_AGE_DAYS', '7'))
+HTTP_CACHE_MAX_MB = float(os.environ.get('HTTP_CACHE_MAX_MB', '50'))
+
+
+@dataclass
+class CachedResponse:
+    """Resposta HTTP servida pela rede ou pelo cache (304)"""
+    url: str
+    status_code: int
+    content: bytes
+    from_cache: bool = False
+    parsed: Any = None
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+
+class HttpCache:
+    """
+    Guarda corpo + validadores por URL em CACHE_DIR/http.
+
+    Cada URL vira dois arquivos: <sha1>.json (metadados, e opcionalmente
+    o resultado já parseado) e <sha1>.body (bytes originais). Num 304 o
+    corpo, ou o parse salvo, é reutilizado sem baixar nada.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or CACHE_DIR / 'http'
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    # ---------- arquivos ----------
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def _load(self, url: str) -> Optional[dict]:
+        meta_path, body_path = self._paths(url)
+        meta = load_json(meta_path)
+        if not meta or meta.get('url') != url or not body_path.exists():
+            return None
+        return meta
+
+    def _store(self, url: str, resp: requests.Response, parsed: Any, parse_version: int) -> None:
+        meta_path, body_path = self._paths(url)
+        meta = {
+            'url': url,
+            'etag': resp.headers.get('ETag'),
+            'last_modified': resp.headers.get('Last-Modified'),
+            'stored_at': time.time(),
+            'size': len(resp.content),
+        }
+        if parsed is not None:
+            meta['parsed'] = parsed
+            meta['parse_version'] = parse_version
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = body_path.with_suffix('.body.tmp')
+        tmp.write_bytes(resp.content)
+        os.replace(tmp, body_path)
+        save_json(meta_path, meta)
+
+    def _touch(self, url: str) -> None:
+        # mtime = último uso, usado na evicção por LRU
+        for path in self._paths(url):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    # ---------- estatísticas ----------
+
+    def _count(self, tag: str, field: str, amount: int = 1) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(tag, {'hits': 0, 'misses': 0, 'bytes_saved': 0})
+            stats[field] += amount
+
+    def stats(self, tag: Optional[str] = None) -> Dict[str, int]:
+        """Contadores de um tag (ou o total de todos)"""
+        with self._lock:
+            groups = [self._stats.get(tag, {})] if tag else list(self._stats.values())
+            total = {'hits': 0, 'misses': 0, 'bytes_saved': 0}
+            for stats in groups:
+                for field, value in stats.items():
+                    total[field] += value
+            return total
+
+    def summary(self, tag: Optional[str] = None) -> str:
+        """Resumo curto para os logs: '6 hits / 2 misses'"""
+        s = self.stats(tag)
+        line = f"{s['hits']} hits / {s['misses']} misses"
+        if s['bytes_saved']:
+            line += f" · {s['bytes_saved'] / 1024:.0f} KB poupados"
+        return line
+
+    # ---------- GET condicional ----------
+
+    def get(self, url: str, headers: Optional[dict] = None, timeout=http_client.DEFAULT_TIMEOUT,
+            parse: Optional[Callable[[bytes], Any]] = None, tag: str = 'default',
+            parse_version: int = 1) -> CachedResponse:
+        """
+        GET com If-None-Match / If-Modified-Since.
+
+        - 200: salva corpo + validadores (e `parse(content)`, se informado)
+        - 304: devolve o corpo salvo; com `parse`, devolve o parse salvo
+          sem reprocessar
+        - outros status: devolvidos como vieram, sem tocar no cache
+
+        `parse` deve retornar algo serializável em JSON. Um parse salvo com
+        outro `parse_version` (o parser mudou) é refeito a partir do corpo.
+        """
+        request_headers = dict(headers or {})
+        cached = self._load(url)
+        if cached:
+            if cached.get('etag'):
+                request_headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                request_headers['If-Modified-Since'] = cached['last_modified']
+
+        resp = http_client.get(url, headers=request_headers, timeout=timeout)
+
+        if resp.status_code == 304 and cached:
+            self._count(tag, 'hits')
+            self._count(tag, 'bytes_saved', cached.get('size', 0))
+            self._touch(url)
+            _, body_path = self._paths(url)
+            content = body_path.read_bytes()
+            if parse and 'parsed' in cached and cached.get('parse_version', 1) == parse_version:
+                parsed = cached['parsed']
+            else:
+                parsed = parse(content) if parse else None
+            return CachedResponse(url, 200, content, from_cache=True, parsed=parsed)
+
+        if resp.status_code != 200:
+            return CachedResponse(url, resp.status_code, resp.content)
+
+        self._count(tag, 'misses')
+        parsed = parse(resp.content) if parse else None
+        if resp.headers.get('ETag') or resp.headers.get('Last-Modified'):
+            try:
+                self._store(url, resp, parsed, parse_version)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"  ⚠️ Cache HTTP: falha ao salvar {url}: {e}")
+        return CachedResponse(url, 200, resp.content, parsed=parsed)
+
+    # ---------- evicção ----------
+
+    def evict(self, max_age_days: float = HTTP_CACHE_MAX_AGE_DAYS,
+              max_mb: float = HTTP_CACHE_MAX_MB) -> int:
+        """
+        Remove entradas sem uso há mais de `max_age_days` e, se o total
+        passar de `max_mb`, as menos usadas recentemente. Retorna quantas saíram.
+        """
+        entries = []
+        for meta_path in self.directory.glob('*.json'):
+            body_path = meta_path.with_suffix('.body')
+            try:
+                size = meta_path.stat().st_size + (body_path.stat().st_size if body_path.exists() else 0)
+                entries.append((meta_path.stat().st_mtime, size, meta_path, body_path))
+            except OSError:
+                continue
+
+        entries.sort(key=lambda e: e[0])  # mais antigo primeiro
+        now = time.time()
+        total = sum(e[1] for e in entries)
+        removed = 0
+        for mtime, size, meta_path, body_path in entries:
+            too_old = now - mtime > max_age_days * 86400
+            too_big = total > max_mb * 1024 * 1024
+            if not (too_old or too_big):
+                break
+            for path in (meta_path, body_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
+
+
+# Instância compartilhada pelos coletores
+http_cache = HttpCache()
+
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - HTTP Client
+Sessão HTTP compartilhada: keep-alive por host, timeouts padrão e limite de tamanho
+"""
+
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import tracing
+from fetch_pool import host_of
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+DEFAULT_TIMEOUT = (5, 20)  # connect, read (segundos)
+MAX_RESPONSE_BYTES = 10 * 1024 * 1024  # 10 MB
+POOL_HOSTS = 32       # pools de conexão mantidos (um por host)
+POOL_PER_HOST = 8     # conexões keep-alive por host
+CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Resposta maior que o limite configurado"""
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_request_counts: Dict[str, int] = {}
+
+
+def get_session() -> requests.Session:
+    """Sessão única do processo (criada no primeiro uso)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def _open(method: str, url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    kwargs['stream'] = True
+
+    host = host_of(url)
+    with _session_lock:
+        _request_counts[host] = _request_counts.get(host, 0) + 1
+
+    return get_session().request(method, url, **kwargs)
+
+
+def _read(resp: requests.Response, url: str, max_bytes: int) -> requests.Response:
+    """Lê o corpo respeitando `max_bytes`"""
+    declared = resp.headers.get('Content-Length')
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        resp.close()
+        raise ResponseTooLarge(f"{url}: {int(declared)} bytes (limite {max_bytes})")
+
+    chunks = []
+    size = 0
+    for chunk in resp.iter_content(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            resp.close()
+            raise ResponseTooLarge(f"{url}: mais de {max_bytes} bytes")
+        chunks.append(chunk)
+
+    # Corpo já lido: a conexão volta para o pool e resp.content/.json() funcionam normalmente
+    resp._content = b''.join(chunks)
+    return resp
+
+
+def stream(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Abre a requisição sem ler o corpo (stream=True) pela sessão compartilhada.
+    Quem chama lê via resp.iter_content() e deve chamar resp.close().
+    """
+    with tracing.span(f"{method} {host_of(url)}", kind=tracing.HTTP, url=url, streamed=True) as s:
+        resp = _open(method, url, **kwargs)
+        s.set(status=resp.status_code)
+        return resp
+
+
+def request(method: str, url: str, max_bytes: int = MAX_RESPONSE_BYTES, **kwargs) -> requests.Response:
+    """
+    requests.request pela sessão compartilhada.
+    Aplica DEFAULT_TIMEOUT quando não informado e aborta respostas acima de `max_bytes`.
+    """
+    with tracing.span(f"{method} {host_of(url)}", kind=tracing.HTTP, url=url) as s:
+        resp = _read(_open(method, url, **kwargs), url, max_bytes)
+        s.set(status=resp.status_code, bytes=len(resp.content))
+        return resp
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
+
+
+def connection_stats() -> Dict[str, Dict[str, int]]:
+    """{host: {requests, connections, reused}} desde o início do processo"""
+    stats = {}
+    with _session_lock:
+        counts = dict(_request_counts)
+        session = _session
+
+    if session is not None:
+        for adapter in {id(a): a for a in session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = host_of(f"http://{pool.host}")
+                entry = stats.setdefault(host, {'requests': 0, 'connections': 0, 'reused': 0})
+                entry['connections'] += pool.num_connections
+
+    for host, count in counts.items():
+        entry = stats.setdefault(host, {'requests': 0, 'connections': 0, 'reused': 0})
+        entry['requests'] = count
+        entry['reused'] = max(0, count - entry['connections'])
+    return stats
+
+
+def print_connection_stats() -> None:
+    """Imprime o reuso de conexões por host"""
+    stats = connection_stats()
+    if not stats:
+        return
+    print("🔌 Conexões HTTP (reuso por host):")
+    for host, s in sorted(stats.items(), key=lambda kv: -kv[1]['requests']):
+        if not s['requests']:
+            continue
+        pct = 100 * s['reused'] / s['requests']
+        print(f"   {host}: {s['requests']} requests / {s['connections']} conexões ({pct:.0f}% reuso)")
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Links
+Links dos itens sem rastreamento e com os links curtos resolvidos (é o que o
+leitor recebe), e a chave canônica (sem www./m./AMP) com que o dedupe
+reconhece a mesma matéria vinda de fontes diferentes
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from settings import setting
+from storage import CACHE_DIR, load_json, save_json
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+# Prefixos de host que apontam para a mesma página (m.site.com, amp.site.com)
+HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.')
+HOST_ALIASES = {'twitter.com': 'x.com'}
+
+# Parâmetros de rastreamento (qualquer host); utm_* sai pelo prefixo
+TRACKING_PREFIXES = ('utm_',)
+TRACKING_PARAMS = frozenset({
+    'ref', 'ref_src', 'ref_url', 'referrer', 'fbclid', 'gclid', 'dclid', 'msclkid',
+    'mc_cid', 'mc_eid', 'igshid', '_hsenc', '_hsmi', 'mkt_tok', 'ncid', 'cmpid',
+    'guccounter', 'guce_referrer', 'guce_referrer_sig', 'smid', 'taid', 'ocid',
+    'sr_share', 'amp', 'outputtype',
+})
+# Parâmetros que só são rastreamento em certos hosts
+HOST_TRACKING_PARAMS = {
+    'x.com': frozenset({'s', 't'}),
+    'youtube.com': frozenset({'feature', 'si', 'pp'}),
+}
+
+# /amp, /amp/ ou /amp.html no fim do caminho
+AMP_PATH_RE = re.compile(r'/amp(?:\.html?)?/?$', re.IGNORECASE)
+
+# Encurtadores: o destino só aparece seguindo o redirect
+SHORT_LINK_HOSTS = frozenset({
+    't.co', 'bit.ly', 'buff.ly', 'ow.ly', 'lnkd.in', 'tinyurl.com', 'trib.al', 'dlvr.it',
+    'ift.tt', 'goo.gl', 'fb.me', 'wp.me', 'is.gd', 'rebrand.ly', 'shorturl.at', 'hubs.ly',
+    'reut.rs', 'bbc.in', 'nyti.ms', 'wapo.st', 'econ.st', 'bloom.bg', 'cnb.cx', 'tcrn.ch',
+    'zd.net', 'engt.co', 'flip.it', 'apple.co', 'amzn.to',
+})
+RESOLVE_SHORT_LINKS = bool(setting('dedupe.resolve_short_links', True))
+RESOLVE_WORKERS = 8
+PREFETCH_AHEAD = 4 * RESOLVE_WORKERS  # itens à frente em prefetched(): o pool não fica ocioso
+RESOLVE_TIMEOUT = (3, 5)  # connect, read (segundos)
+MAX_HOPS = 3              # encurtador apontando para encurtador (ex.: t.co → bit.ly)
+SHORT_LINKS_CACHE = "short_links.json"
+SHORT_LINKS_TTL_DAYS = 30  # o destino de um link curto não muda
+
+
+def _host(url: str) -> str:
+    host = (urlsplit(url).hostname or '').lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix) and host.count('.') > 1:
+            host = host[len(prefix):]
+            break
+    return HOST_ALIASES.get(host, host)
+
+
+def _is_tracking(name: str, host: str) -> bool:
+    name = name.lower()
+    return (name.startswith(TRACKING_PREFIXES) or name in TRACKING_PARAMS
+            or name in HOST_TRACKING_PARAMS.get(host, ()))
+
+
+def clean_url(url: str) -> str:
+    """URL para o leitor: a mesma, só sem os parâmetros de rastreamento"""
+    url = (url or '').strip()
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname or not parts.query:
+        return url
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    kept = [(k, v) for k, v in query if not _is_tracking(k, _host(url))]
+    if len(kept) == len(query):
+        return url
+    return urlunsplit(parts._replace(query=urlencode(kept)))
+
+
+def canonical_url(url: str) -> str:
+    """
+    Forma canônica, só para comparar: host sem www./m./amp., sem parâmetros
+    de rastreamento, sem sufixo AMP, fragmento ou barra final, e com a query
+    em ordem alfabética. Não serve de link (nem todo site atende no domínio
+    sem www.); o item guarda clean_url.
+    """
+    url = (url or '').strip()
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return url
+    host = _host(url)
+    path = parts.path
+    if host == 'youtu.be' and path.strip('/'):
+        host, query = 'youtube.com', [('v', path.strip('/'))] + parse_qsl(parts.query)
+        path = '/watch'
+    else:
+        query = parse_qsl(parts.query, keep_blank_values=True)
+    path = AMP_PATH_RE.sub('', path).rstrip('/')
+    query = sorted((k, v) for k, v in query if not _is_tracking(k, host))
+    netloc = f"{host}:{parts.port}" if parts.port and parts.port not in (80, 443) else host
+    return urlunsplit((parts.scheme.lower(), netloc, path, urlencode(query), ''))
+
+
+def link_key(url: str) -> Optional[str]:
+    """Chave de comparação: URL canônica sem esquema"""
+    canonical = canonical_url(url)
+    if not canonical.startswith(('http://', 'https://')):
+        return None
+    return canonical.split('://', 1)[1]
+
+
+def is_short_link(url: str) -> bool:
+    return _host(url) in SHORT_LINK_HOSTS
+
+
+def item_links(item: Dict) -> List[str]:
+    """
+    URLs que identificam o item: a própria, as expandidas de um tweet e o
+    link de comentários do HN (que outras fontes às vezes citam no lugar do artigo)
+    """
+    raw = item.get('raw_data') or {}
+    links = [item.get('url') or ''] + list(raw.get('urls') or [])
+    comments = raw.get('comments')
+    if isinstance(comments, str) and 'news.ycombinator.com' in comments:
+        links.append(comments)
+    return [link for link in links if link]
+
+
+# ============================================
+# LINKS CURTOS
+# ============================================
+
+class ShortLinkResolver:
+    """
+    Destino de links curtos (t.co, bit.ly...), seguindo só os redirects entre
+    encurtadores (o site final não é baixado). Resolve em paralelo, a partir
+    de prefetch(), e guarda o resultado em cache entre execuções.
+    """
+
+    def __init__(self, path=None, enabled: bool = RESOLVE_SHORT_LINKS):
+        self.path = path or CACHE_DIR / SHORT_LINKS_CACHE
+        self.enabled = enabled
+        self._cache: Optional[Dict[str, List]] = None  # link → [destino, resolvido em]
+        self._pending: Dict[str, Future] = {}
+        self._failed: Set[str] = set()  # nesta execução; não vão para o cache
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.resolved = 0
+        self.failed = 0
+
+    def _entries(self) -> Dict[str, List]:
+        if self._cache is None:
+            self._cache = load_json(self.path, {}) or {}
+        return self._cache
+
+    def prefetch(self, urls: Iterable[str]) -> None:
+        """Começa a resolver (sem esperar) os links curtos ainda fora do cache"""
+        if not self.enabled:
+            return
+        with self._lock:
+            cache = self._entries()
+            for url in urls:
+                if (url and url not in cache and url not in self._pending
+                        and url not in self._failed and is_short_link(url)):
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(max_workers=RESOLVE_WORKERS,
+                                                            thread_name_prefix='short-links')
+                    self._pending[url] = self._executor.submit(self._follow, url)
+
+    def resolve(self, url: str) -> str:
+        """Destino do link curto; qualquer outro link (ou falha) volta como veio"""
+        if not self.enabled or not is_short_link(url):
+            return url
+        with self._lock:
+            entry = self._entries().get(url)
+            if entry:
+                self.hits += 1
+                return entry[0]
+        self.prefetch([url])
+        with self._lock:
+            future = self._pending.get(url)
+            if future is None:  # resolvido por outra thread (ou falhou) enquanto isso
+                entry = self._entries().get(url)
+                return entry[0] if entry else url
+        target = future.result()
+        with self._lock:
+            if self._pending.pop(url, None) is not None:
+                if target:
+                    self.resolved += 1
+                    self._entries()[url] = [target, time.time()]
+                else:
+                    self.failed += 1
+                    self._failed.add(url)
+        return target or url
+
+    def _follow(self, url: str) -> Optional[str]:
+        import requests
+
+        import http_client
+
+        target = url
+        try:
+            for _ in range(MAX_HOPS):
+                if not is_short_link(target):
+                    break
+                resp = http_client.request('HEAD', target, allow_redirects=False, timeout=RESOLVE_TIMEOUT)
+                location = resp.headers.get('Location')
+                if not resp.is_redirect or not location:
+                    break
+                target = urljoin(target, location)
+        except requests.RequestException:
+            return None
+        return target if target != url else None
+
+    def save(self, ttl_days: float = SHORT_LINKS_TTL_DAYS) -> None:
+        """Grava o cache (sem as entradas vencidas) e encerra as resoluções pendentes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            # Resolvidos mas nunca consultados (item descartado no caminho) também valem
+            for url, future in self._pending.items():
+                if future.result():
+                    self._entries()[url] = [future.result(), time.time()]
+            self._pending.clear()
+            if self._cache is None:
+                return
+            oldest = time.time() - ttl_days * 86400
+            self._cache = {url: entry for url, entry in self._cache.items() if entry[1] >= oldest}
+            save_json(self.path, self._cache)
+        if self.resolved or self.failed:
+            print(f"🔗 Links curtos: {self.resolved} resolvidos, {self.hits} do cache, {self.failed} falharam")
+
+
+# Instância compartilhada pela coleta em fluxo e pelo dedupe em lote
+short_links = ShortLinkResolver()
+
+
+def prefetch_links(items: Iterable[Dict]) -> None:
+    """Dispara a resolução dos links curtos dos itens (clean_item espera o resultado)"""
+    short_links.prefetch(link for item in items for link in item_links(item))
+
+
+def prefetched(items: Iterable[Dict], ahead: int = PREFETCH_AHEAD) -> Iterator[Dict]:
+    """
+    Os mesmos itens, em fluxo, com os links curtos dos próximos `ahead` já
+    sendo resolvidos: clean_item quase nunca espera, sem carregar a coleta inteira
+    """
+    window: Deque[Dict] = deque()
+    for item in items:
+        prefetch_links([item])
+        window.append(item)
+        if len(window) > ahead:
+            yield window.popleft()
+    yield from window
+
+
+def clean_item(item: Dict) -> Dict:
+    """
+    Item com a URL (e as URLs expandidas de tweet) resolvidas e sem
+    rastreamento; a forma canônica fica só para a chave do dedupe (link_key)
+    """
+    url = clean_url(short_links.resolve(item.get('url') or ''))
+    raw = item.get('raw_data') or {}
+    urls = raw.get('urls')
+    new_urls = [clean_url(short_links.resolve(u)) for u in urls] if urls else urls
+    if url == item.get('url') and new_urls == urls:
+        return item
+    fixed = {**item, 'url': url}
+    if new_urls != urls:
+        fixed['raw_data'] = {**raw, 'urls': new_urls}
+    return fixed
@@ -1,15 +1,27 @@
 #!/usr/bin/env python3
 """
 THE DAILY BYTE - Newsletter Collector
-Coleta posts recentes de newsletters no Beehiiv via scraping de HTML
+Coleta posts recentes de newsletters: sitemap/archive da plataforma, com scraping de HTML como fallback
 """
 
+import os
 import re
-import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
-from bs4 import BeautifulSoup
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Dict, Optional, Tuple
+from dataclasses import dataclass, asdict, replace
+from xml.etree import ElementTree
+from bs4 import BeautifulSoup, SoupStrainer
+
+import http_client
+from enrichment_cache import enrichment_cache
+from fetch_pool import FetchPool, deadline_in, host_of
+from http_cache import http_cache
+from page_meta import PageMeta, read_head_meta, read_rest
+from page_meta import summary as enrichment_summary
+from storage import cache_path, load_json, save_json
+import tracing
 
 # ============================================
 # CONFIGURAÇÃO DAS NEWSLETTERS
@@ -21,6 +33,7 @@ NEWSLETTER_SOURCES = {
         "base_url": "https://www.aidrop.news",
         "language": "pt-br",
         "category_hint": "ai_models",
+        "platform": "beehiiv",
         "description": "AI ecosystem deep analysis in Portuguese"
     },
     "evolving_ai": {
@@ -28,6 +41,7 @@ NEWSLETTER_SOURCES = {
         "base_url": "https://evolvingai.io",
         "language": "en",
         "category_hint": "ai_models",
+        "platform": "beehiiv",
         "description": "AI model launches and competitive analysis"
     },
     "update_diario": {
@@ -35,6 +49,7 @@ NEWSLETTER_SOURCES = {
         "base_url": "https://updatediario.beehiiv.com",
         "language": "pt-br",
         "category_hint": "world",
+        "platform": "beehiiv",
         "description": "Daily Brazilian news digest - economy, politics, market"
     },
     "techdrop": {
@@ -42,6 +57,7 @@ NEWSLETTER_SOURCES = {
         "base_url": "https://www.techdrop.news",
         "language": "pt-br",
         "category_hint": "saas_enterprise",
+        "platform": "beehiiv",
         "description": "SaaS, enterprise tech, CapEx analysis"
     },
     "alphasignal": {
@@ -49,10 +65,17 @@ NEWSLETTER_SOURCES = {
         "base_url": "https://alphasignalai.beehiiv.com",
         "language": "en",
         "category_hint": "ai_models",
+        "platform": "beehiiv",
         "description": "Research-to-product bridge: AI papers with practical applications"
     },
 }
 
+# Coleta concorrente: todas as newsletters estão no Beehiiv (mesma infraestrutura),
+# então o limite de conexões simultâneas vale por plataforma, não por domínio
+NEWSLETTER_MAX_WORKERS = 8
+NEWSLETTER_PER_PLATFORM = 4
+NEWSLETTER_BUDGET_SECONDS = float(os.environ.get('NEWSLETTER_BUDGET_SECONDS', '90'))
+
 # Headers to mimic a browser request
 REQUEST_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -76,11 +99,20 @@ class NewsletterItem:
     language: str
     category_hint: str
     published_at: Optional[datetime]
+    # published_at é só o <lastmod> do sitemap (o enriquecimento não achou a data do post)
+    date_provisional: bool = False
 
     def to_raw_dict(self) -> Dict:
         """Converte para formato compatível com RawItem do collector.py"""
         pub_at = self.published_at or datetime.utcnow()
         hours_ago = (datetime.utcnow() - pub_at).total_seconds() / 3600
+        raw_data = {
+            "source_key": self.source_key,
+            "language": self.language,
+            "category_hint": self.category_hint,
+        }
+        if self.date_provisional:
+            raw_data["date_provisional"] = True
 
         return {
             "title": self.title,
@@ -92,11 +124,7 @@ class NewsletterItem:
             "published_at": pub_at.isoformat(),
             "hours_ago": round(hours_ago, 1),
             "engagement": {},
-            "raw_data": {
-                "source_key": self.source_key,
-                "language": self.language,
-                "category_hint": self.category_hint,
-            }
+            "raw_data": raw_data,
         }
 
 
@@ -104,26 +132,87 @@ class NewsletterItem:
 # PARSERS POR PLATAFORMA
 # ============================================
 
-def _parse_beehiiv_page(html: str, source_key: str, source_config: dict) -> List[NewsletterItem]:
-    """
-    Parse a Beehiiv newsletter homepage/archive to extract recent posts.
-    Beehiiv pages typically have article cards with titles, descriptions, and dates.
-    """
-    items = []
-    soup = BeautifulSoup(html, 'lxml')
+# Padrões compilados uma vez por processo
+POST_LINK_RE = re.compile(r'/p/')
+DATE_ONLY_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+CARD_CLASS_RE = re.compile(r'post|article|card', re.I)
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4']
+
+# Estratégias de extração da homepage, na ordem em que são tentadas
+HOMEPAGE_STRATEGIES = ('article', 'post_links', 'cards', 'meta_links')
+STRATEGY_HINTS_FILE = "newsletter_strategies.json"
+
+_strategy_lock = threading.Lock()
+
+
+def _homepage_tag(name: str, attrs: dict) -> bool:
+    """Só entram na árvore os elementos usados por alguma estratégia (com seus filhos)"""
+    if name == 'article':
+        return True
+    if name == 'a':
+        return bool(POST_LINK_RE.search(attrs.get('href') or ''))
+    if name == 'div':
+        classes = attrs.get('class') or ''
+        if not isinstance(classes, str):
+            classes = ' '.join(classes)
+        return bool(CARD_CLASS_RE.search(classes))
+    return False
+
+
+class _HomepageStrainer(SoupStrainer):
+    """SoupStrainer que decide por tag + atributos (_homepage_tag)"""
+
+    def __init__(self):
+        super().__init__('article')
+
+    # bs4 >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return _homepage_tag(name, attrs or {})
+
+    # bs4 < 4.13
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if isinstance(markup_name, str):
+            return markup_name if _homepage_tag(markup_name, dict(markup_attrs or {})) else None
+        return super().search_tag(markup_name, markup_attrs)
+
+
+HOMEPAGE_STRAINER = _HomepageStrainer()
 
-    # Strategy 1: Look for article/post cards via common Beehiiv patterns
-    # Beehiiv uses <article> tags or divs with post data
-    articles = soup.find_all('article')
 
-    if not articles:
-        # Strategy 2: Look for links to /p/ (post URLs on Beehiiv)
-        articles = soup.find_all('a', href=re.compile(r'/p/'))
+def _load_strategy_hints() -> Dict[str, str]:
+    """Cache persistente fonte → estratégia que funcionou na última execução"""
+    return load_json(cache_path(STRATEGY_HINTS_FILE), default={})
 
-    if not articles:
-        # Strategy 3: Look for og:article or structured data
-        articles = soup.find_all('div', class_=re.compile(r'post|article|card', re.I))
 
+def _remember_strategy(source_key: str, strategy: Optional[str]) -> None:
+    with _strategy_lock:
+        hints = _load_strategy_hints()
+        if not strategy or hints.get(source_key) == strategy:
+            return
+        hints[source_key] = strategy
+        save_json(cache_path(STRATEGY_HINTS_FILE), hints)
+
+
+def _candidates(soup: BeautifulSoup, strategy: str) -> list:
+    if strategy == 'article':
+        # Beehiiv uses <article> tags or divs with post data
+        return soup.find_all('article')
+    if strategy in ('post_links', 'meta_links'):
+        # Links to /p/ (post URLs on Beehiiv)
+        return soup.find_all('a', href=POST_LINK_RE)
+    # Divs with post/article/card classes
+    return soup.find_all('div', class_=CARD_CLASS_RE)
+
+
+def _absolute_url(url: str, source_config: dict) -> str:
+    if url.startswith('/'):
+        return source_config['base_url'] + url
+    return url
+
+
+def _items_from_cards(articles: list, source_key: str, source_config: dict) -> List[NewsletterItem]:
+    """Article cards with titles, descriptions, and dates (estratégias article/post_links/cards)"""
+    items = []
     seen_urls = set()
 
     for article in articles:
@@ -133,16 +222,14 @@ def _parse_beehiiv_page(html: str, source_key: str, source_config: dict) -> List
             if article.name == 'a':
                 url = article.get('href', '')
             else:
-                link = article.find('a', href=re.compile(r'/p/'))
+                link = article.find('a', href=POST_LINK_RE)
                 if link:
                     url = link.get('href', '')
 
             if not url:
                 continue
 
-            # Make URL absolute
-            if url.startswith('/'):
-                url = source_config['base_url'] + url
+            url = _absolute_url(url, source_config)
 
             # Skip duplicates
             if url in seen_urls:
@@ -151,7 +238,7 @@ def _parse_beehiiv_page(html: str, source_key: str, source_config: dict) -> List
 
             # Extract title
             title = ''
-            title_el = article.find(['h1', 'h2', 'h3', 'h4'])
+            title_el = article.find(HEADING_TAGS)
             if title_el:
                 title = title_el.get_text(strip=True)
             elif article.name == 'a':
@@ -172,10 +259,7 @@ def _parse_beehiiv_page(html: str, source_key: str, source_config: dict) -> List
             if time_el:
                 date_str = time_el.get('datetime', '')
                 if date_str:
-                    try:
-                        published_at = datetime.fromisoformat(date_str.replace('Z', '+00:00')).replace(tzinfo=None)
-                    except (ValueError, TypeError):
-                        pass
+                    published_at = _parse_date(date_str)
 
             items.append(NewsletterItem(
                 title=title,
@@ -195,24 +279,17 @@ def _parse_beehiiv_page(html: str, source_key: str, source_config: dict) -> List
     return items
 
 
-def _parse_via_meta_tags(html: str, url: str, source_key: str, source_config: dict) -> List[NewsletterItem]:
+def _items_from_links(post_links: list, source_key: str, source_config: dict) -> List[NewsletterItem]:
     """
-    Fallback: Extract info from meta tags (og:title, og:description).
+    Fallback: só o texto dos links para /p/ (estratégia meta_links).
     Less items but more reliable.
     """
     items = []
-    soup = BeautifulSoup(html, 'lxml')
-
-    # Try to get individual post links from the page
-    post_links = soup.find_all('a', href=re.compile(r'/p/'))
-
     seen = set()
     for link in post_links:
-        href = link.get('href', '')
-        if href.startswith('/'):
-            href = source_config['base_url'] + href
+        href = _absolute_url(link.get('href', ''), source_config)
 
-        if href in seen or not '/p/' in href:
+        if href in seen or '/p/' not in href:
             continue
         seen.add(href)
 
@@ -234,59 +311,286 @@ def _parse_via_meta_tags(html: str, url: str, source_key: str, source_config: di
     return items
 
 
+def _run_strategy(soup: BeautifulSoup, strategy: str, source_key: str, source_config: dict) -> List[NewsletterItem]:
+    candidates = _candidates(soup, strategy)
+    if strategy == 'meta_links':
+        return _items_from_links(candidates, source_key, source_config)
+    return _items_from_cards(candidates, source_key, source_config)
+
+
+def _parse_beehiiv_page(html: str, source_key: str, source_config: dict,
+                        hint: Optional[str] = None) -> Tuple[List[NewsletterItem], Optional[str]]:
+    """
+    Parse a Beehiiv newsletter homepage/archive to extract recent posts.
+
+    O HTML é parseado uma única vez (árvore limitada por HOMEPAGE_STRAINER)
+    e todas as estratégias rodam sobre ela. Com `hint`, a estratégia que
+    funcionou da última vez é tentada primeiro. Retorna (itens, estratégia usada).
+    """
+    soup = BeautifulSoup(html, 'lxml', parse_only=HOMEPAGE_STRAINER)
+
+    if hint in HOMEPAGE_STRATEGIES:
+        items = _run_strategy(soup, hint, source_key, source_config)
+        if items:
+            return items, hint
+
+    # Primeira estratégia de cards que encontrar candidatos; sem itens, cai para os links
+    for strategy in HOMEPAGE_STRATEGIES[:-1]:
+        candidates = _candidates(soup, strategy)
+        if candidates:
+            items = _items_from_cards(candidates, source_key, source_config)
+            if items:
+                return items, strategy
+            break
+
+    items = _run_strategy(soup, 'meta_links', source_key, source_config)
+    return items, ('meta_links' if items else None)
+
+
 # ============================================
-# ENRICHMENT: Fetch individual post details
+# ADAPTERS POR PLATAFORMA (sitemap / archive JSON)
 # ============================================
 
-def _enrich_post(item: NewsletterItem) -> NewsletterItem:
+SITEMAP_MAX_CHILDREN = 3        # sitemaps filhos seguidos a partir de um sitemap index
+SUBSTACK_ARCHIVE_LIMIT = 12
+
+
+@dataclass
+class PlatformAdapter:
     """
-    Fetch an individual newsletter post page to extract better
-    description and publish date from meta tags.
+    Descoberta de posts por um endpoint leve da plataforma.
+
+    `discover(source_key, source_config, cutoff, max_items)` retorna os posts
+    já filtrados pelo cutoff, ou None se o endpoint não serviu (aí vale o
+    scraping da homepage). `enrich` indica se os itens ainda precisam da
+    página do post (ex.: sitemap só traz URL + data).
+    """
+    name: str
+    discover: Callable[[str, dict, datetime, int], Optional[List[NewsletterItem]]]
+    enrich: bool
+
+
+def _parse_date(value: str, end_of_day: bool = False) -> Optional[datetime]:
+    """
+    Data ISO 8601 em UTC sem tzinfo, como o resto da coleta ("-03:00" é
+    convertido, não descartado). Só a data ("2025-01-31") vira meia-noite, ou
+    o fim do dia com `end_of_day` (o post pode ser de qualquer hora dele)
     """
     try:
-        resp = requests.get(item.url, headers=REQUEST_HEADERS, timeout=15)
-        if resp.status_code != 200:
-            return item
+        value = value.strip()
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    if end_of_day and DATE_ONLY_RE.fullmatch(value):
+        parsed += timedelta(days=1, microseconds=-1)
+    return parsed
+
+
+def _parse_sitemap(content: bytes) -> Dict[str, list]:
+    """{'urls': [[loc, lastmod], ...], 'sitemaps': [loc, ...]} (JSON-serializável p/ o cache HTTP)"""
+    root = ElementTree.fromstring(content)
+    parsed = {'urls': [], 'sitemaps': []}
+    for node in root:
+        fields = {child.tag.rsplit('}', 1)[-1]: (child.text or '').strip() for child in node}
+        if not fields.get('loc'):
+            continue
+        if node.tag.endswith('sitemap'):
+            parsed['sitemaps'].append(fields['loc'])
+        else:
+            parsed['urls'].append([fields['loc'], fields.get('lastmod', '')])
+    return parsed
+
 
-        soup = BeautifulSoup(resp.text, 'lxml')
+def _fetch_sitemap(url: str) -> Optional[Dict[str, list]]:
+    resp = http_cache.get(url, headers=REQUEST_HEADERS, timeout=20,
+                          parse=_parse_sitemap, tag='newsletters')
+    return resp.parsed if resp.status_code == 200 else None
 
-        # Better description from og:description
-        og_desc = soup.find('meta', property='og:description')
-        if og_desc and og_desc.get('content'):
-            item.description = og_desc['content'][:500]
 
-        # Better title from og:title
-        og_title = soup.find('meta', property='og:title')
-        if og_title and og_title.get('content'):
-            item.title = og_title['content']
+def _slug_title(url: str) -> str:
+    """Título provisório a partir do slug (substituído pelo og:title no enriquecimento)"""
+    slug = url.rstrip('/').rsplit('/', 1)[-1].replace('-', ' ').strip()
+    return slug[:1].upper() + slug[1:]
 
-        # Publish date from article:published_time or datePublished
-        date_meta = soup.find('meta', property='article:published_time')
-        if not date_meta:
-            date_meta = soup.find('meta', attrs={'name': 'datePublished'})
 
-        if date_meta and date_meta.get('content'):
+def _beehiiv_sitemap_posts(source_key: str, source_config: dict,
+                           cutoff: datetime, max_items: int) -> Optional[List[NewsletterItem]]:
+    """Posts /p/ do sitemap.xml com <lastmod> >= cutoff, mais recentes primeiro"""
+    sitemap = _fetch_sitemap(source_config['base_url'].rstrip('/') + '/sitemap.xml')
+    if sitemap is None:
+        return None
+
+    entries = list(sitemap['urls'])
+    for child in sitemap['sitemaps'][:SITEMAP_MAX_CHILDREN]:
+        entries.extend((_fetch_sitemap(child) or {}).get('urls', []))
+
+    posts = []
+    for loc, lastmod in entries:
+        if not POST_LINK_RE.search(loc):
+            continue
+        modified = _parse_date(lastmod, end_of_day=True)
+        if modified is None:
+            # Sem data não dá para filtrar antes do download: usa o scraping
+            return None
+        posts.append((modified, loc))
+    if not posts:
+        return None
+
+    # lastmod >= data de publicação (data sem hora conta até o fim do dia),
+    # então nada dentro da janela fica de fora; a data real vem do enriquecimento
+    recent = sorted((p for p in posts if p[0] >= cutoff), reverse=True)[:max_items]
+    return [
+        NewsletterItem(
+            title=_slug_title(loc),
+            description=_slug_title(loc),
+            url=loc,
+            source_name=source_config['name'],
+            source_key=source_key,
+            language=source_config['language'],
+            category_hint=source_config['category_hint'],
+            published_at=modified,
+            date_provisional=True,
+        )
+        for modified, loc in recent
+    ]
+
+
+def _substack_archive_posts(source_key: str, source_config: dict,
+                            cutoff: datetime, max_items: int) -> Optional[List[NewsletterItem]]:
+    """Posts do /api/v1/archive do Substack (já vêm com título, subtítulo e data)"""
+    resp = http_client.get(
+        source_config['base_url'].rstrip('/') + '/api/v1/archive',
+        headers=REQUEST_HEADERS,
+        params={'sort': 'new', 'offset': 0, 'limit': SUBSTACK_ARCHIVE_LIMIT},
+        timeout=20,
+    )
+    if resp.status_code != 200:
+        return None
+
+    items = []
+    for post in resp.json():
+        published_at = _parse_date(post.get('post_date'))
+        url = post.get('canonical_url')
+        if not url or not post.get('title') or (published_at and published_at < cutoff):
+            continue
+        description = post.get('subtitle') or post.get('description') or post['title']
+        items.append(NewsletterItem(
+            title=post['title'],
+            description=description[:500],
+            url=url,
+            source_name=source_config['name'],
+            source_key=source_key,
+            language=source_config['language'],
+            category_hint=source_config['category_hint'],
+            published_at=published_at,
+        ))
+    return items[:max_items]
+
+
+PLATFORM_ADAPTERS = {
+    'beehiiv': PlatformAdapter('sitemap', _beehiiv_sitemap_posts, enrich=True),
+    'substack': PlatformAdapter('archive', _substack_archive_posts, enrich=False),
+}
+
+
+# ============================================
+# ENRICHMENT: Fetch individual post details
+# ============================================
+
+def _full_page_meta(html: str) -> PageMeta:
+    """Fallback: parse completo da página com BeautifulSoup"""
+    soup = BeautifulSoup(html, 'lxml')
+    meta = PageMeta()
+
+    og_title = soup.find('meta', property='og:title')
+    if og_title:
+        meta.og_title = og_title.get('content') or ''
+
+    og_desc = soup.find('meta', property='og:description')
+    if og_desc:
+        meta.og_description = og_desc.get('content') or ''
+
+    published = soup.find('meta', property='article:published_time')
+    if published:
+        meta.published_time = published.get('content') or ''
+
+    date_published = soup.find('meta', attrs={'name': 'datePublished'})
+    if date_published:
+        meta.date_published = date_published.get('content') or ''
+
+    meta.ld_json = [script.string or '' for script in soup.find_all('script', type='application/ld+json')]
+    return meta
+
+
+def _page_date(meta: PageMeta, ld_json: bool = True) -> Optional[datetime]:
+    """Data de publicação da página: article:published_time ou datePublished, senão o JSON-LD"""
+    date_content = meta.published_time if meta.published_time is not None else meta.date_published
+    published_at = _parse_date(date_content) if date_content else None
+
+    # Also try schema.org datePublished in JSON-LD
+    if published_at is None and ld_json:
+        for script in meta.ld_json:
             try:
-                item.published_at = datetime.fromisoformat(
-                    date_meta['content'].replace('Z', '+00:00')
-                ).replace(tzinfo=None)
-            except (ValueError, TypeError):
-                pass
-
-        # Also try schema.org datePublished in JSON-LD
-        if not item.published_at:
-            scripts = soup.find_all('script', type='application/ld+json')
-            for script in scripts:
-                try:
-                    import json
-                    data = json.loads(script.string)
-                    if isinstance(data, dict) and 'datePublished' in data:
-                        item.published_at = datetime.fromisoformat(
-                            data['datePublished'].replace('Z', '+00:00')
-                        ).replace(tzinfo=None)
-                        break
-                except (json.JSONDecodeError, ValueError, TypeError):
-                    pass
+                data = json.loads(script)
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if isinstance(data, dict) and 'datePublished' in data:
+                published_at = _parse_date(data['datePublished'])
+                if published_at:
+                    break
+    return published_at
+
+
+def _apply_page_meta(item: NewsletterItem, meta: PageMeta) -> NewsletterItem:
+    """Aplica os metadados da página ao item"""
+    # Better description from og:description
+    if meta.og_description:
+        item.description = meta.og_description[:500]
+
+    # Better title from og:title
+    if meta.og_title:
+        item.title = meta.og_title
+
+    # Publish date; JSON-LD só quando o item não tem data (a provisória do sitemap não conta)
+    published_at = _page_date(meta, ld_json=not item.published_at or item.date_provisional)
+    if published_at:
+        item.published_at = published_at
+        item.date_provisional = False
+
+    return item
+
+
+def _enrich_post(item: NewsletterItem) -> NewsletterItem:
+    """
+    Fetch an individual newsletter post page to extract better
+    description and publish date from meta tags.
+
+    Lê só o <head> em streaming e encerra o download assim que os
+    metadados aparecem; o parse completo fica para páginas sem eles.
+    O resultado vai para o enrichment_cache só quando a página respondeu 200
+    com título ou data.
+    """
+    try:
+        resp = http_client.stream('GET', item.url, headers=REQUEST_HEADERS, timeout=15)
+        try:
+            if resp.status_code != 200:
+                return item
+
+            meta, consumed, complete = read_head_meta(resp)
+            if not complete:
+                body = read_rest(resp, consumed, http_client.MAX_RESPONSE_BYTES)
+                meta = _full_page_meta(body.decode(resp.encoding or 'utf-8', errors='replace'))
+        finally:
+            resp.close()
+
+        _apply_page_meta(item, meta)
+        # Sem título nem data (página de erro servida com 200, post sem og:*): fora
+        # do cache, senão o título do slug ficaria até o TTL; a próxima execução tenta de novo
+        if meta.og_title or _page_date(meta):
+            enrichment_cache.put(item.url, item.title, item.description,
+                                 None if item.date_provisional else item.published_at)
 
     except Exception as e:
         print(f"  ⚠️ Error enriching {item.url}: {e}")
@@ -298,72 +602,162 @@ def _enrich_post(item: NewsletterItem) -> NewsletterItem:
 # MAIN COLLECTOR
 # ============================================
 
-def collect_newsletter(source_key: str, source_config: dict, cutoff: datetime, max_items: int = 5) -> List[Dict]:
-    """Coleta posts recentes de uma newsletter específica"""
-    items = []
-
+def _fetch_newsletter_posts(source_key: str, source_config: dict) -> List[NewsletterItem]:
+    """Baixa e parseia a homepage de uma newsletter (executa dentro do FetchPool)"""
     try:
-        print(f"  📰 Coletando {source_config['name']} ({source_config['base_url']})...")
-
-        resp = requests.get(
+        resp = http_cache.get(
             source_config['base_url'],
             headers=REQUEST_HEADERS,
-            timeout=20
+            timeout=20,
+            tag='newsletters'
         )
 
         if resp.status_code != 200:
             print(f"  ⚠️ {source_config['name']}: HTTP {resp.status_code}")
             return []
 
-        # Try main parser first
-        newsletter_items = _parse_beehiiv_page(resp.text, source_key, source_config)
+        hint = _load_strategy_hints().get(source_key)
+        newsletter_items, strategy = _parse_beehiiv_page(resp.text, source_key, source_config, hint)
+        _remember_strategy(source_key, strategy)
+        return newsletter_items
 
-        # Fallback to meta tag parser
-        if not newsletter_items:
-            newsletter_items = _parse_via_meta_tags(
-                resp.text, source_config['base_url'], source_key, source_config
-            )
+    except Exception as e:
+        print(f"  ❌ Erro coletando {source_config['name']}: {e}")
+        return []
 
-        print(f"    → Encontrados {len(newsletter_items)} posts")
 
-        # Enrich top posts with individual page data
-        for i, item in enumerate(newsletter_items[:max_items]):
-            item = _enrich_post(item)
-            newsletter_items[i] = item
+def _from_enrichment_cache(item: NewsletterItem) -> Optional[NewsletterItem]:
+    """Cópia do item com os campos já enriquecidos numa execução anterior"""
+    cached = enrichment_cache.get(item.url)
+    if cached is None:
+        return None
+    return replace(
+        item,
+        title=cached['title'],
+        description=cached['description'],
+        published_at=cached['published_at'] or item.published_at,
+        date_provisional=item.date_provisional and not cached['published_at'],
+    )
 
-        # Filter by date (if we have dates)
-        filtered = []
-        for item in newsletter_items[:max_items]:
-            if item.published_at and item.published_at < cutoff:
-                continue
-            filtered.append(item.to_raw_dict())
 
-        # If no dates available, include all (Claude will filter)
-        if not filtered and newsletter_items:
-            filtered = [item.to_raw_dict() for item in newsletter_items[:max_items]]
+def _discover_posts(source_key: str, source_config: dict, cutoff: datetime,
+                    max_items: int) -> Tuple[List[NewsletterItem], bool, str]:
+    """
+    Posts de uma newsletter: adapter da plataforma primeiro, scraping da
+    homepage como fallback. Retorna (itens, precisa_enriquecer, via).
+    """
+    adapter = PLATFORM_ADAPTERS.get(source_config.get('platform'))
+    if adapter:
+        try:
+            items = adapter.discover(source_key, source_config, cutoff, max_items)
+            if items is not None:
+                tracing.current().set(items=len(items), via=adapter.name)
+                return items, adapter.enrich, adapter.name
+        except Exception as e:
+            print(f"  ⚠️ {source_config['name']}: {adapter.name} indisponível ({e}), usando a homepage")
+    items = _fetch_newsletter_posts(source_key, source_config)
+    tracing.current().set(items=len(items), via='homepage')
+    return items, True, 'homepage'
+
 
-        items = filtered
-        print(f"    → {len(items)} itens após filtro de data")
+def _enrich_copy(item: NewsletterItem) -> NewsletterItem:
+    # Enriquece uma cópia: se o orçamento estourar, o original segue intacto
+    return _enrich_post(replace(item))
 
-    except Exception as e:
-        print(f"  ❌ Erro coletando {source_config['name']}: {e}")
 
-    return items
+def _filter_by_date(newsletter_items: List[NewsletterItem], cutoff: datetime, max_items: int) -> List[Dict]:
+    """Filtra por data; sem nenhuma data, inclui todos (Claude filtra)"""
+    # Filter by date (if we have dates)
+    filtered = []
+    for item in newsletter_items[:max_items]:
+        if item.published_at and item.published_at < cutoff:
+            continue
+        filtered.append(item.to_raw_dict())
+
+    # If no dates available, include all (Claude will filter)
+    if not filtered and newsletter_items:
+        filtered = [item.to_raw_dict() for item in newsletter_items[:max_items]]
+
+    return filtered
+
+
+def _platform_key(url: str) -> str:
+    """Agrupa hosts da mesma plataforma num único limite de concorrência"""
+    host = host_of(url)
+    for source_config in NEWSLETTER_SOURCES.values():
+        if host_of(source_config['base_url']) == host:
+            return source_config.get('platform', host)
+    return 'beehiiv' if host.endswith('.beehiiv.com') else host
+
+
+def _collect_sources(sources: Dict[str, dict], cutoff: datetime, max_items: int = 5) -> List[Dict]:
+    """
+    Descoberta (sitemap/archive ou homepage) e enriquecimento em paralelo,
+    com limite por plataforma e orçamento total (NEWSLETTER_BUDGET_SECONDS)
+    """
+    all_items = []
+    deadline = deadline_in(NEWSLETTER_BUDGET_SECONDS)
+
+    with FetchPool(NEWSLETTER_MAX_WORKERS, NEWSLETTER_PER_PLATFORM,
+                   deadline=deadline, host_key=_platform_key) as pool:
+        # 1) Descoberta: endpoints leves já filtram pelo cutoff antes de baixar posts
+        for source_config in sources.values():
+            print(f"  📰 Coletando {source_config['name']} ({source_config['base_url']})...")
+        discovered = pool.gather({
+            key: pool.submit(config['base_url'], tracing.traced, config['name'],
+                             _discover_posts, key, config, cutoff, max_items)
+            for key, config in sources.items()
+        })
+        pages = {key: items for key, (items, _, _) in discovered.items()}
+
+        # 2) Enrich top posts with individual page data (todas as fontes juntas);
+        #    posts já enriquecidos antes vêm do cache, sem request
+        enriched = {}
+        enrich_futures = {}
+        for key, (newsletter_items, needs_enrichment, via) in discovered.items():
+            print(f"    → {sources[key]['name']}: encontrados {len(newsletter_items)} posts ({via})")
+            if not needs_enrichment:
+                continue
+            for i, item in enumerate(newsletter_items[:max_items]):
+                cached = _from_enrichment_cache(item)
+                if cached is not None:
+                    enriched[(key, i)] = cached
+                else:
+                    enrich_futures[(key, i)] = pool.submit(item.url, tracing.traced, f"enrich {item.url}",
+                                                           _enrich_copy, item)
+        enriched.update(pool.gather(enrich_futures))
+
+    # 3) Filtro de data por fonte, na ordem de configuração
+    for key, newsletter_items in pages.items():
+        for i in range(min(max_items, len(newsletter_items))):
+            if (key, i) in enriched:
+                newsletter_items[i] = enriched[(key, i)]
+
+        items = _filter_by_date(newsletter_items, cutoff, max_items)
+        print(f"    → {sources[key]['name']}: {len(items)} itens após filtro de data")
+        all_items.extend(items)
+
+    return all_items
+
+
+def collect_newsletter(source_key: str, source_config: dict, cutoff: datetime, max_items: int = 5) -> List[Dict]:
+    """Coleta posts recentes de uma newsletter específica"""
+    return _collect_sources({source_key: source_config}, cutoff, max_items)
 
 
 def collect_all_newsletters() -> List[Dict]:
     """Coleta posts de todas as newsletters configuradas"""
     print("📰 Coletando newsletters...")
 
-    all_items = []
     # Newsletters have a wider window (36h) since they may publish late
     cutoff = datetime.utcnow() - timedelta(hours=36)
 
-    for source_key, source_config in NEWSLETTER_SOURCES.items():
-        items = collect_newsletter(source_key, source_config, cutoff)
-        all_items.extend(items)
+    all_items = _collect_sources(NEWSLETTER_SOURCES, cutoff)
+    evicted = enrichment_cache.evict()
 
     print(f"   → Total newsletters: {len(all_items)} itens")
+    print(f"   → Enriquecimento: {enrichment_summary()} · cache: {enrichment_cache.summary()}"
+          + (f" · {evicted} expirados" if evicted else ""))
     return all_items
 
 
@@ -372,12 +766,12 @@ def collect_all_newsletters() -> List[Dict]:
 # ============================================
 
 if __name__ == "__main__":
-    import json
-
     results = collect_all_newsletters()
 
     print(f"\n📊 Resumo:")
     print(f"   Total: {len(results)} itens")
+    print(f"   Cache HTTP: {http_cache.summary('newsletters')}")
+    http_client.print_connection_stats()
 
     for item in results:
         print(f"\n   📰 {item['source_name']}")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Page Meta
+Extração em streaming dos metadados do <head> (og:*, published_time, JSON-LD)
+"""
+
+import codecs
+import threading
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+HEAD_CHUNK = 8 * 1024
+# Sem </head> até aqui, desiste do modo streaming e faz o parse completo
+HEAD_MAX_BYTES = 512 * 1024
+
+
+@dataclass
+class PageMeta:
+    """
+    Metadados de um post. None = tag ausente; '' = tag presente sem content
+    (mesma distinção que o find() do BeautifulSoup fazia).
+    """
+    og_title: Optional[str] = None
+    og_description: Optional[str] = None
+    published_time: Optional[str] = None   # meta property=article:published_time
+    date_published: Optional[str] = None   # meta name=datePublished
+    ld_json: List[str] = field(default_factory=list)  # <script type=application/ld+json>
+
+    @property
+    def complete(self) -> bool:
+        has_date = self.published_time is not None or self.date_published is not None or bool(self.ld_json)
+        return self.og_title is not None and self.og_description is not None and has_date
+
+
+class HeadMetaParser(HTMLParser):
+    """Parser incremental que para no fim do <head> (ou antes, se já tiver tudo)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = PageMeta()
+        self.head_closed = False
+        self._ld_parts: Optional[List[str]] = None
+
+    @property
+    def done(self) -> bool:
+        m = self.meta
+        # article:published_time tem prioridade sobre as demais datas: com ele não há o que esperar
+        return self.head_closed or (
+            m.og_title is not None and m.og_description is not None and m.published_time is not None
+        )
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            self.head_closed = True
+            return
+        attrs = dict(attrs)
+        if tag == 'meta':
+            content = attrs.get('content') or ''
+            prop = attrs.get('property')
+            m = self.meta
+            if prop == 'og:title' and m.og_title is None:
+                m.og_title = content
+            elif prop == 'og:description' and m.og_description is None:
+                m.og_description = content
+            elif prop == 'article:published_time' and m.published_time is None:
+                m.published_time = content
+            elif attrs.get('name') == 'datePublished' and m.date_published is None:
+                m.date_published = content
+        elif tag == 'script' and attrs.get('type') == 'application/ld+json':
+            self._ld_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.head_closed = True
+        elif tag == 'script' and self._ld_parts is not None:
+            self.meta.ld_json.append(''.join(self._ld_parts))
+            self._ld_parts = None
+
+    def handle_data(self, data):
+        if self._ld_parts is not None:
+            self._ld_parts.append(data)
+
+
+# ---------- estatísticas ----------
+
+_stats_lock = threading.Lock()
+_stats = {'pages': 0, 'head_only': 0, 'bytes_read': 0}
+
+
+def _record(bytes_read: int, head_only: bool) -> None:
+    with _stats_lock:
+        _stats['pages'] += 1
+        _stats['head_only'] += int(head_only)
+        _stats['bytes_read'] += bytes_read
+
+
+def stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def summary() -> str:
+    s = stats()
+    return f"{s['pages']} páginas, {s['head_only']} só <head>, {s['bytes_read'] / 1024:.0f} KB lidos"
+
+
+# ---------- leitura ----------
+
+def read_head_meta(resp: requests.Response, max_bytes: int = HEAD_MAX_BYTES) -> Tuple[PageMeta, bytes, bool]:
+    """
+    Lê o corpo de `resp` (aberto com stream=True) só até o fim do <head>.
+    Retorna (meta, bytes lidos, completo?). Com completo=False o chamador
+    deve ler o resto do corpo e fazer o parse completo.
+    """
+    parser = HeadMetaParser()
+    decoder = codecs.getincrementaldecoder(resp.encoding or 'utf-8')(errors='replace')
+    chunks = []
+    size = 0
+    for chunk in resp.iter_content(HEAD_CHUNK):
+        chunks.append(chunk)
+        size += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done or size >= max_bytes:
+            break
+
+    complete = parser.done and parser.meta.complete
+    if complete:
+        _record(size, head_only=True)
+    return parser.meta, b''.join(chunks), complete
+
+
+def read_rest(resp: requests.Response, consumed: bytes, max_bytes: int) -> bytes:
+    """Completa o corpo a partir do que read_head_meta já consumiu"""
+    chunks = [consumed]
+    size = len(consumed)
+    for chunk in resp.iter_content(HEAD_CHUNK):
+        size += len(chunk)
+        if size > max_bytes:
+            break
+        chunks.append(chunk)
+    _record(size, head_only=False)
+    return b''.join(chunks)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Pipeline
+Passagem em memória entre as etapas do run.py; os artefatos em /tmp
+continuam sendo gravados, numa thread em segundo plano
+"""
+
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from artifacts import CURATED_PATH, RAW_PATH, write_curated, write_raw
+from dedupe import Deduper, normalize_item
+from links import clean_item, prefetch_links
+from themes import annotate
+
+# Passos baratos por item antes do dedupe (no fluxo da coleta e no dedupe em lote);
+# os links curtos de clean_item já vêm disparados por prefetch_links
+ITEM_STEPS = (normalize_item, clean_item, annotate)
+
+
+class CandidateStream:
+    """
+    Passos baratos por item rodando durante a coleta.
+
+    put() recebe os itens de cada fonte assim que ela termina (de qualquer
+    thread); uma thread aplica `steps` (item → item, ou None para descartar)
+    e o dedupe incremental. Quando a coleta acaba, close() só drena o que
+    ficou na fila: os candidatos ficam prontos sem uma passada extra.
+    """
+
+    def __init__(self, steps: Sequence[Callable[[Dict], Optional[Dict]]] = ITEM_STEPS):
+        self.steps = list(steps)
+        self.received = 0
+        self.dropped = 0
+        self._deduper = Deduper()
+        self._queue: 'queue.Queue[Optional[List[Dict]]]' = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._consume, name='candidates', daemon=True)
+        self._thread.start()
+
+    def put(self, items: List[Dict]) -> None:
+        prefetch_links(items)
+        self._queue.put(items)
+
+    def _consume(self) -> None:
+        while True:
+            items = self._queue.get()
+            if items is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                for item in items:
+                    self.received += 1
+                    for step in self.steps:
+                        item = step(item)
+                        if item is None:
+                            break
+                    if item is None:
+                        self.dropped += 1
+                    else:
+                        self._deduper.add(item)
+            except Exception as e:  # relançado no close(), na thread da etapa
+                self._error = e
+
+    def close(self) -> Tuple[List[Dict], int]:
+        """(candidatos, repetidos removidos) depois de processar tudo o que chegou"""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._deduper.items(), self._deduper.removed
+
+
+class PipelineContext:
+    """
+    Objetos entregues de uma etapa para a seguinte.
+
+    - raw: cabeçalho da coleta + 'items' (lista de dicts)
+    - candidates: itens já normalizados e sem repetição, montados durante a
+      coleta (CandidateStream) para a `raw` atual
+    - curated: resultado da curadoria
+
+    Sem contexto (ou com a etapa anterior pulada), cada etapa lê o arquivo
+    como nos scripts avulsos do workflow. Os artefatos são gravados por uma
+    única thread, na ordem em que foram entregues; close() espera terminar.
+    Quem recebe um objeto não deve alterá-lo (a gravação pode estar em curso).
+    """
+
+    def __init__(self):
+        self.raw: Optional[Dict] = None
+        self.candidates: Optional[Dict] = None
+        self.curated: Optional[Dict] = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='persist')
+        self._pending: List[Tuple[str, Future]] = []
+
+    def __enter__(self) -> 'PipelineContext':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def persist(self, path: str, fn: Callable, *args) -> None:
+        """Agenda fn(*args) na thread de gravação"""
+        self._pending.append((path, self._writer.submit(fn, *args)))
+
+    def put_raw(self, raw: Dict, path: str = RAW_PATH) -> None:
+        self.raw = raw
+        self.persist(path, write_raw, raw, path)
+
+    def put_curated(self, curated: Dict, path: str = CURATED_PATH) -> None:
+        self.curated = curated
+        self.persist(path, write_curated, curated, path)
+
+    def close(self) -> bool:
+        """Espera as gravações pendentes; False se alguma falhou"""
+        self._writer.shutdown(wait=True)
+        ok = True
+        for path, future in self._pending:
+            error = future.exception()
+            if error:
+                print(f"⚠️ Falha ao gravar {path}: {error}")
+                ok = False
+            else:
+                print(f"💾 Salvo em {path}")
+        self._pending.clear()
+        return ok
@@ -6,10 +6,20 @@ Usa Claude para filtrar e curar notícias quentíssimas
 
 import os
 import json
-import time
-import anthropic
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+from artifacts import CURATED_PATH, RAW_PATH, iter_items, read_header, write_curated
+import heat
+import themes
+import tracing
+from resilience import RETRYABLE_STATUS, RetryPolicy, retry_after_seconds, retry_call
+from sent_index import key_fields, sent_index
+from settings import setting
+
+if TYPE_CHECKING:
+    from pipeline import PipelineContext
 
 # ============================================
 # CONFIGURAÇÃO
@@ -18,6 +28,11 @@ from pathlib import Path
 ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY', '')
 MODEL = "claude-sonnet-4-20250514"
 MAX_TOKENS = 4096
+# Pré-ranking local (heat.py): todos os itens são pontuados, só os top-K vão no prompt
+PROMPT_TOP_K = int(setting('filters.prompt_top_k', 40))
+MIN_HEAT_SCORE = int(setting('filters.min_heat_score', 60))
+# 429 / 5xx / overloaded: até 4 tentativas e no máximo 4 min de espera somada
+CLAUDE_RETRY = RetryPolicy('Claude', max_attempts=4, base_delay=5.0, max_delay=60.0, budget_seconds=240.0)
 
 # ============================================
 # PROMPTS
@@ -58,10 +73,20 @@ SEÇÃO MUNDO REAL (obrigatório):
 - Cada item deve ter: headline curto (max 10 palavras), contexto breve (1 frase), e a URL original
 - Priorize impacto global e relevância para profissionais brasileiros
 
+CAMPOS "themes" E "penalties":
+- Marcados automaticamente a partir dos temas prioritários e das expressões de hype da redação
+- Use como sinal (tema prioritário pesa a favor, hype vazio pesa contra), não como decisão
+
+CAMPOS "sources", "coverage_count" E "first_seen":
+- A mesma história vinda de várias fontes (mesma URL, mesmo título ou texto muito parecido) já chega num item só
+- "sources" lista as fontes que a trouxeram, "coverage_count" conta as fontes distintas e "first_seen" é quando a história apareceu pela primeira vez
+- coverage_count ≥ 2 é cross-validação: não trate essas fontes como duplicatas a descartar
+- Se já apareceu em 3 ou mais fontes, ou first_seen é bem anterior ao item, já circulou: não é breaking
+
 REGRAS PARA ITENS DE NEWSLETTER (source_type "newsletter"):
 - Newsletters são fontes CURADAS — tratá-las como Tier 2 de confiabilidade
 - Quando o mesmo fato aparece em RSS E newsletter, PREFIRA a versão da newsletter se trouxer análise ou contexto adicional
-- Se a newsletter apenas REPETE o que o RSS já trouxe sem adicionar valor, DESCARTE a duplicata
+- Se a newsletter apenas REPETE (com outra URL) o que o RSS já trouxe sem adicionar valor, DESCARTE a duplicata
 - Newsletters em português podem fornecer o ângulo brasileiro que falta nas fontes internacionais
 - Fontes: AiDrop (AI), Evolving AI (AI/modelos), Update Diário (Brasil/geral), TechDrop (SaaS/enterprise), AlphaSignal (research→produto)
 
@@ -143,10 +168,94 @@ LEMBRE-SE:
 # PROCESSADOR
 # ============================================
 
-def load_raw_data(path: str = "/tmp/digest_raw.json") -> dict:
-    """Carrega dados brutos do coletor"""
-    with open(path, 'r') as f:
-        return json.load(f)
+def load_raw_data(path: str = RAW_PATH) -> dict:
+    """
+    Carrega dados brutos do coletor.
+    'items' é um gerador sobre o JSONL: os itens são lidos sob demanda.
+    """
+    raw_data = read_header(path)
+    raw_data['items'] = iter_items(path)
+    return raw_data
+
+
+def prepare_candidates(raw_data: dict) -> dict:
+    """
+    Coleta ainda sem dedupe/agrupamento (scripts avulsos do workflow):
+    normaliza as URLs, junta os repetidos entre fontes e agrupa as histórias
+    aqui, como as etapas do run.py fariam
+    """
+    if 'duplicates_removed' not in raw_data:
+        from dedupe import dedupe_raw
+        from links import prefetched, short_links
+        from pipeline import ITEM_STEPS
+
+        # Dedupe incremental sobre o gerador do JSONL: só os itens que
+        # sobrevivem ficam em memória
+        try:
+            raw_data = dedupe_raw({**raw_data, 'items': prefetched(raw_data.get('items', []))}, ITEM_STEPS)
+        finally:
+            short_links.save()
+    if 'stories_merged' not in raw_data:
+        from clusters import cluster_raw
+        raw_data = cluster_raw(raw_data)
+    return raw_data
+
+
+def _is_fresh(item: dict) -> bool:
+    """<24h para fontes regulares, <36h para newsletters"""
+    if item.get('source_type') == 'newsletter':
+        return item.get('hours_ago', 100) <= 36
+    return item.get('hours_ago', 100) <= 24
+
+
+def select_prompt_items(items: Iterable[dict], limit: int = PROMPT_TOP_K,
+                        min_score: int = MIN_HEAT_SCORE) -> Tuple[List[dict], int]:
+    """
+    Consome os itens em streaming e devolve (itens do prompt, total pré-filtrado).
+
+    Todos os itens frescos recebem o Heat Score local; vão para o prompt os
+    `limit` de maior score, qualquer que seja a fonte ou a posição na coleta.
+    Itens já enviados em dias anteriores (sent_index) nem são pontuados.
+    """
+    total = 0
+    resent = 0
+
+    def fresh():
+        nonlocal total, resent
+        for item in items:
+            if _is_fresh(item):
+                if sent_index.already_sent(item):
+                    resent += 1
+                    continue
+                total += 1
+                yield item
+
+    selected, stats = heat.top_k(fresh(), limit, min_score)
+    newsletters = sum(1 for item in selected if item.get('source_type') == 'newsletter')
+    if resent:
+        print(f"🔁 Já enviados nos últimos {sent_index.window_days:g} dias: {resent} itens fora do prompt")
+    print(f"🌡️ Heat local: {stats['passed']} de {total} itens podem chegar a {min_score} pts; "
+          f"top {len(selected)} para o Claude (corte em {stats['cutoff']} pts, {newsletters} newsletters)")
+
+    # Temas anotados, sem as posições (não ajudam o modelo), e conteúdo cortado
+    # (cópias: os itens podem vir do PipelineContext)
+    selected = [{k: v for k, v in themes.annotate(item).items() if k != 'theme_spans'} for item in selected]
+    for item in selected:
+        if len(item.get('content', '')) > 500:
+            item['content'] = item['content'][:500] + '...'
+
+    return selected, total
+
+
+def _classify_anthropic_error(e: Exception) -> Tuple[bool, Optional[float]]:
+    """(retryable, retry_after): 429, 5xx e overloaded (529) são retryable; o resto é fatal"""
+    import anthropic
+
+    if isinstance(e, anthropic.APIStatusError):
+        return e.status_code in RETRYABLE_STATUS, retry_after_seconds(e.response.headers)
+    if isinstance(e, anthropic.APIConnectionError):  # inclui APITimeoutError
+        return True, None
+    return False, None
 
 
 def curate_with_claude(raw_data: dict) -> dict:
@@ -155,44 +264,34 @@ def curate_with_claude(raw_data: dict) -> dict:
     if not ANTHROPIC_API_KEY:
         raise ValueError("ANTHROPIC_API_KEY not set")
 
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    # SDK carregado só aqui: --skip-process e o override não pagam o import (~2s)
+    import anthropic
 
-    # Prepare items (limit to recent and trim content)
-    items = raw_data.get('items', [])
+    # Retries ficam com CLAUDE_RETRY (não somar com os do SDK)
+    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, max_retries=0)
 
-    # Pre-filter: <24h for regular sources, <36h for newsletters
-    items = [i for i in items if (
-        i.get('hours_ago', 100) <= 36 if i.get('source_type') == 'newsletter'
-        else i.get('hours_ago', 100) <= 24
-    )]
-
-    # Trim content for context
-    for item in items:
-        if len(item.get('content', '')) > 500:
-            item['content'] = item['content'][:500] + '...'
+    # Pre-filter (<24h regular, <36h newsletters), rank by heat and trim content
+    items, total = select_prompt_items(raw_data.get('items', []))
 
     prompt = CURATOR_USER_TEMPLATE.format(
-        total=len(items),
-        items=json.dumps(items[:40], ensure_ascii=False, indent=2)  # Max 40 items (increased for newsletters)
+        total=total,
+        items=json.dumps(items, ensure_ascii=False, indent=2)
     )
 
-    print(f"🤖 Enviando {len(items)} itens para Claude curar...")
+    print(f"🤖 Enviando {total} itens para Claude curar...")
 
-    for attempt in range(3):
-        try:
+    def create():
+        with tracing.span(MODEL, kind=tracing.LLM, items=total) as call:
             response = client.messages.create(
                 model=MODEL,
                 max_tokens=MAX_TOKENS,
                 system=CURATOR_SYSTEM,
                 messages=[{"role": "user", "content": prompt}]
             )
-            break
-        except anthropic.RateLimitError:
-            wait = 60 * (attempt + 1)
-            print(f"⏳ Rate limit atingido, aguardando {wait}s (tentativa {attempt + 1}/3)...")
-            time.sleep(wait)
-    else:
-        raise RuntimeError("❌ Rate limit persistente após 3 tentativas")
+            call.set(input_tokens=response.usage.input_tokens, output_tokens=response.usage.output_tokens)
+            return response
+
+    response = retry_call(create, CLAUDE_RETRY, _classify_anthropic_error)
 
     # Parse response
     response_text = response.content[0].text
@@ -213,13 +312,20 @@ def curate_with_claude(raw_data: dict) -> dict:
         print(f"Response: {response_text[:500]}")
         curated = {"error": str(e), "raw_response": response_text}
 
+    if 'error' not in curated:
+        # Candidatos do prompt, já com as fontes juntadas pelo dedupe/agrupamento:
+        # o envio grava as chaves deles no sent_index (sem refazer o dedupe)
+        curated['candidates'] = [key_fields(item) for item in items]
+
     return curated
 
 
-def save_curated(data: dict, path: str = "/tmp/digest_curated.json"):
-    """Salva dados curados"""
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def save_curated(data: dict, path: str = CURATED_PATH, ctx: Optional['PipelineContext'] = None):
+    """Salva dados curados (com `ctx`: entrega em memória e grava em segundo plano)"""
+    if ctx is not None:
+        ctx.put_curated(data, path)
+        return
+    write_curated(data, path)
     print(f"💾 Curadoria salva em {path}")
 
 
@@ -227,8 +333,12 @@ def save_curated(data: dict, path: str = "/tmp/digest_curated.json"):
 # MAIN
 # ============================================
 
-def process():
-    """Pipeline completo de processamento"""
+def process(ctx: Optional['PipelineContext'] = None):
+    """
+    Pipeline completo de processamento.
+    Com `ctx` (run.py), usa os itens da coleta em memória e entrega a curadoria
+    ao envio; sem ele (ou com a coleta pulada), lê e grava os arquivos em /tmp.
+    """
     print("🔥 THE DAILY BYTE - Iniciando curadoria...")
 
     # Check for override file (resend)
@@ -237,23 +347,25 @@ def process():
         print("📦 Usando curadoria override (resend)...")
         with open(override_path, 'r') as f:
             curated = json.load(f)
-        save_curated(curated)
+        save_curated(curated, ctx=ctx)
         print(f"✅ Override aplicado com {len(curated.get('items', []))} itens")
         return curated
 
     # Load raw data
-    raw_data = load_raw_data()
+    raw_data = ctx.raw if ctx is not None and ctx.raw is not None else load_raw_data()
     print(f"📥 Carregados {raw_data['total_items']} itens brutos")
+    raw_total = raw_data['total_items']
+    raw_data = prepare_candidates(raw_data)
 
     # Curate with Claude
     curated = curate_with_claude(raw_data)
 
     # Add metadata
     curated['processed_at'] = datetime.utcnow().isoformat()
-    curated['raw_total'] = raw_data['total_items']
+    curated['raw_total'] = raw_total
 
     # Save
-    save_curated(curated)
+    save_curated(curated, ctx=ctx)
 
     # Summary
     if 'items' in curated:
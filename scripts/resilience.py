@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Resilience
+Política única de retry: backoff exponencial com jitter, retry-after do
+servidor e orçamento total de espera por etapa
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Callable, FrozenSet, Mapping, Optional, Tuple, TypeVar
+
+if TYPE_CHECKING:  # requests só é importado por quem faz HTTP (retry_http)
+    import requests
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+# 529 = Anthropic overloaded
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504, 529})
+
+T = TypeVar('T')
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry de uma etapa (Anthropic, X, Buttondown...).
+
+    Cada espera é o retry-after do servidor, se houver, ou um backoff
+    exponencial com jitter (full jitter). O total esperado na etapa não
+    passa de `budget_seconds`: se a próxima espera estourar o orçamento,
+    o erro é devolvido na hora em vez de dormir.
+    """
+    name: str
+    max_attempts: int = 4
+    base_delay: float = 2.0
+    max_delay: float = 60.0
+    budget_seconds: float = 120.0
+    retry_statuses: FrozenSet[int] = RETRYABLE_STATUS
+    # False (ex.: POST que cria algo): só repete falhas antes de a requisição
+    # sair (conexão recusada, DNS, connect timeout); read timeout e conexão
+    # caída no meio são ambíguos, o servidor pode ter processado
+    idempotent: bool = True
+    spent: float = field(default=0.0, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return max(0.0, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def reserve(self, seconds: float) -> bool:
+        """Desconta `seconds` do orçamento da etapa; False se não couber"""
+        with self._lock:
+            if self.spent + seconds > self.budget_seconds:
+                return False
+            self.spent += seconds
+            return True
+
+
+def retry_after_seconds(headers: Optional[Mapping[str, str]], rate_limited: bool = True) -> Optional[float]:
+    """
+    Espera pedida pelo servidor: retry-after-ms, retry-after (segundos ou
+    data HTTP) ou, num 429, x-rate-limit-reset (epoch, API do X)
+    """
+    if not headers:
+        return None
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                pass
+    value = headers.get('x-rate-limit-reset') if rate_limited else None
+    if value:
+        try:
+            return float(value) - time.time()
+        except ValueError:
+            pass
+    return None
+
+
+def _wait(policy: RetryPolicy, attempt: int, retry_after: Optional[float], reason: str) -> bool:
+    """Dorme antes da próxima tentativa; False se não há mais tentativas ou orçamento"""
+    if attempt + 1 >= policy.max_attempts:
+        return False
+    delay = policy.delay(attempt, retry_after)
+    if not policy.reserve(delay):
+        print(f"   ⏳ {policy.name}: {reason}, sem orçamento de retry para esperar {delay:.0f}s")
+        return False
+    print(f"   ⏳ {policy.name}: {reason}, nova tentativa em {delay:.1f}s "
+          f"({attempt + 2}/{policy.max_attempts})")
+    time.sleep(delay)
+    return True
+
+
+def retry_call(fn: Callable[[], T], policy: RetryPolicy,
+               classify: Callable[[Exception], Tuple[bool, Optional[float]]]) -> T:
+    """
+    Executa fn() com retry em exceções.
+    `classify(exc)` → (retryable, retry_after); erros fatais sobem na hora.
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            retryable, retry_after = classify(e)
+            if not retryable or not _wait(policy, attempt, retry_after, type(e).__name__):
+                raise
+        attempt += 1
+
+
+def _retryable_exception(e: 'requests.RequestException', policy: RetryPolicy) -> bool:
+    import requests
+    from urllib3.exceptions import NewConnectionError
+
+    if policy.idempotent:
+        return isinstance(e, (requests.ConnectionError, requests.Timeout))
+    if isinstance(e, requests.ConnectTimeout):
+        return True
+    reason = getattr(e.args[0], 'reason', None) if e.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def retry_http(send: Callable[[], 'requests.Response'], policy: RetryPolicy) -> 'requests.Response':
+    """
+    Executa send() (uma requisição) com retry em falhas de conexão e
+    status de `policy.retry_statuses`. Esgotadas as tentativas, devolve a
+    última resposta para o chamador tratar o status como antes.
+    """
+    import requests
+
+    attempt = 0
+    while True:
+        try:
+            resp = send()
+        except requests.RequestException as e:
+            if not _retryable_exception(e, policy) or not _wait(policy, attempt, None, type(e).__name__):
+                raise
+        else:
+            if resp.status_code not in policy.retry_statuses:
+                return resp
+            retry_after = retry_after_seconds(resp.headers, rate_limited=resp.status_code == 429)
+            if not _wait(policy, attempt, retry_after, f"HTTP {resp.status_code}"):
+                return resp
+        attempt += 1
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 THE DAILY BYTE - Script Principal
-Orquestra coleta → curadoria → envio
+Orquestra coleta → dedupe → agrupamento → curadoria → render → envio (dag.py)
 """
 
 import sys
@@ -11,9 +11,135 @@ from datetime import datetime
 # Add scripts dir to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from collector import collect_all
-from processor import process
-from sender import send
+import tracing
+from dag import DagRunner, Stage, file_digest
+from links import prefetch_links, short_links
+from pipeline import ITEM_STEPS, CandidateStream, PipelineContext
+from settings import CONFIG_PATH
+
+# Cada etapa importa o próprio módulo ao começar: collector (requests, bs4, lxml)
+# e processor (anthropic) ficam fora de --skip-collect / --skip-process / --preview
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+OVERRIDE_PATH = os.path.join(SCRIPTS_DIR, 'resend_curated.json')
+# Coleta reaproveitada por no máximo N horas (--resume ignora o limite)
+COLLECT_MAX_AGE_HOURS = float(os.environ.get('DAG_COLLECT_MAX_AGE_HOURS', '6'))
+
+
+def _source(name: str) -> str:
+    return file_digest(os.path.join(SCRIPTS_DIR, name))
+
+
+def build_stages(ctx: PipelineContext, preview: bool, skip_collect: bool, skip_process: bool):
+    """coleta → dedupe → agrupamento → curadoria → render → envio"""
+    from artifacts import CURATED_PATH, RAW_PATH, iter_items, read_header, with_current_ages
+
+    def collect():
+        from collector import collect_all
+        from dedupe import deduped
+        # Normalização e dedupe rodam conforme cada fonte termina
+        stream = CandidateStream()
+        raw = collect_all(on_items=stream.put)
+        items, removed = stream.close()
+        ctx.put_raw(raw)
+        ctx.candidates = deduped(raw, items, removed)
+        return raw
+
+    def load_raw():
+        print(f"⏭️ Pulando coleta (--skip-collect): usando {RAW_PATH}")
+        return {**read_header(RAW_PATH), 'items': list(iter_items(RAW_PATH))}
+
+    def dedupe(raw):
+        from dedupe import dedupe_raw
+        candidates = ctx.candidates
+        if candidates is not None and candidates['collected_at'] == raw.get('collected_at'):
+            print(f"🧹 Dedupe (feito durante a coleta): {candidates['duplicates_removed']} repetidos "
+                  f"removidos, {candidates['total_items']} itens seguem")
+            return candidates
+        prefetch_links(raw.get('items', []))
+        return dedupe_raw(raw, ITEM_STEPS)
+
+    def cluster(raw):
+        from clusters import cluster_raw
+        return cluster_raw(raw)
+
+    def curate(raw):
+        from processor import process
+        # Coleta vinda do cache: idade dos itens relativa a agora
+        ctx.raw = with_current_ages(raw)
+        return process(ctx=ctx)
+
+    def curate_fingerprint():
+        import processor
+        return {
+            'config': file_digest(CONFIG_PATH),
+            'model': processor.MODEL,
+            'max_tokens': processor.MAX_TOKENS,
+            'prompt': [processor.CURATOR_SYSTEM, processor.CURATOR_USER_TEMPLATE],
+            # sent_index fica de fora: depois do envio, rodar de novo no mesmo dia
+            # remontaria o prompt sem o que acabou de sair e mandaria outro email
+            'prompt_items': [processor.PROMPT_TOP_K, processor.MIN_HEAT_SCORE, _source('heat.py'), _source('themes.py')],
+            'override': file_digest(OVERRIDE_PATH),
+        }
+
+    def load_curated():
+        from sender import load_curated
+        print(f"⏭️ Pulando processamento (--skip-process): usando {CURATED_PATH}")
+        ctx.curated = load_curated(CURATED_PATH)
+        return ctx.curated
+
+    def render(curated):
+        from sender import render_email
+        if 'error' in curated:
+            raise RuntimeError(f"Erro nos dados curados: {curated['error']}")
+        ctx.curated = curated
+        return render_email(curated)
+
+    def send(email):
+        from sender import deliver
+        result = deliver(email['subject'], email['content'], preview=preview)
+        if not preview and result.get('success') is True:
+            from sender import record_delivery
+            record_delivery(ctx.curated, ctx.raw['items'] if ctx.raw is not None else [])
+        return result
+
+    if skip_collect:
+        collect_stage = Stage('coleta', "📥 STEP 1: COLETA", load_raw,
+                              fingerprint=lambda: file_digest(RAW_PATH), cacheable=lambda raw: False)
+    else:
+        collect_stage = Stage('coleta', "📥 STEP 1: COLETA", collect,
+                              fingerprint=lambda: [file_digest(CONFIG_PATH), _source('collector.py'),
+                                                   _source('newsletter_collector.py'),
+                                                   bool(os.environ.get('X_BEARER_TOKEN'))],
+                              max_age_hours=COLLECT_MAX_AGE_HOURS, restore=ctx.put_raw)
+
+    if skip_process:
+        curate_stage = Stage('curadoria', "🤖 STEP 2: CURADORIA", load_curated,
+                             fingerprint=lambda: file_digest(CURATED_PATH), cacheable=lambda c: False)
+    else:
+        curate_stage = Stage('curadoria', "🤖 STEP 2: CURADORIA", curate, deps=('agrupamento',),
+                             fingerprint=curate_fingerprint,
+                             cacheable=lambda curated: 'error' not in curated, restore=ctx.put_curated)
+
+    stages = [] if skip_collect and skip_process else [
+        collect_stage,
+        Stage('dedupe', "🧹 DEDUPE", dedupe, deps=('coleta',),
+              fingerprint=lambda: [_source('dedupe.py'), _source('links.py'), _source('themes.py'),
+                                   file_digest(CONFIG_PATH)]),
+        Stage('agrupamento', "🧩 AGRUPAMENTO", cluster, deps=('dedupe',),
+              fingerprint=lambda: [_source('clusters.py'), _source('dedupe.py'), _source('themes.py'),
+                                   file_digest(CONFIG_PATH)]),
+    ]
+    return stages + [
+        curate_stage,
+        # O assunto leva a data: render muda a cada dia
+        Stage('render', "📝 RENDER", render, deps=('curadoria',),
+              fingerprint=lambda: [_source('sender.py'), datetime.now().date().isoformat()]),
+        # Só envios de verdade vão para o cache: o mesmo email não é enviado duas vezes
+        Stage('envio', "📤 STEP 3: ENVIO", send, deps=('render',), fingerprint=lambda: {'preview': preview},
+              cacheable=lambda result: bool(result) and result.get('success') is True, resumable=False),
+    ]
+
 
 def main():
     """Pipeline completo do Daily Byte"""
@@ -32,45 +158,35 @@ def main():
     preview_mode = "--preview" in sys.argv or "-p" in sys.argv
     skip_collect = "--skip-collect" in sys.argv
     skip_process = "--skip-process" in sys.argv
+    # --resume: reaproveita as etapas concluídas da última execução (mesmo vencidas)
+    # --fresh: ignora o cache e refaz tudo
+    resume = "--resume" in sys.argv
+    fresh = "--fresh" in sys.argv
+    # --trace: spans por etapa/fonte/HTTP/LLM em TRACE_PATH; --profile: idem + cProfile
+    profile_mode = "--profile" in sys.argv
+    if profile_mode or "--trace" in sys.argv:
+        tracing.enable(profile=profile_mode)
+
+    # Etapas passam os objetos em memória; /tmp/digest_*.json gravados em segundo plano
+    ctx = PipelineContext()
+    runner = DagRunner(build_stages(ctx, preview_mode, skip_collect, skip_process), resume=resume, fresh=fresh)
 
     try:
-        # Step 1: Collect
-        if not skip_collect:
-            print("\n" + "="*50)
-            print("📥 STEP 1: COLETA")
-            print("="*50)
-            raw_data = collect_all()
-
-            # Save
-            import json
-            with open("/tmp/digest_raw.json", 'w') as f:
-                json.dump(raw_data, f, indent=2, ensure_ascii=False)
-        else:
-            print("⏭️ Pulando coleta (--skip-collect)")
-
-        # Step 2: Process
-        if not skip_process:
-            print("\n" + "="*50)
-            print("🤖 STEP 2: CURADORIA")
-            print("="*50)
-            curated = process()
-        else:
-            print("⏭️ Pulando processamento (--skip-process)")
-
-        # Step 3: Send
-        print("\n" + "="*50)
-        print("📤 STEP 3: ENVIO")
-        print("="*50)
-        result = send(preview=preview_mode)
+        outputs = runner.run()
+        result = outputs['envio']
 
         # Summary
         print("\n" + "="*50)
         print("✅ PIPELINE COMPLETO!")
         print("="*50)
 
+        if runner.reused:
+            print(f"♻️ Reaproveitado do cache: {', '.join(runner.reused)}")
         if preview_mode:
             print("📋 Modo preview - email NÃO foi enviado")
             print("   Use sem --preview para enviar de verdade")
+        elif 'envio' in runner.reused:
+            print("📧 Este email já tinha sido enviado — nada foi reenviado (--fresh para reenviar)")
         else:
             print("📧 Email enviado para todos os subscribers!")
 
@@ -82,6 +198,12 @@ def main():
         traceback.print_exc()
         return {"success": False, "error": str(e)}
 
+    finally:
+        ctx.close()
+        short_links.save()
+        runner.evict()
+        tracing.finish()
+
 
 if __name__ == "__main__":
     main()
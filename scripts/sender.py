@@ -7,9 +7,14 @@ Envia o digest via Buttondown API
 import os
 import json
 import re
-import requests
+
+from artifacts import CURATED_PATH, RAW_PATH, iter_items
+from resilience import RetryPolicy, retry_http
 from datetime import datetime
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from pipeline import PipelineContext
 
 # ============================================
 # CONFIGURAÇÃO
@@ -17,6 +22,11 @@ from typing import Dict, Optional
 
 BUTTONDOWN_API_KEY = os.environ.get('BUTTONDOWN_API_KEY', '').strip()
 BUTTONDOWN_API_URL = "https://api.buttondown.email/v1/emails"
+# POST cria o email: só repete quando o servidor certamente não processou
+# (sem conexão, 429, 503); read timeout e outros 5xx não, para não enviar duas vezes
+BUTTONDOWN_RETRY = RetryPolicy('Buttondown', max_attempts=3, base_delay=2.0, max_delay=30.0,
+                               budget_seconds=60.0, retry_statuses=frozenset({429, 503}),
+                               idempotent=False)
 
 # ============================================
 # TEMPLATES
@@ -136,6 +146,7 @@ def generate_email_content(curated: Dict) -> str:
 
 def send_via_buttondown(subject: str, content: str, draft: bool = False) -> Dict:
     """Envia email via Buttondown API"""
+    import http_client  # requests só quando envia de verdade (o --preview não precisa)
 
     headers = {
         "Authorization": f"Token {BUTTONDOWN_API_KEY}",
@@ -150,10 +161,14 @@ def send_via_buttondown(subject: str, content: str, draft: bool = False) -> Dict
 
     print(f"📤 Enviando via Buttondown (draft={draft})...")
 
-    response = requests.post(
-        BUTTONDOWN_API_URL,
-        headers=headers,
-        json=payload
+    response = retry_http(
+        lambda: http_client.post(
+            BUTTONDOWN_API_URL,
+            headers=headers,
+            json=payload,
+            timeout=(5, 60)
+        ),
+        BUTTONDOWN_RETRY
     )
 
     if response.status_code in [200, 201]:
@@ -167,7 +182,7 @@ def send_via_buttondown(subject: str, content: str, draft: bool = False) -> Dict
         raise RuntimeError(f"Buttondown API error: {response.status_code}")
 
 
-def load_curated(path: str = "/tmp/digest_curated.json") -> Dict:
+def load_curated(path: str = CURATED_PATH) -> Dict:
     """Carrega dados curados"""
     with open(path, 'r') as f:
         return json.load(f)
@@ -177,28 +192,20 @@ def load_curated(path: str = "/tmp/digest_curated.json") -> Dict:
 # MAIN
 # ============================================
 
-def send(preview: bool = False):
-    """Pipeline de envio"""
-    print("🔥 THE DAILY BYTE - Preparando envio...")
-
-    # Load curated data
-    curated = load_curated()
-
-    if 'error' in curated:
-        print(f"❌ Erro nos dados curados: {curated['error']}")
-        return
-
-    # Generate subject
-    today = datetime.now()
+def render_email(curated: Dict, today: Optional[datetime] = None) -> Dict:
+    """{subject, content} do email a partir da curadoria"""
+    today = today or datetime.now()
     weekdays_pt = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
     months_pt = ['', 'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
                  'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
 
     subject = f"🔥 Daily Byte - {weekdays_pt[today.weekday()]}, {today.day} de {months_pt[today.month]}"
 
-    # Generate content
-    content = generate_email_content(curated)
+    return {"subject": subject, "content": generate_email_content(curated)}
+
 
+def deliver(subject: str, content: str, preview: bool = False) -> Dict:
+    """Mostra/salva o preview ou envia de verdade"""
     if preview:
         print("\n" + "="*50)
         print("📧 PREVIEW DO EMAIL")
@@ -220,6 +227,50 @@ def send(preview: bool = False):
     return send_via_buttondown(subject, content)
 
 
+def send(preview: bool = False, ctx: Optional['PipelineContext'] = None):
+    """Pipeline de envio (com `ctx`, usa a curadoria em memória do run.py)"""
+    print("🔥 THE DAILY BYTE - Preparando envio...")
+
+    # Load curated data
+    curated = ctx.curated if ctx is not None and ctx.curated is not None else load_curated()
+
+    if 'error' in curated:
+        print(f"❌ Erro nos dados curados: {curated['error']}")
+        return
+
+    email = render_email(curated)
+    result = deliver(email['subject'], email['content'], preview)
+    if not preview and result.get('success') is True:
+        record_delivery(curated, ctx.raw['items'] if ctx is not None and ctx.raw is not None else None)
+    return result
+
+
+def record_delivery(curated: Dict, items: Optional[List[Dict]] = None) -> None:
+    """
+    Índice de enviados (sent_index) depois de um envio de verdade, com os
+    candidatos do prompt guardados na curadoria (fontes juntadas incluídas).
+    Curadoria sem eles (override, ou gravada antes): `items` ou a coleta em
+    RAW_PATH. Nunca levanta: o email já saiu.
+    """
+    try:
+        from sent_index import record_sent
+        candidates = curated.get('candidates')
+        if candidates is None:
+            candidates = _raw_items() if items is None else items
+        record_sent(curated, candidates)
+    except Exception as e:
+        print(f"⚠️ Índice de enviados não atualizado ({e}): o email foi enviado normalmente")
+
+
+def _raw_items() -> List[Dict]:
+    """Itens da coleta em RAW_PATH, se existir (nos scripts avulsos do workflow)"""
+    try:
+        return list(iter_items(RAW_PATH))
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Coleta não lida ({e}): índice de enviados só com as URLs do email")
+        return []
+
+
 if __name__ == "__main__":
     import sys
 
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Sent Index
+O que já foi enviado nos últimos dias (URLs e impressão digital da
+história), para a mesma matéria não voltar requentada enquanto ainda está
+na janela de 24h/36h dos feeds
+"""
+
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from links import item_links, link_key
+from settings import setting
+from storage import CACHE_DIR
+from themes import fold
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+SENT_DB = "sent.sqlite3"
+# Janela móvel: cobre com folga max_age_hours_newsletters (36h)
+SENT_WINDOW_DAYS = float(setting('filters.sent_window_days', 3))
+BLOOM_ERROR_RATE = 0.01
+BLOOM_MIN_CAPACITY = 1024
+
+# Impressão digital da história: palavras do título (sem acento, 3+ letras), em ordem
+STORY_MIN_WORDS = 4
+WORD_RE = re.compile(r'\w+')
+
+# Campos da curadoria (curated.json) que viram email
+CURATED_SECTIONS = ('items', 'world')
+# Campos de um candidato usados por item_keys (o resto não precisa ir para a curadoria)
+KEY_FIELDS = ('url', 'title', 'sources')
+KEY_RAW_FIELDS = ('urls', 'comments')
+
+
+def story_key(title: str) -> Optional[str]:
+    """Hash das palavras do título sem ordem nem repetição (None se o título é curto demais)"""
+    words = sorted({w for w in WORD_RE.findall(fold(title or '')) if len(w) >= 3})
+    if len(words) < STORY_MIN_WORDS:
+        return None
+    return hashlib.sha1(' '.join(words).encode('utf-8')).hexdigest()[:16]
+
+
+def item_keys(item: Dict) -> Set[str]:
+    """Chaves de um item: URLs canônicas (dele e das fontes juntadas) e a da história"""
+    urls = item_links(item) + [ref.get('url', '') for ref in item.get('sources') or []]
+    keys = {f"url:{key}" for key in map(link_key, urls) if key}
+    story = story_key(item.get('title', ''))
+    if story:
+        keys.add(f"story:{story}")
+    return keys
+
+
+def key_fields(item: Dict) -> Dict:
+    """Só o que item_keys usa: URL, título, fontes juntadas e links do tweet/HN"""
+    slim = {field: item[field] for field in KEY_FIELDS if item.get(field)}
+    raw = item.get('raw_data') or {}
+    links = {field: raw[field] for field in KEY_RAW_FIELDS if raw.get(field)}
+    if links:
+        slim['raw_data'] = links
+    return slim
+
+
+class BloomFilter:
+    """Conjunto aproximado (sem falso negativo) com k posições por chave (hash duplo)"""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SentIndex:
+    """
+    Chaves enviadas (SQLite, janela de SENT_WINDOW_DAYS) com um Bloom filter
+    na frente: a grande maioria dos itens, nunca enviados, é descartada sem
+    consulta ao banco; só os "talvez" são confirmados no SQLite.
+    """
+
+    def __init__(self, path=None, window_days: float = SENT_WINDOW_DAYS):
+        self.path = path or CACHE_DIR / SENT_DB
+        self.window_days = window_days
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bloom: Optional[BloomFilter] = None
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.confirmed = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sent (
+                    key TEXT PRIMARY KEY,
+                    sent_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def _cutoff(self) -> float:
+        return time.time() - self.window_days * 86400
+
+    def _filter(self) -> BloomFilter:
+        if self._bloom is None:
+            keys = [key for key, in self._db().execute(
+                "SELECT key FROM sent WHERE sent_at >= ?", (self._cutoff(),))]
+            self._bloom = BloomFilter(max(BLOOM_MIN_CAPACITY, 2 * len(keys)))
+            for key in keys:
+                self._bloom.add(key)
+        return self._bloom
+
+    def already_sent(self, item: Dict) -> bool:
+        """Alguma chave do item foi enviada dentro da janela?"""
+        keys = item_keys(item)
+        with self._lock:
+            self.checked += 1
+            bloom = self._filter()
+            maybe = [key for key in keys if key in bloom]
+            if not maybe:
+                return False
+            row = self._db().execute(
+                f"SELECT 1 FROM sent WHERE sent_at >= ? AND key IN ({','.join('?' * len(maybe))}) LIMIT 1",
+                (self._cutoff(), *maybe)
+            ).fetchone()
+        if row is None:
+            return False
+        self.confirmed += 1
+        return True
+
+    def record(self, keys: Iterable[str]) -> int:
+        """Marca as chaves como enviadas agora e tira do banco o que saiu da janela"""
+        now = time.time()
+        rows = [(key, now) for key in set(keys)]
+        with self._lock:
+            db = self._db()
+            db.executemany("INSERT OR REPLACE INTO sent VALUES (?, ?)", rows)
+            db.execute("DELETE FROM sent WHERE sent_at < ?", (self._cutoff(),))
+            db.commit()
+            if self._bloom is not None:
+                for key, _ in rows:
+                    self._bloom.add(key)
+        return len(rows)
+
+
+# Instância compartilhada pelo pré-filtro (processor) e pelo envio (sender / run.py)
+sent_index = SentIndex()
+
+
+def sent_entries(curated: Dict) -> List[Dict]:
+    """Itens da curadoria que entram no email (com source_url)"""
+    entries = [entry for section in CURATED_SECTIONS for entry in curated.get(section) or []]
+    return [entry for entry in entries if isinstance(entry, dict) and entry.get('source_url')]
+
+
+def record_sent(curated: Dict, items: Optional[Iterable[Dict]] = None) -> int:
+    """
+    Registra o que foi enviado: a source_url de cada item do email e, quando
+    o candidato de origem aparece em `items`, todas as URLs dele (fontes
+    juntadas pelo dedupe/agrupamento) e a impressão digital do título original.
+    `items`: os candidatos guardados na curadoria (curated['candidates'])
+    """
+    entries = sent_entries(curated)
+    wanted = {link_key(entry['source_url']) for entry in entries} - {None}
+    keys = {f"url:{key}" for key in wanted}
+    matched = 0
+    for item in items or ():
+        own = item_keys(item)
+        if any(f"url:{key}" in own for key in wanted):
+            keys |= own
+            matched += 1
+    if not keys:
+        return 0
+    count = sent_index.record(keys)
+    print(f"🗂️ Índice de enviados: {len(entries)} itens do email ({matched} ligados aos candidatos), "
+          f"{count} chaves gravadas para os próximos {sent_index.window_days:g} dias")
+    return count
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Settings
+Leitura do config.yaml (as seções que o código usa: filters, themes) e
+listas compartilhadas entre etapas sem puxar os módulos pesados de cada uma
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config.yaml'
+
+# Tier 1 - Primeira Mão (handles do X): coleta (collector) e Heat Score (heat)
+TIER1_HANDLES = [
+    # OpenAI
+    "sama", "gaborcselle", "maborak",
+    # Anthropic
+    "AnthropicAI", "alexalbert__", "daborak",
+    # Microsoft
+    "satyanadella", "mustafa",
+    # Google
+    "sundarpichai", "JeffDean",
+    # Meta
+    "ylecun", "AIatMeta",
+    # Outros fundadores/researchers
+    "karpathy", "drfeifei", "AndrewYNg",
+    "EMostaque", "caborian", "demaboris",
+    # AI Labs
+    "xaborai", "Mistral", "PerplexityAI",
+]
+
+_settings: Optional[Dict] = None
+_lock = threading.Lock()
+
+
+def load_settings(path: Path = CONFIG_PATH) -> Dict:
+    """config.yaml como dict (lido uma vez); arquivo ausente ou inválido: {}"""
+    global _settings
+    with _lock:
+        if _settings is None:
+            import yaml
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    _settings = yaml.safe_load(f) or {}
+            except (OSError, yaml.YAMLError) as e:
+                print(f"⚠️ config.yaml não lido ({e}); usando padrões")
+                _settings = {}
+        return _settings
+
+
+def setting(dotted: str, default: Any = None) -> Any:
+    """Valor por caminho pontuado, ex.: setting('filters.min_heat_score', 60)"""
+    value: Any = load_settings()
+    for part in dotted.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return value
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Source Health
+Saúde persistente por fonte (falhas, latência, bytes, itens) e circuit breaker
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from storage import CACHE_DIR, load_json, save_json
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+HEALTH_FILE = "source_health.json"
+# SOURCE_BREAKER=0 busca todas as fontes (o histórico continua sendo gravado)
+BREAKER_ENABLED = os.environ.get('SOURCE_BREAKER', '1') != '0'
+BREAKER_THRESHOLD = 3       # falhas seguidas para abrir o circuito
+BREAKER_BASE_HOURS = 6      # espera antes da 1ª sondagem; dobra a cada sondagem que falha
+BREAKER_MAX_HOURS = 7 * 24
+PROBE_TIMEOUT = (3, 5)      # sondagens não pagam o timeout cheio
+LATENCY_SAMPLES = 20        # amostras guardadas para p50/p95
+FORGET_AFTER_DAYS = 30      # fontes sem nenhuma tentativa nesse período saem do arquivo
+SLOW_SOURCE_SECONDS = 10.0  # p95 acima disso aparece como degradada
+
+FETCH = 'fetch'
+PROBE = 'probe'
+SKIP = 'skip'
+
+
+def _percentile(samples: List[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class SourceHealth:
+    """Registro de uma fonte"""
+
+    def __init__(self, data: Optional[dict] = None):
+        data = data or {}
+        self.name: str = data.get('name', '')
+        self.consecutive_failures: int = data.get('consecutive_failures', 0)
+        self.last_success: Optional[str] = data.get('last_success')
+        self.last_failure: Optional[str] = data.get('last_failure')
+        self.last_error: Optional[str] = data.get('last_error')
+        self.retry_at: Optional[str] = data.get('retry_at')
+        self.latencies: List[float] = data.get('latencies', [])
+        self.bytes: int = data.get('bytes', 0)
+        self.items: int = data.get('items', 0)
+        self.skipped = False
+        self.checked = False  # consultada nesta execução
+
+    @property
+    def p50(self) -> Optional[float]:
+        return _percentile(self.latencies, 50)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return _percentile(self.latencies, 95)
+
+    @property
+    def is_open(self) -> bool:
+        return self.consecutive_failures >= BREAKER_THRESHOLD
+
+    @property
+    def degraded(self) -> bool:
+        return self.consecutive_failures > 0 or (self.p95 or 0) > SLOW_SOURCE_SECONDS
+
+    def _sample(self, seconds: float) -> None:
+        self.latencies = (self.latencies + [round(seconds, 3)])[-LATENCY_SAMPLES:]
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'consecutive_failures': self.consecutive_failures,
+            'last_success': self.last_success,
+            'last_failure': self.last_failure,
+            'last_error': self.last_error,
+            'retry_at': self.retry_at,
+            'latencies': self.latencies,
+            'bytes': self.bytes,
+            'items': self.items,
+        }
+
+
+class HealthRegistry:
+    """
+    Saúde de todas as fontes num único JSON em CACHE_DIR.
+
+    Depois de BREAKER_THRESHOLD falhas seguidas o circuito abre: a fonte é
+    pulada até `retry_at` e então sondada com PROBE_TIMEOUT. Cada sondagem
+    que falha dobra a espera (até BREAKER_MAX_HOURS); um sucesso fecha o circuito.
+    """
+
+    def __init__(self, enabled: bool = BREAKER_ENABLED):
+        self.enabled = enabled
+        self.path = CACHE_DIR / HEALTH_FILE
+        self._lock = threading.Lock()
+        self._sources: Optional[Dict[str, SourceHealth]] = None
+
+    def _load(self) -> Dict[str, SourceHealth]:
+        if self._sources is None:
+            raw = load_json(self.path, default={})
+            self._sources = {key: SourceHealth(data) for key, data in raw.items()}
+        return self._sources
+
+    def _get(self, key: str, name: str) -> SourceHealth:
+        health = self._load().setdefault(key, SourceHealth())
+        health.name = name or health.name or key
+        health.checked = True
+        return health
+
+    def check(self, key: str, name: str = '') -> str:
+        """
+        FETCH (normal), PROBE (circuito aberto, hora de sondar) ou SKIP;
+        com o breaker desligado é sempre FETCH, com o timeout normal
+        """
+        with self._lock:
+            health = self._get(key, name)
+            if not health.is_open or not self.enabled:
+                return FETCH
+            if health.retry_at and datetime.utcnow().isoformat() >= health.retry_at:
+                return PROBE
+            health.skipped = True
+            return SKIP
+
+    def record_success(self, key: str, seconds: float, size: int, items: int) -> None:
+        with self._lock:
+            health = self._get(key, '')
+            health._sample(seconds)
+            health.consecutive_failures = 0
+            health.retry_at = None
+            health.last_error = None
+            health.last_success = datetime.utcnow().isoformat()
+            health.bytes = size
+            health.items = items
+
+    def record_failure(self, key: str, seconds: float, error: Exception) -> None:
+        with self._lock:
+            health = self._get(key, '')
+            health._sample(seconds)
+            health.consecutive_failures += 1
+            now = datetime.utcnow()
+            health.last_failure = now.isoformat()
+            health.last_error = str(error)[:200]
+            health.items = 0
+            if health.is_open:
+                hours = min(BREAKER_BASE_HOURS * 2 ** (health.consecutive_failures - BREAKER_THRESHOLD),
+                            BREAKER_MAX_HOURS)
+                health.retry_at = (now + timedelta(hours=hours)).isoformat()
+
+    def degraded(self) -> List[SourceHealth]:
+        """Fontes desta execução com falhas recentes ou lentas, piores primeiro"""
+        with self._lock:
+            sources = [h for h in self._load().values() if h.checked and h.degraded]
+        return sorted(sources, key=lambda h: (-h.consecutive_failures, -(h.p95 or 0)))
+
+    def print_summary(self) -> None:
+        degraded = self.degraded()
+        if not degraded:
+            return
+        print(f"🩺 Fontes degradadas ({len(degraded)}):")
+        for h in degraded:
+            parts = []
+            if h.consecutive_failures:
+                parts.append(f"{h.consecutive_failures} falha(s) seguida(s)"
+                             + (f" ({h.last_error})" if h.last_error else ""))
+            if h.skipped:
+                parts.append(f"pulada, nova sondagem após {h.retry_at[:16]}")
+            elif h.is_open:
+                parts.append("circuito aberto")
+            if h.p95 is not None:
+                parts.append(f"p50 {h.p50:.1f}s / p95 {h.p95:.1f}s")
+            parts.append(f"último sucesso: {h.last_success[:16] if h.last_success else 'nunca'}")
+            print(f"   ⚠️ {h.name}: " + " · ".join(parts))
+
+    def save(self) -> None:
+        limit = (datetime.utcnow() - timedelta(days=FORGET_AFTER_DAYS)).isoformat()
+        with self._lock:
+            data = {
+                key: h.to_dict() for key, h in self._load().items()
+                if h.checked or max(h.last_success or '', h.last_failure or '') >= limit
+            }
+        save_json(self.path, data)
+
+
+# Instância compartilhada pelos coletores
+source_health = HealthRegistry()
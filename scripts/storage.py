@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Storage
+Diretório de cache/estado persistente entre execuções
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+# No GitHub Actions o diretório é restaurado via actions/cache
+CACHE_DIR = Path(os.environ.get(
+    'DAILY_BYTE_CACHE_DIR',
+    Path(__file__).resolve().parent.parent / '.cache'
+))
+
+
+def cache_path(*parts: str) -> Path:
+    """Caminho dentro do CACHE_DIR (cria os diretórios pais)"""
+    path = CACHE_DIR.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def load_json(path: Path, default: Any = None) -> Any:
+    """Lê um JSON; arquivo ausente ou corrompido devolve `default`"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path: Path, data: Any) -> None:
+    """Grava JSON de forma atômica (tmp + rename)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
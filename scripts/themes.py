@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Themes
+Temas prioritários e penalidades de hype do config.yaml (themes.priority /
+themes.penalty), casados num autômato Aho-Corasick: uma passada por campo,
+sem diferenciar maiúsculas nem acentos
+"""
+
+import threading
+import unicodedata
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from settings import setting
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+PRIORITY = 'priority'
+PENALTY = 'penalty'
+FIELDS = ('title', 'content')
+
+BOOST_PER_THEME = int(setting('themes.boost_per_theme', 5))
+MAX_BOOST = int(setting('themes.max_boost', 15))
+PENALTY_PER_MATCH = int(setting('themes.penalty_per_match', 15))
+MAX_PENALTY = int(setting('themes.max_penalty', 30))
+
+
+def _fold_char(c: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', c.lower())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def fold(text: str) -> str:
+    """Minúsculas e sem acentos ("Regulação" → "regulacao")"""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def fold_with_offsets(text: str) -> Tuple[str, Optional[List[int]]]:
+    """
+    Texto dobrado e, para cada caractere dele, a posição no original
+    (None quando as posições coincidem, o caso comum: acento some, letra fica)
+    """
+    folded = fold(text)
+    if len(folded) == len(text):
+        return folded, None
+    chars: List[str] = []
+    offsets: List[int] = []
+    for i, c in enumerate(text):
+        piece = c if c.isascii() and not c.isupper() else _fold_char(c)
+        chars.append(piece)
+        offsets.extend([i] * len(piece))
+    return ''.join(chars), offsets
+
+
+class Automaton:
+    """
+    Aho-Corasick sobre os padrões já dobrados: tempo linear no tamanho do
+    texto (mais o número de ocorrências), qualquer que seja a quantidade
+    de padrões.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+        for pattern, payload in patterns:
+            self._add(pattern, payload)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def _add(self, pattern: str, payload: Any) -> None:
+        if not pattern:
+            return
+        state = 0
+        for c in pattern:
+            nxt = self._goto[state].get(c)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][c] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), payload))
+
+    def _link(self) -> None:
+        """Links de falha em largura; cada estado herda as saídas do seu link"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(c, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """(início, fim, payload) de cada ocorrência em `text` (já dobrado)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, c in enumerate(text):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            for length, payload in out[state]:
+                yield i + 1 - length, i + 1, payload
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum()
+
+
+def _bounded(text: str, start: int, end: int) -> bool:
+    """Palavra inteira (aceita plural: "LLMs", "agentes")"""
+    if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+        return False
+    if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+        return text[end] == 's' and (end + 1 == len(text) or not _is_word_char(text[end + 1]))
+    return True
+
+
+class ThemeMatcher:
+    """Temas e penalidades do config.yaml num autômato só"""
+
+    def __init__(self, priority: Iterable[str], penalty: Iterable[str]):
+        terms = [(PRIORITY, t) for t in priority] + [(PENALTY, t) for t in penalty]
+        self.automaton = Automaton((fold(term), (kind, term)) for kind, term in terms if term)
+        self.size = len(terms)
+
+    def find(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """(início, fim, tipo, termo) no texto original"""
+        folded, offsets = fold_with_offsets(text)
+        found = []
+        for start, end, (kind, term) in self.automaton.iter_matches(folded):
+            if _bounded(folded, start, end):
+                if offsets is not None:
+                    start, end = offsets[start], offsets[end - 1] + 1
+                found.append((start, end, kind, term))
+        return found
+
+    def annotate(self, item: Dict) -> Dict:
+        """
+        Cópia do item com themes, penalties, theme_score (bônus − penalidade)
+        e theme_spans ({field, start, end, term}); já anotado: o próprio item.
+        """
+        if 'theme_score' in item:
+            return item
+        themes: List[str] = []
+        penalties: List[str] = []
+        spans = []
+        for field in FIELDS:
+            for start, end, kind, term in self.find(item.get(field) or ''):
+                spans.append({'field': field, 'start': start, 'end': end, 'term': term})
+                bucket = themes if kind == PRIORITY else penalties
+                if term not in bucket:
+                    bucket.append(term)
+        score = min(MAX_BOOST, BOOST_PER_THEME * len(themes)) - min(MAX_PENALTY, PENALTY_PER_MATCH * len(penalties))
+        return {**item, 'themes': themes, 'penalties': penalties, 'theme_score': score, 'theme_spans': spans}
+
+
+_matcher: Optional[ThemeMatcher] = None
+_lock = threading.Lock()
+
+
+def theme_matcher() -> ThemeMatcher:
+    """Matcher montado uma vez a partir do config.yaml"""
+    global _matcher
+    with _lock:
+        if _matcher is None:
+            _matcher = ThemeMatcher(setting('themes.priority', []) or [], setting('themes.penalty', []) or [])
+        return _matcher
+
+
+def annotate(item: Dict) -> Dict:
+    return theme_matcher().annotate(item)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Tracing
+Spans aninhados (etapa → fonte → HTTP/LLM) com tempo, bytes, itens e memória;
+desligado por padrão (run.py --trace / --profile)
+"""
+
+import io
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+TRACE_PATH = "/tmp/digest_trace.json"
+PROFILE_PATH = "/tmp/digest_profile.pstats"
+SLOWEST_SOURCES = 10
+PROFILE_TOP = 15
+
+STAGE = 'stage'
+GROUP = 'group'
+SOURCE = 'source'
+HTTP = 'http'
+LLM = 'llm'
+
+
+class Span:
+    """Um trecho medido; `attrs` guarda bytes, items e o que mais for útil"""
+
+    __slots__ = ('name', 'kind', 'attrs', 'started_at', 'wall', 'error', 'children', '_start')
+
+    def __init__(self, name: str, kind: str, attrs: Dict):
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs
+        self.started_at = time.time()
+        self.wall = 0.0
+        self.error: Optional[str] = None
+        self.children: List['Span'] = []
+        self._start = time.perf_counter()
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def add(self, key: str, amount: int) -> None:
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+    def walk(self) -> Iterator['Span']:
+        yield self
+        for child in list(self.children):
+            yield from child.walk()
+
+    def total(self, key: str, kind: Optional[str] = None) -> int:
+        """Soma de `key` na subárvore (só spans de `kind`, se informado)"""
+        return sum(s.attrs.get(key, 0) for s in self.walk() if kind is None or s.kind == kind)
+
+    def to_dict(self) -> Dict:
+        d = {
+            'name': self.name,
+            'kind': self.kind,
+            'started_at': datetime.utcfromtimestamp(self.started_at).isoformat(),
+            'wall_ms': round(self.wall * 1000, 1),
+            **self.attrs,
+        }
+        if self.error:
+            d['error'] = self.error
+        if self.children:
+            d['children'] = [c.to_dict() for c in list(self.children)]
+        return d
+
+
+class _NullSpan:
+    """Span usado com o tracing desligado: não mede nada"""
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def add(self, key: str, amount: int) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+_enabled = False
+_profiler = None  # cProfile.Profile com --profile
+_roots: List[Span] = []
+_lock = threading.Lock()
+# Span atual por contexto; o FetchPool copia o contexto para as threads
+_current: ContextVar[Optional[Span]] = ContextVar('daily_byte_span', default=None)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(profile: bool = False) -> None:
+    """Liga o tracing (e tracemalloc); com `profile`, também o cProfile"""
+    global _enabled, _profiler
+    _enabled = True
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if profile:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+@contextmanager
+def span(name: str, kind: str = SOURCE, **attrs):
+    """
+    Mede o bloco como filho do span atual. Spans de etapa (STAGE) também
+    registram o pico de memória (tracemalloc) do trecho.
+    """
+    if not _enabled:
+        yield NULL_SPAN
+        return
+
+    parent = _current.get()
+    current = Span(name, kind, attrs)
+    with _lock:
+        (parent.children if parent else _roots).append(current)
+    token = _current.set(current)
+    memory = kind == STAGE and tracemalloc.is_tracing()
+    if memory:
+        tracemalloc.reset_peak()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"[:200]
+        raise
+    finally:
+        current.wall = time.perf_counter() - current._start
+        if memory:
+            current.attrs['mem_peak_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+        _current.reset(token)
+
+
+def traced(name: str, fn, *args, **kwargs):
+    """fn(*args, **kwargs) dentro de um span de fonte; resultado em lista vira `items`"""
+    with span(name) as s:
+        result = fn(*args, **kwargs)
+        if isinstance(result, list):
+            s.set(items=len(result))
+        return result
+
+
+def current() -> Span:
+    """Span atual (ou NULL_SPAN) para anotar bytes/itens sem abrir outro"""
+    return (_current.get() or NULL_SPAN) if _enabled else NULL_SPAN
+
+
+# ============================================
+# SAÍDA
+# ============================================
+
+def _fmt_bytes(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / 1024 / 1024:.1f} MB"
+    return f"{size / 1024:.0f} KB"
+
+
+def print_summary(path: str = TRACE_PATH) -> None:
+    with _lock:
+        roots = list(_roots)
+    stages = [s for s in roots if s.kind == STAGE]
+    if not stages:
+        return
+
+    print(f"\n📊 Trace ({path})")
+    print(f"   {'etapa':12} {'tempo':>8} {'itens':>7} {'HTTP':>6} {'bytes':>9} {'memória':>9}")
+    for s in stages:
+        memory = f"{s.attrs['mem_peak_kb'] / 1024:.0f} MB" if 'mem_peak_kb' in s.attrs else '-'
+        requests = sum(1 for c in s.walk() if c.kind == HTTP)
+        items = s.attrs.get('items', '-')
+        flag = " ❌" if s.error else ""
+        print(f"   {s.name:12} {s.wall:>7.1f}s {items:>7} {requests:>6} "
+              f"{_fmt_bytes(s.total('bytes', HTTP)):>9} {memory:>9}{flag}")
+
+    sources = sorted((c for s in stages for c in s.walk() if c.kind == SOURCE),
+                     key=lambda c: c.wall, reverse=True)[:SLOWEST_SOURCES]
+    if sources:
+        print("   🐢 Fontes mais lentas:")
+        for c in sources:
+            detail = f"{c.attrs['items']} itens" if 'items' in c.attrs else ''
+            if c.error:
+                detail = c.error
+            print(f"      {c.wall:>6.1f}s  {c.name}" + (f" ({detail})" if detail else ""))
+
+    llm = [c for s in stages for c in s.walk() if c.kind == LLM]
+    for c in llm:
+        tokens = f"{c.attrs.get('input_tokens', '?')} in / {c.attrs.get('output_tokens', '?')} out"
+        print(f"   🤖 {c.name}: {c.wall:.1f}s · {tokens}")
+
+
+def finish(path: str = TRACE_PATH, profile_path: str = PROFILE_PATH) -> None:
+    """Grava o trace em JSON (e o cProfile, se ligado) e imprime o resumo"""
+    global _enabled, _profiler
+    if not _enabled:
+        return
+    _enabled = False
+
+    with _lock:
+        spans = [s.to_dict() for s in _roots]
+    with open(path, 'w') as f:
+        json.dump({'created_at': datetime.utcnow().isoformat(), 'spans': spans}, f, indent=2, ensure_ascii=False)
+    print_summary(path)
+
+    if _profiler is not None:
+        import pstats
+        _profiler.disable()
+        _profiler.dump_stats(profile_path)
+        out = io.StringIO()
+        pstats.Stats(_profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        print(f"\n🔬 cProfile da thread principal ({profile_path}, top {PROFILE_TOP} por tempo acumulado):")
+        print(out.getvalue())
+        _profiler = None
+    tracemalloc.stop()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+THE DAILY BYTE - Watermarks
+Estado incremental por fonte: since_id do X, GUIDs já vistos e published_at mais recente
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from storage import CACHE_DIR, load_json, save_json
+
+# ============================================
+# CONFIGURAÇÃO
+# ============================================
+
+WATERMARKS_FILE = "watermarks.json"
+# COLLECT_INCREMENTAL=0 força coleta completa (ignora e não grava watermarks)
+INCREMENTAL = os.environ.get('COLLECT_INCREMENTAL', '1') != '0'
+# Itens guardados além disso saem no save(), qualquer que seja a janela da fonte
+MAX_RETENTION_HOURS = 72
+
+
+class SourceWatermark:
+    """
+    Watermark de uma fonte.
+
+    Guarda os itens já materializados (por GUID) enquanto estão dentro da
+    janela: a próxima execução pula esses GUIDs no feed e reaproveita o
+    item salvo, então o resultado continua sendo a janela completa.
+    """
+
+    def __init__(self, data: Optional[dict] = None):
+        data = data or {}
+        self.since_id: Optional[str] = data.get('since_id')
+        self.newest: Optional[str] = data.get('newest')
+        self.items: Dict[str, dict] = data.get('items', {})
+        self.reused = 0
+        self.added = 0
+
+    def seen(self, guid: str) -> bool:
+        return bool(guid) and guid in self.items
+
+    def add(self, guid: str, item: dict) -> None:
+        """Registra um item novo (dict no formato RawItem.to_dict)"""
+        if not guid:
+            return
+        self.items[guid] = item
+        self.added += 1
+        if not self.newest or item['published_at'] > self.newest:
+            self.newest = item['published_at']
+
+    def advance_since_id(self, tweet_id: str) -> None:
+        if not self.since_id or int(tweet_id) > int(self.since_id):
+            self.since_id = tweet_id
+
+    def carried(self, cutoff: datetime) -> List[dict]:
+        """Itens de execuções anteriores ainda dentro da janela (e poda os demais)"""
+        limit = cutoff.isoformat()
+        self.items = {g: d for g, d in self.items.items() if d['published_at'] >= limit}
+        self.reused += len(self.items)
+        return list(self.items.values())
+
+    def to_dict(self) -> dict:
+        return {'since_id': self.since_id, 'newest': self.newest, 'items': self.items}
+
+
+class WatermarkStore:
+    """Watermarks de todas as fontes num único JSON em CACHE_DIR"""
+
+    def __init__(self, enabled: bool = INCREMENTAL):
+        self.enabled = enabled
+        self.path = CACHE_DIR / WATERMARKS_FILE
+        self._lock = threading.Lock()
+        self._sources: Dict[str, SourceWatermark] = {}
+        self._raw: Optional[dict] = None
+
+    def _load(self) -> dict:
+        if self._raw is None:
+            self._raw = load_json(self.path, default={}) if self.enabled else {}
+        return self._raw
+
+    def source(self, key: str) -> SourceWatermark:
+        """Watermark da fonte `key` (ex.: 'feed:<url>', 'x:<handles>')"""
+        with self._lock:
+            self._load()
+            if key not in self._sources:
+                self._sources[key] = SourceWatermark(self._raw.get(key))
+            return self._sources[key]
+
+    def totals(self) -> Dict[str, int]:
+        with self._lock:
+            marks = list(self._sources.values())
+        return {
+            'reused': sum(m.reused for m in marks),
+            'added': sum(m.added for m in marks),
+        }
+
+    def save(self) -> None:
+        if not self.enabled:
+            return
+        limit = (datetime.utcnow() - timedelta(hours=MAX_RETENTION_HOURS)).isoformat()
+        with self._lock:
+            data = dict(self._load())
+            for key, mark in self._sources.items():
+                data[key] = mark.to_dict()
+            # Poda também fontes que não rodaram agora (ex.: feed removido)
+            for key, entry in list(data.items()):
+                entry['items'] = {g: d for g, d in entry.get('items', {}).items() if d['published_at'] >= limit}
+                if not entry['items'] and not entry.get('since_id'):
+                    del data[key]
+        save_json(self.path, data)
+
+
+# Instância compartilhada pelos coletores
+watermark_store = WatermarkStore()